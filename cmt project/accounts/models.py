@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import BaseUserManager
+from cmt.models_utils import ChangeTrackingMixin
 
 class Occupation(models.TextChoices):
     STUDENT_UNDERGRADUATE = 'student_undergraduate', 'Student - Undergraduate'
@@ -27,7 +28,7 @@ class CustomUserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
-class CustomUser(AbstractUser):
+class CustomUser(ChangeTrackingMixin, AbstractUser):
     # Remove Username Field
     username = None
 
@@ -48,6 +49,9 @@ class CustomUser(AbstractUser):
 
 
     REQUIRED_FIELDS = ['first_name', 'last_name', 'country', 'organization', 'phone', 'occupation']
+
+    # Billing details printed on invoices
+    tracked_fields = ('first_name', 'last_name', 'email', 'organization', 'country')
     
     objects = CustomUserManager()
 
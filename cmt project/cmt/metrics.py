@@ -0,0 +1,310 @@
+"""
+In-process Prometheus-style metrics with a text exposition endpoint.
+
+Each process keeps its counters and histograms in memory. When METRICS_DIR
+is set (required with several gunicorn workers), a background thread in each
+process periodically writes its values to ``<METRICS_DIR>/metrics-<pid>.json``
+and ``/metrics`` sums every process file. Values recorded before a fork
+(gunicorn ``preload_app``) are discarded in the child, so nothing is
+counted twice. Files of exited processes (gunicorn recycles workers after
+``max_requests``) are folded into ``metrics-archive.json`` and removed, so
+counters keep their totals without a file per past worker.
+"""
+import atexit
+import fcntl
+import json
+import os
+from contextlib import ContextDecorator, contextmanager
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ARCHIVE_FILE = 'metrics-archive.json'
+
+# name: (type, help)
+METRICS = {
+    'cmt_http_request_duration_seconds': ('histogram', 'Request latency by URL name and method.'),
+    'cmt_http_requests_total': ('counter', 'Requests by URL name, method and status code.'),
+    'cmt_pdf_render_duration_seconds': ('histogram', 'Time to render a PDF document.'),
+    'cmt_pdf_render_total': ('counter', 'PDF documents rendered, by outcome.'),
+    'cmt_pdf_cache_total': ('counter', 'Stored PDF lookups, by document and hit or miss.'),
+    'cmt_qr_cache_total': ('counter', 'QR code lookups, by kind (png or modules) and memory hit, shared cache hit or miss.'),
+    'cmt_email_send_duration_seconds': ('histogram', 'Time to send or queue an email.'),
+    'cmt_email_send_total': ('counter', 'Emails sent or queued, by outcome.'),
+    'cmt_external_api_duration_seconds': ('histogram', 'PayPal and Zoom API call latency.'),
+    'cmt_external_api_total': ('counter', 'PayPal and Zoom API calls, by outcome.'),
+    'cmt_submission_status_update_duration_seconds': ('histogram', 'Time to recompute a submission status from its reviews.'),
+    'cmt_submission_status_update_total': ('counter', 'Submission status recomputations, by outcome.'),
+}
+
+
+def _enabled():
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+def _key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters = {}
+        self._histograms = {}
+        self._dirty = False
+        self._flusher = None
+        self._claimed = False
+
+    def _prepare(self):
+        # Called with the lock held before every write
+        if self._pid != os.getpid():
+            self._reset()
+        if self._flusher is None and getattr(settings, 'METRICS_DIR', ''):
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+
+    def inc(self, name, amount=1, **labels):
+        if not _enabled():
+            return
+        key = (name, _key(labels))
+        with self._lock:
+            self._prepare()
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._dirty = True
+
+    def observe(self, name, value, **labels):
+        if not _enabled():
+            return
+        key = (name, _key(labels))
+        with self._lock:
+            self._prepare()
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(DEFAULT_BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(DEFAULT_BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+            self._dirty = True
+
+    def snapshot(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [
+                    [name, list(labels), list(h['buckets']), h['sum'], h['count']]
+                    for (name, labels), h in self._histograms.items()
+                ],
+            }
+
+    def flush(self):
+        """Write this process's values to METRICS_DIR (atomically replacing the previous file)."""
+        directory = getattr(settings, 'METRICS_DIR', '')
+        if not directory:
+            return
+        self._dirty = False
+        data = self.snapshot()
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        if not self._claimed:
+            # A file under this pid belongs to an exited process the pid was reused from
+            with _directory_lock(path):
+                _archive(path, [path / f'metrics-{os.getpid()}.json'])
+            self._claimed = True
+        tmp = path / f'.metrics-{os.getpid()}.tmp'
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path / f'metrics-{os.getpid()}.json')
+
+    def _flush_loop(self):
+        interval = getattr(settings, 'METRICS_FLUSH_SECONDS', 5)
+        while True:
+            time.sleep(interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+
+registry = Registry()
+inc = registry.inc
+observe = registry.observe
+
+
+class timed(ContextDecorator):
+    """
+    Time a block or function into ``<prefix>_duration_seconds`` and count it
+    in ``<prefix>_total`` with an ``outcome`` label of success or error.
+    """
+
+    def __init__(self, prefix, **labels):
+        self.prefix = prefix
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # A fresh instance per decorated call, so concurrent and nested calls don't share the start time
+        return type(self)(self.prefix, **self.labels)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(f'{self.prefix}_duration_seconds', time.perf_counter() - self.started, **self.labels)
+        inc(f'{self.prefix}_total', outcome='error' if exc_type else 'success', **self.labels)
+        return False
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@contextmanager
+def _directory_lock(path):
+    """Serialize archiving between the processes sharing METRICS_DIR."""
+    with open(path / '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_snapshots(paths):
+    snapshots = []
+    for path in paths:
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # gone, or being replaced by its process
+    return snapshots
+
+
+def _archive(path, stale):
+    """Add the stale process files to the archive file, then delete them. Call with the lock held."""
+    stale = [p for p in stale if p.exists()]
+    if not stale:
+        return
+    archive = path / ARCHIVE_FILE
+    counters, histograms = _merge(_read_snapshots([archive] + stale))
+    data = {
+        'counters': [[name, [list(pair) for pair in labels], value] for (name, labels), value in counters.items()],
+        'histograms': [
+            [name, [list(pair) for pair in labels], buckets, total, count]
+            for (name, labels), (buckets, total, count) in histograms.items()
+        ],
+    }
+    tmp = path / '.metrics-archive.tmp'
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, archive)
+    for p in stale:
+        p.unlink(missing_ok=True)
+
+
+def _merge(snapshots):
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(DEFAULT_BUCKETS), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+    return counters, histograms
+
+
+def collect():
+    """Merge the values of every process (or just this one without METRICS_DIR)."""
+    directory = getattr(settings, 'METRICS_DIR', '')
+    if not directory:
+        return _merge([registry.snapshot()])
+
+    registry.flush()
+    path = Path(directory)
+    with _directory_lock(path):
+        dead = []
+        for file in path.glob('metrics-*.json'):
+            pid = file.stem.split('-', 1)[1]
+            if pid.isdigit() and not _pid_alive(int(pid)):
+                dead.append(file)
+        _archive(path, dead)
+        return _merge(_read_snapshots(path.glob('metrics-*.json')))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render():
+    """Prometheus text exposition format (version 0.0.4)."""
+    counters, histograms = collect()
+    lines = []
+    for family, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        if kind == 'counter':
+            for (name, labels), value in sorted(counters.items()):
+                if name == family:
+                    lines.append(f'{family}{_labels(labels)} {value}')
+        else:
+            for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+                if name != family:
+                    continue
+                cumulative = 0
+                for bound, bucket in zip(DEFAULT_BUCKETS, buckets):
+                    cumulative += bucket
+                    lines.append(f'{family}_bucket{_labels(labels, [("le", repr(bound))])} {cumulative}')
+                lines.append(f'{family}_bucket{_labels(labels, [("le", "+Inf")])} {count}')
+                lines.append(f'{family}_sum{_labels(labels)} {total}')
+                lines.append(f'{family}_count{_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    return bool(token) and header.startswith('Bearer ') and constant_time_compare(header[7:], token)
+
+
+def metrics_view(request):
+    """
+    Scrape endpoint. Served to scrapers sending ``Authorization: Bearer
+    <METRICS_TOKEN>`` and to logged-in staff. The client address is not
+    trusted: behind the reverse proxy every request comes from 127.0.0.1.
+    """
+    if not _enabled():
+        raise Http404
+    if not (_has_metrics_token(request) or request.user.is_staff):
+        raise Http404
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
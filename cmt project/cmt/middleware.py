@@ -0,0 +1,132 @@
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from cmt import metrics, template_timing
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(sql):
+    """Collapse placeholders and literals so queries differing only in parameters group together."""
+    sql = sql.replace('%s', '?')
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+\b', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)*\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+class QueryRecorder:
+    """Database execute wrapper that tallies query count and time per SQL string."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            count, total = self.statements.get(sql, (0, 0.0))
+            self.statements[sql] = (count + 1, total + elapsed)
+
+    def top_statements(self, limit):
+        """Fingerprinted statements, deduplicated, most expensive first."""
+        grouped = {}
+        for sql, (count, seconds) in self.statements.items():
+            entry = grouped.setdefault(fingerprint(sql), {'count': 0, 'ms': 0.0})
+            entry['count'] += count
+            entry['ms'] += seconds * 1000
+        ranked = sorted(grouped.items(), key=lambda item: (item[1]['ms'], item[1]['count']), reverse=True)
+        return [
+            {'sql': sql, 'count': entry['count'], 'ms': round(entry['ms'], 2)}
+            for sql, entry in ranked[:limit]
+        ]
+
+
+class RequestTimingMiddleware:
+    """
+    Record query count, DB time, template render time and wall time per
+    request, expose them as a Server-Timing header and log requests that
+    cross the slow-request thresholds.
+
+    Enabled with REQUEST_TIMING_ENABLED; when off Django drops it from the
+    middleware chain entirely. Template time is only measured with the
+    cmt.template_timing.DjangoTemplates backend.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = settings.SLOW_REQUEST_MS
+        self.slow_queries = settings.SLOW_REQUEST_QUERIES
+        self.top_sql = settings.SLOW_REQUEST_TOP_SQL
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        template_seconds = [0.0]
+        token = template_timing.template_seconds.set(template_seconds)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            template_timing.template_seconds.reset(token)
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.seconds * 1000
+        template_ms = template_seconds[0] * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+            f'tpl;dur={template_ms:.1f}',
+            f'total;dur={wall_ms:.1f}',
+        ])
+
+        if wall_ms >= self.slow_ms or recorder.count >= self.slow_queries:
+            match = request.resolver_match
+            logger.warning('slow_request %s', json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'wall_ms': round(wall_ms, 1),
+                'db_ms': round(db_ms, 1),
+                'template_ms': round(template_ms, 1),
+                'queries': recorder.count,
+                'top_sql': recorder.top_statements(self.top_sql),
+            }))
+        return response
+
+
+class MetricsMiddleware:
+    """Record request latency and status per URL name for the /metrics endpoint (METRICS_ENABLED)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        metrics.observe('cmt_http_request_duration_seconds', elapsed, view=view, method=request.method)
+        metrics.inc('cmt_http_requests_total', view=view, method=request.method, status=response.status_code)
+        return response
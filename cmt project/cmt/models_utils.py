@@ -0,0 +1,51 @@
+class ChangeTrackingMixin:
+    """
+    Snapshot selected field values when a model instance is loaded or saved,
+    so save() logic can detect changes without re-reading the row.
+
+    List the field names to watch in ``tracked_fields`` and put the mixin
+    before ``models.Model`` in the bases.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _tracked_attnames(self):
+        return {name: self._meta.get_field(name).attname for name in self.tracked_fields}
+
+    def _snapshot_tracked_fields(self, fields=None):
+        loaded = getattr(self, '_loaded_values', {})
+        deferred = self.get_deferred_fields()
+        for name, attname in self._tracked_attnames().items():
+            if fields is not None and name not in fields and attname not in fields:
+                continue
+            if attname in deferred:
+                continue
+            loaded[name] = getattr(self, attname)
+        self._loaded_values = loaded
+
+    def get_loaded_value(self, name):
+        """Value of a tracked field as last loaded from or saved to the database."""
+        return getattr(self, '_loaded_values', {}).get(name)
+
+    def has_changed(self, *names):
+        """
+        True if any of the given tracked fields (default: all) differ from the
+        loaded snapshot. Unsaved instances always count as changed.
+        """
+        if self._state.adding:
+            return True
+        loaded = getattr(self, '_loaded_values', {})
+        attnames = self._tracked_attnames()
+        for name in names or self.tracked_fields:
+            if name in loaded and loaded[name] != getattr(self, attnames[name]):
+                return True
+        return False
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get('update_fields'))
@@ -0,0 +1,75 @@
+"""
+Shared ReportLab styles and fonts for the invoice, certificate and badge PDFs.
+
+The style sheet is built once per process and reused by every render; under
+gunicorn ``preload_app`` it is warmed in the master (see cmt/wsgi.py), so
+workers inherit it. Styles are shared, so treat them as read-only.
+"""
+from functools import lru_cache
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+
+BRAND_COLOR = HexColor('#667eea')
+GOLD_COLOR = HexColor('#d4a843')
+HEADING_COLOR = HexColor('#1e293b')
+BODY_COLOR = HexColor('#334155')
+MUTED_COLOR = HexColor('#64748b')
+WHITE = HexColor('#ffffff')
+
+FONTS = ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Times-Roman')
+
+# name: (parent, options)
+STYLES = {
+    # Invoice
+    'InvoiceTitle': ('Title', {'fontSize': 24, 'textColor': BRAND_COLOR}),
+    'InvoiceHeading': ('Heading2', {'textColor': BRAND_COLOR, 'fontSize': 14}),
+    'RightAlign': ('Normal', {'alignment': TA_RIGHT, 'fontSize': 10}),
+    'CenterAlign': ('Normal', {'alignment': TA_CENTER, 'fontSize': 10}),
+    # Certificate
+    'OrgName': ('Normal', {
+        'fontSize': 14, 'textColor': BRAND_COLOR, 'alignment': TA_CENTER,
+        'spaceAfter': 6, 'fontName': 'Helvetica-Bold',
+    }),
+    'CertTitle': ('Title', {
+        'fontSize': 36, 'textColor': GOLD_COLOR, 'alignment': TA_CENTER,
+        'spaceAfter': 20, 'fontName': 'Helvetica-Bold',
+    }),
+    'RecipientName': ('Title', {
+        'fontSize': 28, 'textColor': HEADING_COLOR, 'alignment': TA_CENTER,
+        'spaceAfter': 10, 'fontName': 'Helvetica-Bold',
+    }),
+    'CertBody': ('Normal', {
+        'fontSize': 14, 'textColor': BODY_COLOR, 'alignment': TA_CENTER,
+        'spaceAfter': 8, 'leading': 22,
+    }),
+    'CertFooter': ('Normal', {'fontSize': 10, 'textColor': MUTED_COLOR, 'alignment': TA_CENTER}),
+    'Line': ('Normal', {'fontSize': 6, 'alignment': TA_CENTER, 'textColor': GOLD_COLOR}),
+    # Badge
+    'BadgeTitle': ('Title', {'fontSize': 10, 'textColor': BRAND_COLOR, 'alignment': TA_CENTER, 'spaceAfter': 2}),
+    'BadgeName': ('Title', {'fontSize': 16, 'textColor': HEADING_COLOR, 'alignment': TA_CENTER, 'spaceAfter': 2}),
+    'BadgeOrg': ('Normal', {'fontSize': 10, 'textColor': MUTED_COLOR, 'alignment': TA_CENTER, 'spaceAfter': 2}),
+    'BadgeRole': ('Normal', {'fontSize': 9, 'textColor': WHITE, 'alignment': TA_CENTER, 'backColor': BRAND_COLOR}),
+}
+
+
+def register_fonts():
+    """Load the metrics of every font the documents use, so the first render doesn't parse them."""
+    for name in FONTS:
+        pdfmetrics.getFont(name)
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet():
+    """ReportLab's sample style sheet plus the document styles above."""
+    register_fonts()
+    sheet = getSampleStyleSheet()
+    for name, (parent, options) in STYLES.items():
+        sheet.add(ParagraphStyle(name, parent=sheet[parent], **options))
+    return sheet
+
+
+def warm():
+    get_stylesheet()
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     'submissions',
     'review',
     'schedule',
+    'mailqueue',
 
     #Crispy Forms
     "crispy_forms",
@@ -63,6 +64,8 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
 MIDDLEWARE = [
+    'cmt.middleware.MetricsMiddleware',
+    'cmt.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -74,6 +77,22 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request query/template/wall timing, sent as a Server-Timing header.
+# Requests slower than SLOW_REQUEST_MS or running SLOW_REQUEST_QUERIES+ queries
+# are logged (logger `cmt.middleware`) with their most expensive SQL.
+REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'False').lower() == 'true'
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', '500'))
+SLOW_REQUEST_QUERIES = int(os.getenv('SLOW_REQUEST_QUERIES', '50'))
+SLOW_REQUEST_TOP_SQL = int(os.getenv('SLOW_REQUEST_TOP_SQL', '5'))
+
+# Prometheus-style /metrics endpoint. With several gunicorn workers set METRICS_DIR
+# to a directory shared by the workers (emptied on start) so every process is scraped.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = int(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+# Scrapers send it as a bearer token; without it only logged-in staff can read /metrics
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 ROOT_URLCONF = 'cmt.urls'
 
 
@@ -85,7 +104,8 @@ STATICFILES_DIRS = [
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django's backend, plus per-request render timing for RequestTimingMiddleware
+        'BACKEND': 'cmt.template_timing.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -169,15 +189,38 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Static files
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
+    # Generated documents (invoices, certificates) hold personal data, so they are
+    # kept out of MEDIA_ROOT, which is served publicly, and only returned by views.
+    "private": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": os.getenv('PRIVATE_MEDIA_ROOT', os.path.join(BASE_DIR, 'private_media'))},
+    },
 }
 
 # Media files (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Most badges a staff badge sheet download renders in the web process; larger sheets
+# are split by last-name range or printed with the print_badges command
+BADGE_SHEET_MAX_BADGES = int(os.getenv('BADGE_SHEET_MAX_BADGES', '1000'))
+
+# Signed QR tickets and the check-in API. TICKET_SIGNING_KEY is a dedicated server-only
+# key (it can mint tickets); badges and tickets are unavailable without it. Door scanners
+# only get CHECKIN_API_TOKEN, which also signs their offline manifest. The API is off without it.
+TICKET_SIGNING_KEY = os.getenv('TICKET_SIGNING_KEY', '')
+CHECKIN_API_TOKEN = os.getenv('CHECKIN_API_TOKEN', '')
+CHECKIN_BUFFER_SIZE = int(os.getenv('CHECKIN_BUFFER_SIZE', '100'))
+CHECKIN_FLUSH_SECONDS = int(os.getenv('CHECKIN_FLUSH_SECONDS', '2'))
+# Most scans one check-in API request may carry; scanners sync longer offline logs in batches
+CHECKIN_MAX_TICKETS = int(os.getenv('CHECKIN_MAX_TICKETS', '500'))
+
 # Email Configuration
 # Supported providers via env:
 #   SendGrid:  EMAIL_HOST=smtp.sendgrid.net, EMAIL_HOST_USER=apikey, EMAIL_HOST_PASSWORD=SG.xxx
@@ -191,6 +234,28 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'IATM Conference <noreply@iatm.us>')
+# Public site root for links in emails sent outside a request (management commands, cron)
+SITE_URL = os.getenv('SITE_URL', '')
+
+# Outbound email queue. When enabled, views only store emails and
+# `python manage.py run_mail_worker` delivers them in the background.
+EMAIL_QUEUE_ENABLED = os.getenv('EMAIL_QUEUE_ENABLED', 'False').lower() == 'true'
+EMAIL_QUEUE_BATCH_SIZE = int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', '50'))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', '5'))
+EMAIL_QUEUE_BACKOFF_SECONDS = int(os.getenv('EMAIL_QUEUE_BACKOFF_SECONDS', '60'))
+EMAIL_QUEUE_CONFERENCE_RATE = int(os.getenv('EMAIL_QUEUE_CONFERENCE_RATE', '600'))  # per conference per minute
+
+# Per-user caching of membership roles (seconds). 0 keeps role lookups per-request only;
+# enable only with a cache shared by all workers so invalidation reaches every process.
+MEMBERSHIP_ROLE_CACHE_TIMEOUT = int(os.getenv('MEMBERSHIP_ROLE_CACHE_TIMEOUT', '0'))
+
+# QR code PNGs: entries kept in each process, and seconds to keep them in the shared
+# Django cache (0 disables the shared cache)
+QR_CACHE_SIZE = int(os.getenv('QR_CACHE_SIZE', '4096'))
+QR_SHARED_CACHE_TIMEOUT = int(os.getenv('QR_SHARED_CACHE_TIMEOUT', '0'))
+
+# Seconds to cache a conference's reviewer workload summary for chairs (0 disables)
+REVIEW_WORKLOAD_CACHE_TIMEOUT = int(os.getenv('REVIEW_WORKLOAD_CACHE_TIMEOUT', '60'))
 
 # Zoom API (Server-to-Server OAuth)
 ZOOM_ACCOUNT_ID = os.getenv('ZOOM_ACCOUNT_ID', '')
@@ -0,0 +1,36 @@
+"""
+Django template backend that times top-level renders for
+RequestTimingMiddleware. Outside a timed request it only adds a ContextVar
+lookup to each render.
+"""
+import time
+from contextvars import ContextVar
+
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+from django.template.backends.django import Template as BaseTemplate
+
+# Template render time for the request being handled (None outside RequestTimingMiddleware)
+template_seconds = ContextVar('template_seconds', default=None)
+
+
+class Template(BaseTemplate):
+
+    def render(self, context=None, request=None):
+        elapsed = template_seconds.get()
+        if elapsed is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            # Nested {% include %}s render below this call, so only top-level renders are counted
+            elapsed[0] += time.perf_counter() - started
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+
+    def from_string(self, template_code):
+        return Template(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
@@ -21,10 +21,12 @@ from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from django.views.generic import RedirectView
 from django.http import JsonResponse
+from cmt.metrics import metrics_view
 
 
 urlpatterns = [
     path('health/', lambda r: JsonResponse({'status': 'ok'})),
+    path('metrics', metrics_view, name='metrics'),
     path('i18n/', include('django.conf.urls.i18n')),
 ]
 
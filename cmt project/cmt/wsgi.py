@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cmt.settings')
 
 application = get_wsgi_application()
+
+# Build the shared PDF styles once, before gunicorn (preload_app) forks its workers
+from cmt.pdf_styles import warm  # noqa: E402
+
+warm()
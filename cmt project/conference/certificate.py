@@ -1,12 +1,16 @@
 import io
 from reportlab.lib.pagesizes import landscape, letter
 from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
+from cmt import metrics
+from cmt.pdf_styles import get_stylesheet
+from .documents import content_hash, delete_stored, get_or_render, is_stored, store
 
+# Bump when the certificate layout changes so stored PDFs are rendered again
+CERTIFICATE_LAYOUT_VERSION = 1
 
+
+@metrics.timed('cmt_pdf_render', document='certificate')
 def generate_certificate_pdf(user, conference, sessions_attended):
     """Generate an attendance certificate PDF and return the buffer."""
     buffer = io.BytesIO()
@@ -19,39 +23,13 @@ def generate_certificate_pdf(user, conference, sessions_attended):
         rightMargin=1.5 * inch,
     )
 
-    styles = getSampleStyleSheet()
-    brand_color = HexColor('#667eea')
-    gold_color = HexColor('#d4a843')
-
-    # Custom styles
-    org_style = ParagraphStyle(
-        'OrgName', parent=styles['Normal'],
-        fontSize=14, textColor=brand_color, alignment=TA_CENTER,
-        spaceAfter=6, fontName='Helvetica-Bold',
-    )
-    cert_title = ParagraphStyle(
-        'CertTitle', parent=styles['Title'],
-        fontSize=36, textColor=gold_color, alignment=TA_CENTER,
-        spaceAfter=20, fontName='Helvetica-Bold',
-    )
-    name_style = ParagraphStyle(
-        'RecipientName', parent=styles['Title'],
-        fontSize=28, textColor=HexColor('#1e293b'), alignment=TA_CENTER,
-        spaceAfter=10, fontName='Helvetica-Bold',
-    )
-    body_style = ParagraphStyle(
-        'CertBody', parent=styles['Normal'],
-        fontSize=14, textColor=HexColor('#334155'), alignment=TA_CENTER,
-        spaceAfter=8, leading=22,
-    )
-    footer_style = ParagraphStyle(
-        'CertFooter', parent=styles['Normal'],
-        fontSize=10, textColor=HexColor('#64748b'), alignment=TA_CENTER,
-    )
-    line_style = ParagraphStyle(
-        'Line', parent=styles['Normal'],
-        fontSize=6, alignment=TA_CENTER, textColor=gold_color,
-    )
+    styles = get_stylesheet()
+    org_style = styles['OrgName']
+    cert_title = styles['CertTitle']
+    name_style = styles['RecipientName']
+    body_style = styles['CertBody']
+    footer_style = styles['CertFooter']
+    line_style = styles['Line']
 
     elements = []
 
@@ -108,3 +86,52 @@ def generate_certificate_pdf(user, conference, sessions_attended):
     doc.build(elements)
     buffer.seek(0)
     return buffer
+
+
+def certificate_content_hash(user, conference, sessions_attended):
+    """Hash of everything generate_certificate_pdf renders."""
+    return content_hash(
+        CERTIFICATE_LAYOUT_VERSION,
+        user.get_full_name(),
+        user.organization,
+        sessions_attended,
+        conference.conference_name,
+        conference.start_date.isoformat(),
+        conference.end_date.isoformat(),
+        conference.location,
+    )
+
+
+def _certificate_dir(membership_id):
+    return f'certificates/{membership_id:06d}'
+
+
+def delete_stored_certificates(membership_id):
+    """Remove every stored certificate for a membership."""
+    delete_stored(_certificate_dir(membership_id))
+
+
+def is_certificate_stored(membership, sessions_attended):
+    digest = certificate_content_hash(membership.user, membership.conference, sessions_attended)
+    return is_stored(_certificate_dir(membership.id), digest)
+
+
+def render_and_store_certificate(membership, sessions_attended):
+    """Render a certificate and store it, replacing older copies. Returns the stored name."""
+    data = generate_certificate_pdf(membership.user, membership.conference, sessions_attended).getvalue()
+    digest = certificate_content_hash(membership.user, membership.conference, sessions_attended)
+    return store(_certificate_dir(membership.id), digest, data)
+
+
+def get_certificate_pdf(membership, sessions_attended):
+    """
+    Return the certificate PDF bytes, serving the copy stored by
+    generate_certificates and rendering on demand only when it is missing or
+    out of date.
+    """
+    user, conference = membership.user, membership.conference
+    return get_or_render(
+        'certificate', _certificate_dir(membership.id),
+        certificate_content_hash(user, conference, sessions_attended),
+        lambda: generate_certificate_pdf(user, conference, sessions_attended).getvalue(),
+    )
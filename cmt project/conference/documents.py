@@ -0,0 +1,63 @@
+"""
+Rendered PDFs kept in the private storage.
+
+Each document lives in its own directory under a name derived from a hash of
+everything printed on it, so a stored copy is only served while its content
+is current; rendering a new version removes the older copies.
+"""
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+
+from cmt import metrics
+
+
+def content_hash(*parts):
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def stored_name(directory, digest):
+    return f'{directory}/{digest[:32]}.pdf'
+
+
+def read_stored(name):
+    """Bytes of a stored document, or None when it has not been rendered."""
+    try:
+        with storages['private'].open(name) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def is_stored(directory, digest):
+    return storages['private'].exists(stored_name(directory, digest))
+
+
+def store(directory, digest, data):
+    """Save a rendered document, replacing older copies in its directory."""
+    delete_stored(directory)
+    return storages['private'].save(stored_name(directory, digest), ContentFile(data))
+
+
+def delete_stored(directory):
+    """Remove every stored copy in a document directory."""
+    storage = storages['private']
+    try:
+        _, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in files:
+        storage.delete(f'{directory}/{name}')
+
+
+def get_or_render(document, directory, digest, render):
+    """Return the stored copy for ``digest``, rendering and storing it on a miss."""
+    data = read_stored(stored_name(directory, digest))
+    if data is not None:
+        metrics.inc('cmt_pdf_cache_total', document=document, result='hit')
+        return data
+    metrics.inc('cmt_pdf_cache_total', document=document, result='miss')
+    data = render()
+    store(directory, digest, data)
+    return data
@@ -3,23 +3,29 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from cmt import metrics
+from cmt.pdf_styles import BRAND_COLOR, get_stylesheet
+from .documents import content_hash, delete_stored, get_or_render
 
+# Bump when the invoice layout changes so stored PDFs are rendered again
+INVOICE_LAYOUT_VERSION = 1
 
+# Fields printed on the invoice; the stored PDF is keyed by a hash of their values
+INVOICE_PAYMENT_FIELDS = ('status', 'amount', 'currency', 'paypal_order_id', 'tier')
+INVOICE_USER_FIELDS = ('first_name', 'last_name', 'email', 'organization', 'country')
+
+
+@metrics.timed('cmt_pdf_render', document='invoice')
 def generate_invoice_pdf(payment):
     """Generate a PDF invoice for a payment and return the buffer."""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5 * inch, bottomMargin=0.5 * inch)
 
-    styles = getSampleStyleSheet()
-    brand_color = HexColor('#667eea')
+    styles = get_stylesheet()
 
-    # Custom styles
-    title_style = ParagraphStyle('InvoiceTitle', parent=styles['Title'], fontSize=24, textColor=brand_color)
-    heading_style = ParagraphStyle('InvoiceHeading', parent=styles['Heading2'], textColor=brand_color, fontSize=14)
-    right_style = ParagraphStyle('RightAlign', parent=styles['Normal'], alignment=TA_RIGHT, fontSize=10)
-    center_style = ParagraphStyle('CenterAlign', parent=styles['Normal'], alignment=TA_CENTER, fontSize=10)
+    title_style = styles['InvoiceTitle']
+    heading_style = styles['InvoiceHeading']
+    center_style = styles['CenterAlign']
 
     elements = []
 
@@ -69,7 +75,7 @@ def generate_invoice_pdf(payment):
     items_table = Table(items_data, colWidths=[3.5 * inch, 1.5 * inch, 1.5 * inch])
     items_table.setStyle(TableStyle([
         # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), brand_color),
+        ('BACKGROUND', (0, 0), (-1, 0), BRAND_COLOR),
         ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
         ('FONTSIZE', (0, 0), (-1, 0), 11),
@@ -82,7 +88,7 @@ def generate_invoice_pdf(payment):
         # Total row
         ('FONTNAME', (1, -1), (-1, -1), 'Helvetica-Bold'),
         ('FONTSIZE', (1, -1), (-1, -1), 12),
-        ('LINEABOVE', (1, -1), (-1, -1), 1, brand_color),
+        ('LINEABOVE', (1, -1), (-1, -1), 1, BRAND_COLOR),
         # Grid
         ('GRID', (0, 0), (-1, 1), 0.5, HexColor('#e2e8f0')),
         ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
@@ -97,3 +103,41 @@ def generate_invoice_pdf(payment):
     doc.build(elements)
     buffer.seek(0)
     return buffer
+
+
+def invoice_content_hash(payment):
+    """Hash of everything generate_invoice_pdf renders for this payment."""
+    user = payment.user
+    return content_hash(
+        INVOICE_LAYOUT_VERSION,
+        payment.id,
+        payment.created_at.date().isoformat(),
+        payment.status,
+        payment.paypal_order_id or '',
+        payment.amount,
+        payment.currency,
+        payment.tier.name if payment.tier_id else '',
+        payment.conference.conference_name,
+        *(getattr(user, field) for field in INVOICE_USER_FIELDS),
+    )
+
+
+def _invoice_dir(payment_id):
+    return f'invoices/{payment_id:06d}'
+
+
+def delete_stored_invoices(payment_id):
+    """Remove every stored PDF for a payment."""
+    delete_stored(_invoice_dir(payment_id))
+
+
+def get_invoice_pdf(payment):
+    """
+    Return the invoice PDF bytes. A copy stored under the payment's content
+    hash is served as-is; otherwise the PDF is rendered and stored, replacing
+    any copy rendered from older payment or billing details.
+    """
+    return get_or_render(
+        'invoice', _invoice_dir(payment.id), invoice_content_hash(payment),
+        lambda: generate_invoice_pdf(payment).getvalue(),
+    )
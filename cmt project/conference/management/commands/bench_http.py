@@ -0,0 +1,259 @@
+import json
+import platform
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from conference.management.commands.seed_load_data import SEED_PASSWORD, SEED_SLUG_PREFIX
+from conference.models import Conference
+from membership.models import Membership, Role
+from review.models import Review
+from schedule.models import Session
+
+
+JOURNEYS = ('schedule_surge', 'chair_assignments', 'submit_review', 'proceedings_search', 'networking_search')
+PROCEEDINGS_TERMS = ['Scalable', 'Model', 'Robust Analysis', 'Smith', 'Patel', 'Benchmark', 'zzz-no-match']
+NETWORKING_TERMS = ['USA', 'India', 'Wei', 'Garcia', 'University', 'Laboratory', 'zzz-no-match']
+
+Sample = namedtuple('Sample', ['journey', 'step', 'seconds', 'queries', 'status'])
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(samples, wall_seconds):
+    steps = defaultdict(list)
+    for sample in samples:
+        steps[sample.step].append(sample)
+
+    summary = {
+        'requests': len(samples),
+        'wall_seconds': round(wall_seconds, 3),
+        'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        'steps': {},
+    }
+    for step, step_samples in steps.items():
+        latencies = sorted(sample.seconds * 1000 for sample in step_samples)
+        queries = [sample.queries for sample in step_samples]
+        summary['steps'][step] = {
+            'requests': len(step_samples),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_queries': round(sum(queries) / len(queries), 2),
+            'max_queries': max(queries),
+            'errors': sum(1 for sample in step_samples if sample.status >= 500),
+        }
+    return summary
+
+
+def _change(new, old):
+    if not old:
+        return 'n/a'
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark scripted user journeys through the Django test client against seeded data '
+        '(see seed_load_data) and write a JSON baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--conference', help='Slug of the seeded conference to drive (default: the largest one)')
+        parser.add_argument('--journeys', default=','.join(JOURNEYS), help=f"Comma-separated subset of: {', '.join(JOURNEYS)}")
+        parser.add_argument('--iterations', type=int, default=50, help='Journeys run per scenario')
+        parser.add_argument('--concurrency', type=int, default=1, help='Concurrent clients (threads) per scenario')
+        parser.add_argument('--output', default='bench_results.json', help='Where to write the JSON results')
+        parser.add_argument('--compare', help='Baseline JSON file to diff the results against')
+
+    def handle(self, *args, **options):
+        journeys = [name.strip() for name in options['journeys'].split(',') if name.strip()]
+        unknown = set(journeys) - set(JOURNEYS)
+        if unknown:
+            raise CommandError(f"Unknown journey(s): {', '.join(sorted(unknown))}")
+        if options['iterations'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--iterations and --concurrency must be at least 1')
+
+        self.conference = self.get_conference(options['conference'])
+        self.iterations = options['iterations']
+        self.concurrency = options['concurrency']
+        self.lock = threading.Lock()
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        results = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'conference': self.conference.slug,
+                'iterations': self.iterations,
+                'concurrency': self.concurrency,
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+            },
+            'journeys': {},
+        }
+
+        # The test client talks to the app in-process; keep outbound email local
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            EMAIL_QUEUE_ENABLED=False,
+        ):
+            for name in journeys:
+                self.stdout.write(f"Running {name}...")
+                results['journeys'][name] = self.run_journey(name)
+
+        self.report(results, baseline)
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def get_conference(self, slug):
+        if slug:
+            try:
+                return Conference.objects.get(slug=slug)
+            except Conference.DoesNotExist:
+                raise CommandError(f"Conference '{slug}' does not exist")
+        conference = Conference.objects.filter(slug__startswith=SEED_SLUG_PREFIX).annotate(
+            paid=Count('memberships', filter=Q(memberships__is_paid=True))
+        ).order_by('-paid').first()
+        if conference is None:
+            raise CommandError('No seeded conference found; run manage.py seed_load_data first')
+        return conference
+
+    def request(self, client, samples, journey, step, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            if hasattr(response, 'streaming_content'):
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+        samples.append(Sample(journey, step, elapsed, len(ctx.captured_queries), response.status_code))
+        return response
+
+    def run_journey(self, name):
+        actors = getattr(self, f'actors_{name}')()
+        if not actors:
+            raise CommandError(f"No data for journey '{name}' in {self.conference.slug}")
+        journey = getattr(self, f'journey_{name}')
+        samples = []
+
+        def run(actor):
+            client = Client()
+            local = []
+            try:
+                journey(client, local, actor)
+            finally:
+                connection.close()
+            with self.lock:
+                samples.extend(local)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(run, islice(cycle(actors), self.iterations)))
+        return summarize(samples, time.perf_counter() - started)
+
+    # Actors: the rows each journey iteration works with
+
+    def paid_users(self):
+        return list(
+            Membership.objects.filter(conference=self.conference, is_paid=True)
+            .select_related('user').order_by('id')[:self.iterations]
+        )
+
+    def actors_schedule_surge(self):
+        sessions = list(
+            Session.objects.filter(conference=self.conference, is_published=True)
+            .exclude(zoom_meeting_url='').order_by('id').values_list('id', flat=True)
+        )
+        return [(m.user, session_id) for m, session_id in zip(self.paid_users(), cycle(sessions))] if sessions else []
+
+    def actors_chair_assignments(self):
+        return [m.user for m in Membership.objects.with_role(self.conference, Role.CHAIR).select_related('user')]
+
+    def actors_submit_review(self):
+        return list(
+            Review.objects.filter(submission__membership__conference=self.conference, is_submitted=False)
+            .select_related('reviewer').order_by('id')[:self.iterations]
+        )
+
+    def actors_proceedings_search(self):
+        return [(m.user, term) for m, term in zip(self.paid_users(), cycle(PROCEEDINGS_TERMS))]
+
+    def actors_networking_search(self):
+        return [(m.user, term) for m, term in zip(self.paid_users(), cycle(NETWORKING_TERMS))]
+
+    # Journeys
+
+    def journey_schedule_surge(self, client, samples, actor):
+        user, session_id = actor
+        name = 'schedule_surge'
+        self.request(client, samples, name, 'login', 'post', reverse('login'), {'email': user.email, 'password': SEED_PASSWORD})
+        self.request(client, samples, name, 'conference_schedule', 'get', reverse('conference_schedule', args=[self.conference.slug]))
+        self.request(client, samples, name, 'join_session', 'get', reverse('join_session', args=[session_id]))
+
+    def journey_chair_assignments(self, client, samples, user):
+        client.force_login(user)
+        url = reverse('chair_review_assignments') + f'?conference={self.conference.slug}'
+        self.request(client, samples, 'chair_assignments', 'chair_review_assignments', 'get', url)
+
+    def journey_submit_review(self, client, samples, review):
+        client.force_login(review.reviewer)
+        url = reverse('submit_review', args=[review.id])
+        self.request(client, samples, 'submit_review', 'open_review', 'get', url)
+        self.request(client, samples, 'submit_review', 'submit_review', 'post', url, {
+            'comment': 'Benchmark review.', 'recommendation': 'ACCEPT',
+        })
+
+    def journey_proceedings_search(self, client, samples, actor):
+        user, term = actor
+        client.force_login(user)
+        url = reverse('proceedings_conference', args=[self.conference.slug])
+        self.request(client, samples, 'proceedings_search', 'proceedings_conference', 'get', url, {'q': term})
+
+    def journey_networking_search(self, client, samples, actor):
+        user, term = actor
+        client.force_login(user)
+        url = reverse('networking_hub', args=[self.conference.slug])
+        self.request(client, samples, 'networking_search', 'networking_hub', 'get', url, {'q': term})
+
+    def report(self, results, baseline):
+        header = f"{'journey / step':<44}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, journey in results['journeys'].items():
+            self.stdout.write(f"{name} ({journey['throughput_rps']} req/s)")
+            for step, stats in journey['steps'].items():
+                line = (
+                    f"  {step:<42}{stats['requests']:>6}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+                    f"{stats['p99_ms']:>10}{stats['mean_queries']:>9}{stats['errors']:>8}"
+                )
+                old = (baseline or {}).get('journeys', {}).get(name, {}).get('steps', {}).get(step)
+                if old:
+                    line += (
+                        f"   p95 {_change(stats['p95_ms'], old['p95_ms'])}"
+                        f", queries {_change(stats['mean_queries'], old['mean_queries'])}"
+                    )
+                self.stdout.write(line)
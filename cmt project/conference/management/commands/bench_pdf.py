@@ -0,0 +1,83 @@
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from cmt.pdf_styles import get_stylesheet
+from conference.certificate import generate_certificate_pdf
+from conference.invoice import generate_invoice_pdf
+from conference.management.commands.bench_http import percentile
+from conference.models import Conference, Payment
+from membership.badge import generate_badge_pdf
+from membership.models import Membership
+
+DOCUMENTS = ('invoice', 'certificate', 'badge')
+
+
+def sample_documents():
+    """Unsaved instances for each generator, so the benchmark needs no data."""
+    user = CustomUser(
+        id=1, email='ada.lovelace@example.com', first_name='Ada', last_name='Lovelace',
+        organization='Analytical Engines Ltd', country='United Kingdom',
+    )
+    conference = Conference(
+        id=1, conference_name='IATM Annual Conference on Technology Management', slug='iatm-bench',
+        start_date=date(2026, 6, 1), end_date=date(2026, 6, 3), location='Boston, MA',
+    )
+    payment = Payment(
+        id=1, user=user, conference=conference, amount=Decimal('350.00'), currency='USD',
+        paypal_order_id='5O190127TN364715T', status='completed', created_at=timezone.now(),
+    )
+    membership = Membership(id=1, user=user, conference=conference, role1='Author', role2='Reviewer', is_paid=True)
+    return {
+        'invoice': lambda: generate_invoice_pdf(payment),
+        'certificate': lambda: generate_certificate_pdf(user, conference, 7),
+        'badge': lambda: generate_badge_pdf(membership),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Microbenchmark per-document PDF render time with the shared style sheet rebuilt '
+        'on every render (cold, the old behaviour) and reused (warm)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per document and mode')
+        parser.add_argument('--documents', default=','.join(DOCUMENTS), help=f"Comma-separated subset of: {', '.join(DOCUMENTS)}")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['documents'].split(',') if name.strip()]
+        unknown = set(names) - set(DOCUMENTS)
+        if unknown:
+            raise CommandError(f"Unknown document(s): {', '.join(sorted(unknown))}")
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        renders = sample_documents()
+        header = f"{'document':<14}{'mode':<8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name in names:
+            render = renders[name]
+            render()  # import and font loading costs stay out of both runs
+            results = {}
+            for mode in ('cold', 'warm'):
+                timings = []
+                for _ in range(options['iterations']):
+                    if mode == 'cold':
+                        get_stylesheet.cache_clear()
+                    started = time.perf_counter()
+                    render()
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                results[mode] = sum(timings) / len(timings)
+                self.stdout.write(
+                    f"{name:<14}{mode:<8}{results[mode]:>10.2f}"
+                    f"{percentile(timings, 50):>10.2f}{percentile(timings, 95):>10.2f}"
+                )
+            saved = results['cold'] - results['warm']
+            self.stdout.write(f"{'':<14}saves {saved:.2f} ms per render ({saved / results['cold'] * 100:.1f}%)")
@@ -0,0 +1,74 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from conference.certificate import is_certificate_stored, render_and_store_certificate
+from conference.models import Conference
+from membership.models import Membership
+
+
+def _init_worker():
+    # Spawned workers start without Django; forked ones must not share the parent's DB connections
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Render and store attendance certificates for every eligible attendee of a finished conference'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Conference slug')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Render processes (default: CPU count)')
+        parser.add_argument('--force', action='store_true', help='Re-render certificates that are already stored')
+
+    def handle(self, *args, **options):
+        try:
+            conference = Conference.objects.get(slug=options['slug'])
+        except Conference.DoesNotExist:
+            raise CommandError(f"Conference '{options['slug']}' does not exist")
+        if conference.end_date >= timezone.now().date():
+            raise CommandError(f"{conference.conference_name} has not ended yet")
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        # Resync the attendance counters with one grouped UPDATE, then read the eligible memberships
+        conference_memberships = Membership.objects.filter(conference=conference)
+        conference_memberships.refresh_attendance_counts()
+        eligible = list(conference_memberships.certificate_eligible().select_related('user', 'conference').order_by('id'))
+        jobs = [(m, m.sessions_attended) for m in eligible]
+        if not options['force']:
+            jobs = [(m, sessions) for m, sessions in jobs if not is_certificate_stored(m, sessions)]
+
+        self.stdout.write(
+            f"{len(eligible)} eligible attendees, {len(eligible) - len(jobs)} already stored, "
+            f"rendering {len(jobs)} with {options['workers']} workers"
+        )
+        if not jobs:
+            return
+
+        # The children open their own DB connections if they need one
+        connections.close_all()
+        started = time.perf_counter()
+        rendered = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = {pool.submit(render_and_store_certificate, m, sessions): m for m, sessions in jobs}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    rendered += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"Membership {futures[future].id}: {exc}")
+                if (rendered + failed) % 500 == 0:
+                    self.stdout.write(f"  {rendered + failed}/{len(jobs)}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {rendered} certificates in {elapsed:.1f}s ({rendered / elapsed:.1f}/s)"
+            + (f", {failed} failed" if failed else '')
+        ))
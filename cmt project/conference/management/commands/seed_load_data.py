@@ -0,0 +1,441 @@
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser, Occupation
+from conference.models import Conference, Payment, RegistrationTier, Track
+from membership.models import AttendeeMessage, Membership, MembershipRole, Role
+from review.models import Review
+from schedule.models import Attendance, Session, Speaker
+from submissions.models import Submissions
+
+
+SEED_DOMAIN = 'loadtest.example.com'
+SEED_SLUG_PREFIX = 'load-'
+SEED_PASSWORD = 'loadtest'
+
+# (value, weight) pairs for the generated distributions
+COUNTRIES = [
+    ('USA', 35), ('India', 14), ('China', 10), ('United Kingdom', 6), ('Germany', 5), ('Canada', 5),
+    ('Brazil', 4), ('Japan', 4), ('Nigeria', 3), ('Australia', 3), ('France', 3), ('South Korea', 3),
+    ('Mexico', 2), ('Italy', 2), ('Spain', 1),
+]
+OCCUPATIONS = [
+    (Occupation.STUDENT_UNDERGRADUATE, 20), (Occupation.STUDENT_GRADUATE, 35), (Occupation.FACULTY, 30),
+    (Occupation.ALUMNI, 10), (Occupation.OTHER, 5),
+]
+CONFERENCES_PER_USER = [(1, 60), (2, 30), (3, 10)]
+CO_AUTHORS = [(0, 40), (1, 35), (2, 15), (3, 10)]
+RECOMMENDATIONS = [('ACCEPT', 40), ('REVISE', 30), ('REJECT', 30)]
+TIERS = [('Student', Decimal('150.00'), 50), ('Professional', Decimal('350.00'), 40), ('Sponsor', Decimal('1000.00'), 10)]
+SESSION_TYPES = [('paper', 55), ('keynote', 5), ('workshop', 15), ('panel', 10), ('break', 10), ('social', 5)]
+
+FIRST_NAMES = [
+    'James', 'Mary', 'Wei', 'Priya', 'Mohammed', 'Ana', 'Luca', 'Yuki', 'Chinedu', 'Sofia', 'Arjun', 'Emma',
+    'Hiroshi', 'Fatima', 'Carlos', 'Olga', 'Kwame', 'Mei', 'Noah', 'Amara', 'Jonas', 'Ines', 'Ravi', 'Lena',
+]
+LAST_NAMES = [
+    'Smith', 'Garcia', 'Wang', 'Patel', 'Khan', 'Silva', 'Rossi', 'Tanaka', 'Okafor', 'Muller', 'Kim', 'Brown',
+    'Nguyen', 'Sharma', 'Lopez', 'Ivanova', 'Mensah', 'Chen', 'Johnson', 'Adeyemi', 'Schmidt', 'Martin',
+]
+ORGANIZATIONS = [
+    'State University', 'Institute of Technology', 'National Laboratory', 'City College', 'Polytechnic University',
+    'Research Council', 'Medical School', 'Engineering Consultancy', 'Open Source Foundation', 'Independent',
+]
+TRACK_NAMES = [
+    'Machine Learning', 'Systems', 'Networking', 'Security', 'Databases', 'Human-Computer Interaction',
+    'Theory', 'Software Engineering', 'Robotics', 'Education', 'Bioinformatics', 'Graphics',
+]
+TITLE_WORDS = [
+    'Scalable', 'Efficient', 'Robust', 'Adaptive', 'Distributed', 'Incremental', 'Secure', 'Interpretable',
+    'Approach', 'Framework', 'Analysis', 'Model', 'Algorithm', 'Study', 'Evaluation', 'Benchmark',
+]
+MESSAGE_SUBJECTS = [
+    'Great talk today', 'Question about your paper', 'Collaboration idea', 'Meeting at the venue',
+    'Slides request', 'Follow-up from the panel', 'Dataset access', 'Coffee break chat',
+]
+
+
+def _weighted(rng, pairs, k=1):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights=weights, k=k)
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Populate the database with a large deterministic synthetic conference data set for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--conferences', type=int, default=20)
+        parser.add_argument('--submissions', type=int, default=20000)
+        parser.add_argument('--reviews', type=int, default=60000)
+        parser.add_argument('--sessions', type=int, default=2000)
+        parser.add_argument('--attendance', type=int, default=200000, help='Session attendance rows')
+        parser.add_argument('--messages', type=int, default=500000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed produces the same data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded data first')
+
+    def handle(self, *args, **options):
+        if options['conferences'] < 1 or options['users'] < 10:
+            raise CommandError('Need at least 1 conference and 10 users')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        if options['flush']:
+            self.step('Flushing previous seed data', self.flush)
+        elif Conference.objects.filter(slug__startswith=SEED_SLUG_PREFIX).exists():
+            raise CommandError('Seed data already exists; rerun with --flush to replace it')
+
+        started = time.monotonic()
+        self.step('Users', self.create_users, options['users'])
+        self.step('Conferences, tracks and tiers', self.create_conferences, options['conferences'])
+        self.step('Memberships and roles', self.create_memberships)
+        self.step('Payments', self.create_payments)
+        self.step('Submissions and reviews', self.create_submissions, options['submissions'], options['reviews'])
+        self.step('Speakers and sessions', self.create_sessions, options['sessions'])
+        self.step('Attendance', self.create_attendance, options['attendance'])
+        self.step('Messages', self.create_messages, options['messages'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded load-test data in {time.monotonic() - started:.1f}s. "
+            f"All users share the password '{SEED_PASSWORD}'."
+        ))
+
+    def step(self, label, func, *args):
+        started = time.monotonic()
+        with transaction.atomic():
+            created = func(*args)
+        suffix = f": {created} rows" if created is not None else ''
+        self.stdout.write(f"{label}{suffix} ({time.monotonic() - started:.1f}s)")
+
+    def bulk_create(self, model, objs):
+        created = 0
+        for batch in _batched(objs, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+        return created
+
+    def flush(self):
+        Conference.objects.filter(slug__startswith=SEED_SLUG_PREFIX).delete()
+        Speaker.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
+        CustomUser.objects.filter(email__endswith=f'@{SEED_DOMAIN}').delete()
+
+    def create_users(self, count):
+        rng = self.rng
+        password = make_password(SEED_PASSWORD)
+        countries = _weighted(rng, COUNTRIES, count)
+        occupations = _weighted(rng, OCCUPATIONS, count)
+
+        users = (
+            CustomUser(
+                email=f'user{i:06d}@{SEED_DOMAIN}',
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                country=countries[i],
+                organization=rng.choice(ORGANIZATIONS),
+                phone=f'555{i:07d}',
+                occupation=occupations[i],
+                iatm_membership=rng.random() < 0.3,
+            )
+            for i in range(count)
+        )
+        created = self.bulk_create(CustomUser, users)
+        self.user_ids = list(
+            CustomUser.objects.filter(email__endswith=f'@{SEED_DOMAIN}').order_by('id').values_list('id', flat=True)
+        )
+        return created
+
+    def create_conferences(self, count):
+        rng = self.rng
+        today = timezone.now().date()
+        conferences = []
+        for i in range(count):
+            # Half of the conferences are over, the rest are upcoming
+            start = today + timedelta(days=(i - count // 2) * 30 + 7)
+            deadline = timezone.now() + timedelta(days=(i - count // 2) * 30 - 30)
+            conferences.append(Conference(
+                conference_name=f'Load Test Conference {i + 1:02d}',
+                conference_description='Synthetic conference generated for load testing.',
+                start_date=start,
+                end_date=start + timedelta(days=rng.randint(2, 4)),
+                location=rng.choice(['Boston', 'Berlin', 'Tokyo', 'Bangalore', 'Lagos', 'Toronto', 'Sydney']),
+                slug=f'{SEED_SLUG_PREFIX}{i + 1:02d}',
+                early_bird_deadline=start - timedelta(days=60),
+                submission_deadline=deadline,
+                review_deadline=deadline + timedelta(days=21),
+                blind_review=rng.random() < 0.5,
+            ))
+        Conference.objects.bulk_create(conferences)
+        self.conferences = list(Conference.objects.filter(slug__startswith=SEED_SLUG_PREFIX).order_by('slug'))
+        # Zipf-like popularity: a few large conferences and a long tail
+        self.popularity = [1 / (rank + 1) for rank in range(count)]
+
+        tracks = []
+        tiers = []
+        for conference in self.conferences:
+            for name in rng.sample(TRACK_NAMES, rng.randint(4, 8)):
+                tracks.append(Track(conference=conference, name=name))
+            for name, price, _ in TIERS:
+                tiers.append(RegistrationTier(
+                    conference=conference, name=name, price=price, early_bird_price=price * Decimal('0.8'),
+                ))
+        Track.objects.bulk_create(tracks)
+        RegistrationTier.objects.bulk_create(tiers)
+
+        self.track_ids = {conference.id: [] for conference in self.conferences}
+        for track_id, conference_id in Track.objects.filter(
+            conference__in=self.conferences
+        ).values_list('id', 'conference_id'):
+            self.track_ids[conference_id].append(track_id)
+        self.tiers = {conference.id: [] for conference in self.conferences}
+        for tier in RegistrationTier.objects.filter(conference__in=self.conferences).order_by('id'):
+            self.tiers[tier.conference_id].append(tier)
+        return len(self.conferences) + len(tracks) + len(tiers)
+
+    def create_memberships(self):
+        rng = self.rng
+        conference_ids = [conference.id for conference in self.conferences]
+        counts = _weighted(rng, CONFERENCES_PER_USER, len(self.user_ids))
+
+        def memberships():
+            seen_per_conference = dict.fromkeys(conference_ids, 0)
+            for user_id, count in zip(self.user_ids, counts):
+                chosen = set(rng.choices(conference_ids, weights=self.popularity, k=count))
+                for conference_id in sorted(chosen):
+                    position = seen_per_conference[conference_id]
+                    seen_per_conference[conference_id] += 1
+                    roll = rng.random()
+                    # Every conference gets a chair and a reviewer pool up front
+                    if position == 0 or roll < 0.005:
+                        role1, role2 = Role.CHAIR, Role.REVIEWER
+                    elif position <= 5 or roll < 0.12:
+                        role1, role2 = Role.AUTHOR, Role.REVIEWER
+                    else:
+                        role1, role2 = Role.AUTHOR, Role.NA
+                    yield Membership(
+                        user_id=user_id, conference_id=conference_id, role1=role1, role2=role2,
+                        is_paid=position <= 5 or rng.random() < 0.85,
+                        messaging_opt_in=rng.random() < 0.9,
+                    )
+
+        created = self.bulk_create(Membership, memberships())
+
+        self.memberships = list(
+            Membership.objects.filter(conference__in=self.conferences).order_by('id').values_list(
+                'id', 'user_id', 'conference_id', 'role1', 'role2', 'is_paid', 'messaging_opt_in'
+            )
+        )
+        self.bulk_create(MembershipRole, (
+            MembershipRole(membership_id=membership_id, conference_id=conference_id, role=role)
+            for membership_id, _, conference_id, role1, role2, _, _ in self.memberships
+            for role in {role1, role2} - {Role.NA}
+        ))
+
+        self.members = {conference_id: [] for conference_id in conference_ids}
+        self.paid_members = {conference_id: [] for conference_id in conference_ids}
+        self.reachable_members = {conference_id: [] for conference_id in conference_ids}
+        self.reviewers = {conference_id: [] for conference_id in conference_ids}
+        self.authors = []
+        for membership_id, user_id, conference_id, role1, role2, is_paid, opt_in in self.memberships:
+            self.members[conference_id].append(user_id)
+            if is_paid:
+                self.paid_members[conference_id].append(user_id)
+            if opt_in:
+                self.reachable_members[conference_id].append(user_id)
+            if Role.REVIEWER in (role1, role2):
+                self.reviewers[conference_id].append(user_id)
+            if role1 == Role.AUTHOR and is_paid:
+                self.authors.append((membership_id, user_id, conference_id))
+        return created
+
+    def create_payments(self):
+        rng = self.rng
+        tier_weights = [weight for _, _, weight in TIERS]
+
+        def payments():
+            for _, user_id, conference_id, _, _, is_paid, _ in self.memberships:
+                if is_paid:
+                    status = 'completed'
+                elif rng.random() < 0.3:
+                    status = rng.choice(['pending', 'failed'])
+                else:
+                    continue
+                tier = rng.choices(self.tiers[conference_id], weights=tier_weights)[0]
+                yield Payment(user_id=user_id, conference_id=conference_id, tier=tier, amount=tier.price, status=status)
+
+        return self.bulk_create(Payment, payments())
+
+    def create_submissions(self, submission_count, review_count):
+        rng = self.rng
+        if not self.authors:
+            return 0
+        past = {conference.id for conference in self.conferences if conference.end_date < timezone.now().date()}
+        per_submission = [review_count // submission_count] * submission_count if submission_count else []
+        for index in rng.sample(range(submission_count), review_count % submission_count if submission_count else 0):
+            per_submission[index] += 1
+
+        submissions = []
+        planned_reviews = []
+        for i in range(submission_count):
+            membership_id, user_id, conference_id = rng.choice(self.authors)
+            members = self.members[conference_id]
+            co_authors = [
+                co_author for co_author in rng.sample(members, min(_weighted(rng, CO_AUTHORS)[0], len(members)))
+                if co_author != user_id
+            ] + [None] * 3
+
+            reviewers = [reviewer for reviewer in self.reviewers[conference_id] if reviewer != user_id]
+            submitted_share = 0.9 if conference_id in past else 0.5
+            reviews = []
+            for reviewer_id in rng.sample(reviewers, min(per_submission[i], len(reviewers))):
+                submitted = rng.random() < submitted_share
+                recommendation = _weighted(rng, RECOMMENDATIONS)[0] if submitted else None
+                reviews.append((reviewer_id, recommendation, submitted))
+            planned_reviews.append(reviews)
+
+            submitted = [recommendation for _, recommendation, is_submitted in reviews if is_submitted]
+            status = Submissions.status_from_review_counts(
+                len(submitted), submitted.count('ACCEPT'), submitted.count('REJECT'), submitted.count('REVISE'),
+            )
+            submissions.append(Submissions(
+                membership_id=membership_id,
+                track_id=rng.choice(self.track_ids[conference_id]),
+                paper_title=f"{' '.join(rng.sample(TITLE_WORDS, 3))} #{i + 1}",
+                file=f'submissions/load/paper_{i + 1:06d}.pdf',
+                status=status,
+                co_author1_id=co_authors[0],
+                co_author2_id=co_authors[1],
+                co_author3_id=co_authors[2],
+            ))
+
+        self.bulk_create(Submissions, submissions)
+        submission_ids = list(
+            Submissions.objects.filter(membership__conference__in=self.conferences).order_by('id').values_list('id', flat=True)
+        )
+
+        now = timezone.now()
+        reviews = (
+            Review(
+                submission_id=submission_id, reviewer_id=reviewer_id, recommendation=recommendation,
+                is_submitted=is_submitted, comment='Synthetic review.' if is_submitted else None,
+                date_reviewed=now - timedelta(days=rng.randint(0, 60)) if is_submitted else None,
+            )
+            for submission_id, planned in zip(submission_ids, planned_reviews)
+            for reviewer_id, recommendation, is_submitted in planned
+        )
+        return len(submissions) + self.bulk_create(Review, reviews)
+
+    def create_sessions(self, count):
+        rng = self.rng
+        speaker_count = max(count // 2, 1)
+        linked_users = rng.sample(self.user_ids, min(speaker_count * 3 // 10, len(self.user_ids)))
+        speakers = [
+            Speaker(
+                user_id=linked_users[i] if i < len(linked_users) else None,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                email=f'speaker{i:05d}@{SEED_DOMAIN}',
+                bio='Synthetic speaker generated for load testing.',
+                organization=rng.choice(ORGANIZATIONS),
+            )
+            for i in range(speaker_count)
+        ]
+        self.bulk_create(Speaker, speakers)
+        speaker_ids = list(
+            Speaker.objects.filter(email__endswith=f'@{SEED_DOMAIN}').order_by('id').values_list('id', flat=True)
+        )
+
+        sessions = []
+        for i, conference in enumerate(rng.choices(self.conferences, weights=self.popularity, k=count)):
+            day = rng.randint(0, (conference.end_date - conference.start_date).days)
+            start = timezone.make_aware(datetime.combine(
+                conference.start_date + timedelta(days=day), datetime.min.time()
+            )) + timedelta(hours=rng.randint(8, 17))
+            has_zoom = rng.random() < 0.5
+            sessions.append(Session(
+                conference=conference,
+                track_id=rng.choice(self.track_ids[conference.id]),
+                title=f"{' '.join(rng.sample(TITLE_WORDS, 2))} session {i + 1}",
+                session_type=_weighted(rng, SESSION_TYPES)[0],
+                start_time=start,
+                end_time=start + timedelta(minutes=rng.choice([30, 45, 60, 90])),
+                room=f'Room {rng.randint(1, 20)}',
+                zoom_meeting_id=f'{i:011d}' if has_zoom else '',
+                zoom_meeting_url=f'https://zoom.us/j/{i:011d}' if has_zoom else '',
+                is_published=rng.random() < 0.9,
+            ))
+        self.bulk_create(Session, sessions)
+
+        self.sessions = list(
+            Session.objects.filter(conference__in=self.conferences).order_by('id').values_list('id', 'conference_id')
+        )
+        Through = Session.speakers.through
+        self.bulk_create(Through, (
+            Through(session_id=session_id, speaker_id=speaker_id)
+            for session_id, _ in self.sessions
+            for speaker_id in rng.sample(speaker_ids, min(rng.randint(1, 3), len(speaker_ids)))
+        ))
+        return len(speakers) + len(sessions)
+
+    def create_attendance(self, count):
+        rng = self.rng
+        sessions = [(session_id, conference_id) for session_id, conference_id in self.sessions if self.paid_members[conference_id]]
+        if not sessions:
+            return 0
+
+        def rows():
+            seen = set()
+            attempts = 0
+            while len(seen) < count and attempts < count * 3:
+                attempts += 1
+                session_id, conference_id = rng.choice(sessions)
+                key = (rng.choice(self.paid_members[conference_id]), session_id)
+                if key not in seen:
+                    seen.add(key)
+                    yield Attendance(user_id=key[0], session_id=session_id)
+
+        created = self.bulk_create(Attendance, rows())
+        # bulk_create skips join_session, so fill the per-membership counters in one UPDATE
+        Membership.objects.filter(conference__slug__startswith=SEED_SLUG_PREFIX).refresh_attendance_counts()
+        return created
+
+    def create_messages(self, count):
+        rng = self.rng
+        senders = [(user_id, conference_id) for _, user_id, conference_id, *_ in self.memberships]
+
+        def messages():
+            created = 0
+            while created < count:
+                sender_id, conference_id = rng.choice(senders)
+                recipient_id = rng.choice(self.reachable_members[conference_id] or self.members[conference_id])
+                if recipient_id == sender_id and len(self.members[conference_id]) > 1:
+                    continue
+                created += 1
+                yield AttendeeMessage(
+                    conference_id=conference_id, sender_id=sender_id, recipient_id=recipient_id,
+                    subject=rng.choice(MESSAGE_SUBJECTS), body='Synthetic message generated for load testing.',
+                    is_read=rng.random() < 0.6,
+                )
+
+        return self.bulk_create(AttendeeMessage, messages())
@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.text import slugify
 from django.utils import timezone
 from django.conf import settings
+from cmt.models_utils import ChangeTrackingMixin
 
 class Conference(models.Model):
     conference_name = models.CharField(max_length=200)
@@ -78,7 +79,7 @@ class RegistrationTier(models.Model):
     def __str__(self):
         return f"{self.name} - {self.conference.conference_name} (${self.price})"
 
-class Payment(models.Model):
+class Payment(ChangeTrackingMixin, models.Model):
     PAYMENT_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('completed', 'Completed'),
@@ -97,6 +98,9 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Status transitions and invoice-visible changes are detected without re-reading the row
+    tracked_fields = ('status', 'amount', 'currency', 'paypal_order_id', 'tier')
+
     class Meta:
         ordering = ['-created_at']
 
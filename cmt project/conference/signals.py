@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from membership.models import Membership
+
+from .certificate import delete_stored_certificates
+from .invoice import INVOICE_PAYMENT_FIELDS, INVOICE_USER_FIELDS, delete_stored_invoices
+from .models import Payment
+
+
+@receiver(post_save, sender=Payment)
+def drop_outdated_invoice(sender, instance, created, **kwargs):
+    if not created and instance.has_changed(*INVOICE_PAYMENT_FIELDS):
+        delete_stored_invoices(instance.pk)
+
+
+@receiver(post_delete, sender=Payment)
+def drop_deleted_invoice(sender, instance, **kwargs):
+    delete_stored_invoices(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def drop_outdated_user_invoices(sender, instance, created, **kwargs):
+    if not created and instance.has_changed(*INVOICE_USER_FIELDS):
+        for payment_id in instance.payments.values_list('id', flat=True):
+            delete_stored_invoices(payment_id)
+
+
+@receiver(post_delete, sender=Membership)
+def drop_deleted_certificate(sender, instance, **kwargs):
+    delete_stored_certificates(instance.pk)
@@ -5,6 +5,7 @@ from .models import Conference, Payment, RegistrationTier
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from submissions.emails import send_registration_confirmation
+from cmt import metrics
 
 @login_required
 def conference_list_view(request):
@@ -106,7 +107,8 @@ def payment_checkout(request, slug):
             request_paypal = CreateOrderRequest(**order_data)
             client = get_paypal_client()
             orders_service = OrdersService(client)
-            response = orders_service.create_order(request_paypal)
+            with metrics.timed('cmt_external_api', service='paypal', operation='create_order'):
+                response = orders_service.create_order(request_paypal)
 
             # Create Payment record
             Payment.objects.create(
@@ -173,7 +175,8 @@ def payment_success(request, slug):
         # Capture the payment using OrdersService
         client = get_paypal_client()
         orders_service = OrdersService(client)
-        response = orders_service.capture_order(paypal_order_id)
+        with metrics.timed('cmt_external_api', service='paypal', operation='capture_order'):
+            response = orders_service.capture_order(paypal_order_id)
         
         if response.status == "COMPLETED":
             # Update membership to paid
@@ -270,17 +273,8 @@ def user_dashboard(request):
         end_time__gte=timezone.now(),
     ).select_related('conference', 'track').prefetch_related('speakers').order_by('start_time')[:10]
 
-    # Conferences eligible for certificate (past conferences where user attended sessions)
-    from schedule.models import Attendance
-    past_paid_memberships = memberships.filter(
-        is_paid=True,
-        conference__end_date__lt=timezone.now().date(),
-    )
-    certificate_memberships = []
-    for m in past_paid_memberships:
-        attendance_count = Attendance.objects.filter(user=request.user, session__conference=m.conference).count()
-        if attendance_count > 0:
-            certificate_memberships.append({'membership': m, 'sessions_attended': attendance_count})
+    # Conferences eligible for certificate, from the memberships already loaded above
+    certificate_memberships = [m for m in memberships if m.is_certificate_eligible]
 
     context = {
         'memberships': memberships,
@@ -295,12 +289,13 @@ def user_dashboard(request):
 @login_required
 def download_invoice(request, payment_id):
     """Download PDF invoice for a completed payment."""
-    payment = get_object_or_404(Payment, id=payment_id, user=request.user, status='completed')
-
-    from .invoice import generate_invoice_pdf
-    buffer = generate_invoice_pdf(payment)
+    payment = get_object_or_404(
+        Payment.objects.select_related('user', 'conference', 'tier'),
+        id=payment_id, user=request.user, status='completed',
+    )
 
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    from .invoice import get_invoice_pdf
+    response = HttpResponse(get_invoice_pdf(payment), content_type='application/pdf')
     response['Content-Disposition'] = f'attachment; filename="IATM_Invoice_{payment.id:06d}.pdf"'
     return response
 
@@ -309,9 +304,11 @@ def download_invoice(request, payment_id):
 def download_certificate(request, membership_id):
     """Download attendance certificate PDF for a completed conference."""
     from membership.models import Membership
-    from schedule.models import Attendance
 
-    membership = get_object_or_404(Membership, id=membership_id, user=request.user, is_paid=True)
+    membership = get_object_or_404(
+        Membership.objects.select_related('user', 'conference'),
+        id=membership_id, user=request.user, is_paid=True,
+    )
 
     # Conference must be over
     from django.utils import timezone
@@ -320,17 +317,13 @@ def download_certificate(request, membership_id):
         return redirect('user_dashboard')
 
     # User must have attended at least one session
-    attendance_count = Attendance.objects.filter(
-        user=request.user, session__conference=membership.conference
-    ).count()
-    if attendance_count == 0:
+    if not membership.is_certificate_eligible:
         messages.error(request, "No session attendance recorded for this conference.")
         return redirect('user_dashboard')
 
-    from .certificate import generate_certificate_pdf
-    buffer = generate_certificate_pdf(request.user, membership.conference, attendance_count)
-
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    # Pre-rendered by generate_certificates; rendered here only if missing or outdated
+    from .certificate import get_certificate_pdf
+    response = HttpResponse(get_certificate_pdf(membership, membership.sessions_attended), content_type='application/pdf')
     filename = f"IATM_Certificate_{membership.conference.slug}.pdf"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
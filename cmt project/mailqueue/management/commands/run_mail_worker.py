@@ -0,0 +1,50 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from mailqueue.worker import process_batch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbound emails in batches over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_QUEUE_BATCH_SIZE, help='Emails sent per connection/batch')
+        parser.add_argument('--max-attempts', type=int, default=settings.EMAIL_QUEUE_MAX_ATTEMPTS, help='Attempts before an email is marked failed')
+        parser.add_argument('--backoff', type=int, default=settings.EMAIL_QUEUE_BACKOFF_SECONDS, help='Base retry delay in seconds (doubles per attempt)')
+        parser.add_argument('--rate', type=int, default=settings.EMAIL_QUEUE_CONFERENCE_RATE, help='Max emails per conference per minute (0 = unlimited)')
+        parser.add_argument('--sleep', type=float, default=5, help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the currently due emails and exit')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Mail worker started.')
+        while True:
+            try:
+                sent, failed, deferred = process_batch(
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                    backoff_seconds=options['backoff'],
+                    rate_per_minute=options['rate'],
+                )
+            except Exception as e:
+                # e.g. the database went away; keep the worker alive and try again after a pause
+                logger.exception("Mail worker batch failed")
+                if options['once']:
+                    raise CommandError(f"Mail worker batch failed: {e}")
+                close_old_connections()
+                time.sleep(options['sleep'])
+                continue
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}, deferred {deferred}")
+
+            if not (sent or failed):
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS('Mail worker finished.'))
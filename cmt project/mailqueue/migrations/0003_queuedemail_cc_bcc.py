@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mailqueue', '0002_queuedemail_sending_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='bcc',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='queuedemail',
+            name='cc',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
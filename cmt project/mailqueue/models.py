@@ -0,0 +1,97 @@
+import base64
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+from conference.models import Conference
+
+
+class QueuedEmail(models.Model):
+    """An outbound email waiting to be delivered by the run_mail_worker command."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    conference = models.ForeignKey(Conference, on_delete=models.SET_NULL, null=True, blank=True, related_name='queued_emails')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    attachments = models.JSONField(default=list, blank=True, help_text="List of [filename, base64 content, mimetype]")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='queued_email_due_idx'),
+            models.Index(fields=['conference', 'status', 'sent_at'], name='queued_email_rate_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+    @classmethod
+    def from_message(cls, message, conference=None):
+        """Build an unsaved queue entry from an EmailMessage/EmailMultiAlternatives."""
+        html_body = next(
+            (content for content, mimetype in getattr(message, 'alternatives', []) if mimetype == 'text/html'),
+            '',
+        )
+        attachments = []
+        for filename, content, mimetype in message.attachments:
+            if isinstance(content, str):
+                content = content.encode()
+            attachments.append([filename, base64.b64encode(content).decode('ascii'), mimetype])
+
+        return cls(
+            conference=conference,
+            subject=message.subject,
+            body=message.body,
+            html_body=html_body,
+            from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            attachments=attachments,
+        )
+
+    def to_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        for filename, content, mimetype in self.attachments:
+            message.attach(filename, base64.b64decode(content), mimetype)
+        return message
+
+    def mark_failed_attempt(self, error, max_attempts, backoff_seconds):
+        """Record a failed delivery and schedule an exponential-backoff retry."""
+        self.attempts += 1
+        self.last_error = str(error)[:2000]
+        if self.attempts >= max_attempts:
+            self.status = 'failed'
+        else:
+            self.status = 'pending'
+            delay = min(backoff_seconds * 2 ** (self.attempts - 1), 3600)
+            self.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -0,0 +1,103 @@
+import logging
+from collections import namedtuple
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(message, conference=None):
+    """Store an email in the outbox for the mail worker to deliver."""
+    queued = QueuedEmail.from_message(message, conference=conference)
+    queued.save()
+    return queued
+
+
+def enqueue_many(messages, conference=None, batch_size=500):
+    """Store many emails in the outbox with batched inserts. Returns the number queued."""
+    batch = []
+    queued = 0
+    for message in messages:
+        batch.append(QueuedEmail.from_message(message, conference=conference))
+        if len(batch) >= batch_size:
+            QueuedEmail.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+    if batch:
+        QueuedEmail.objects.bulk_create(batch)
+        queued += len(batch)
+    return queued
+
+
+# ``delivered`` holds one bool per message of the chunk, in order
+ChunkResult = namedtuple('ChunkResult', ['index', 'sent', 'failed', 'delivered'])
+
+
+def send_batched(messages, chunk_size=None, connection=None, on_chunk=None):
+    """
+    Send an iterable of messages over one backend connection, one
+    send_messages() call per message so a refused address fails only its own
+    message. Results are reported per chunk: a ChunkResult per chunk is
+    returned, and ``on_chunk(result, chunk)`` is also called as each chunk
+    goes out. A failed message is logged with its exception and the
+    connection is reopened for the next one; if it cannot be reopened, the
+    rest of the chunk is counted as failed and the next chunk tries again.
+    """
+    chunk_size = chunk_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    connection = connection or get_connection(fail_silently=False)
+    results = []
+    messages = iter(messages)
+    try:
+        while True:
+            chunk = list(islice(messages, chunk_size))
+            if not chunk:
+                break
+            index = len(results) + 1
+            delivered = []
+            for message in chunk:
+                try:
+                    connection.open()  # no-op while the connection is up
+                except Exception:
+                    logger.exception(f"Could not open the email connection for chunk {index}")
+                    delivered += [False] * (len(chunk) - len(delivered))
+                    break
+                try:
+                    delivered.append(bool(connection.send_messages([message])))
+                except Exception:
+                    logger.exception(f"Email chunk {index}: message to {', '.join(message.to)} failed")
+                    delivered.append(False)
+                    _close_quietly(connection)
+            sent = sum(delivered)
+            result = ChunkResult(index, sent, len(chunk) - sent, delivered)
+            if result.failed:
+                logger.warning(f"Email chunk {result.index}: sent {result.sent}, failed {result.failed}")
+            else:
+                logger.info(f"Email chunk {result.index}: sent {result.sent}")
+            results.append(result)
+            if on_chunk:
+                on_chunk(result, chunk)
+    finally:
+        _close_quietly(connection)
+    return results
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        logger.warning("Error closing the email connection", exc_info=True)
+
+
+def deliver(message, conference=None):
+    """
+    Queue the message when EMAIL_QUEUE_ENABLED is on, otherwise send it now.
+    Either way the caller does not wait on SMTP when the queue is enabled.
+    """
+    if getattr(settings, 'EMAIL_QUEUE_ENABLED', False):
+        enqueue(message, conference=conference)
+    else:
+        message.send()
@@ -0,0 +1,220 @@
+import smtplib
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from conference.models import Conference
+from .models import QueuedEmail
+from .queue import deliver, enqueue, enqueue_many, send_batched
+from .worker import CLAIM_TIMEOUT, process_batch
+
+LOCMEM = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class UnreachableBackend(LocmemBackend):
+    """An SMTP server that refuses every connection."""
+
+    def open(self):
+        raise smtplib.SMTPConnectError(421, 'Service not available')
+
+    def send_messages(self, messages):
+        self.open()
+
+
+class RejectingBackend(LocmemBackend):
+    """Accepts every message except those addressed to rejected@example.com."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'rejected@example.com' in message.to:
+                raise smtplib.SMTPRecipientsRefused({'rejected@example.com': (550, 'No such user')})
+        return super().send_messages(messages)
+
+
+def make_message(to='attendee@example.com', subject='Hello'):
+    message = EmailMultiAlternatives(subject=subject, body='Plain body', from_email='noreply@example.com', to=[to])
+    message.attach_alternative('<p>HTML body</p>', 'text/html')
+    return message
+
+
+@override_settings(EMAIL_BACKEND=LOCMEM, EMAIL_QUEUE_BATCH_SIZE=50, EMAIL_QUEUE_MAX_ATTEMPTS=3,
+                   EMAIL_QUEUE_BACKOFF_SECONDS=60, EMAIL_QUEUE_CONFERENCE_RATE=0)
+class MailQueueTestBase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.conference = Conference.objects.create(
+            conference_name='Test Conference', conference_description='A test conference',
+            start_date='2026-06-01', end_date='2026-06-03', location='Test Location',
+        )
+
+
+class EnqueueTest(MailQueueTestBase):
+
+    def test_enqueue_round_trips_the_message(self):
+        message = make_message()
+        message.attach('notes.bin', b'\x00attached', 'application/octet-stream')
+        queued = enqueue(message, conference=self.conference)
+
+        self.assertEqual(queued.status, 'pending')
+        self.assertEqual(queued.to, ['attendee@example.com'])
+        self.assertEqual(len(mail.outbox), 0)
+
+        rebuilt = QueuedEmail.objects.get(pk=queued.pk).to_message()
+        self.assertEqual(rebuilt.subject, 'Hello')
+        self.assertEqual(rebuilt.alternatives[0][0], '<p>HTML body</p>')
+        self.assertEqual(rebuilt.attachments[0][:2], ('notes.bin', b'\x00attached'))
+
+    def test_enqueue_keeps_bcc_out_of_the_headers(self):
+        message = make_message()
+        message.cc = ['chair@example.com']
+        message.bcc = ['archive@example.com']
+        queued = enqueue(message)
+
+        self.assertEqual(queued.to, ['attendee@example.com'])
+        rebuilt = QueuedEmail.objects.get(pk=queued.pk).to_message()
+        self.assertEqual(rebuilt.recipients(), ['attendee@example.com', 'chair@example.com', 'archive@example.com'])
+        headers = rebuilt.message()
+        self.assertEqual(headers['To'], 'attendee@example.com')
+        self.assertEqual(headers['Cc'], 'chair@example.com')
+        self.assertNotIn('archive@example.com', headers.as_string())
+
+    def test_enqueue_many_inserts_in_batches(self):
+        with self.assertNumQueries(3):
+            queued = enqueue_many((make_message(f'user{i}@example.com') for i in range(5)), batch_size=2)
+        self.assertEqual(queued, 5)
+        self.assertEqual(QueuedEmail.objects.filter(status='pending').count(), 5)
+
+    def test_deliver_sends_now_unless_queue_enabled(self):
+        deliver(make_message())
+        self.assertEqual(len(mail.outbox), 1)
+        with self.settings(EMAIL_QUEUE_ENABLED=True):
+            deliver(make_message(), conference=self.conference)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+
+class WorkerTest(MailQueueTestBase):
+
+    def test_sends_due_emails(self):
+        enqueue_many(make_message(f'user{i}@example.com') for i in range(3))
+        later = enqueue(make_message('later@example.com'))
+        QueuedEmail.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(process_batch(), (3, 0, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(QueuedEmail.objects.filter(status='sent', sent_at__isnull=False).count(), 3)
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'pending')
+        self.assertEqual(process_batch(), (0, 0, 0))
+
+    @override_settings(EMAIL_BACKEND='mailqueue.tests.RejectingBackend')
+    def test_failed_email_is_retried_with_backoff(self):
+        enqueue(make_message('ok@example.com'))
+        rejected = enqueue(make_message('rejected@example.com'))
+
+        before = timezone.now()
+        with self.assertLogs('mailqueue.worker', level='WARNING'):
+            self.assertEqual(process_batch(), (1, 1, 0))
+        rejected.refresh_from_db()
+        self.assertEqual(rejected.status, 'pending')
+        self.assertEqual(rejected.attempts, 1)
+        self.assertIn('No such user', rejected.last_error)
+        self.assertGreaterEqual(rejected.next_attempt_at, before + timedelta(seconds=60))
+
+        # The second attempt doubles the delay; the third gives up
+        QueuedEmail.objects.filter(pk=rejected.pk).update(next_attempt_at=timezone.now())
+        before = timezone.now()
+        with self.assertLogs('mailqueue.worker', level='WARNING'):
+            process_batch()
+        rejected.refresh_from_db()
+        self.assertEqual(rejected.attempts, 2)
+        self.assertGreaterEqual(rejected.next_attempt_at, before + timedelta(seconds=120))
+
+        QueuedEmail.objects.filter(pk=rejected.pk).update(next_attempt_at=timezone.now())
+        with self.assertLogs('mailqueue.worker', level='WARNING'):
+            process_batch()
+        rejected.refresh_from_db()
+        self.assertEqual((rejected.status, rejected.attempts), ('failed', 3))
+        self.assertEqual(process_batch(), (0, 0, 0))
+
+    @override_settings(EMAIL_BACKEND='mailqueue.tests.UnreachableBackend')
+    def test_connection_failure_backs_off_every_claimed_email(self):
+        enqueue_many(make_message(f'user{i}@example.com') for i in range(3))
+
+        with self.assertLogs('mailqueue.worker', level='WARNING'):
+            self.assertEqual(process_batch(), (0, 3, 0))
+        for email in QueuedEmail.objects.all():
+            self.assertEqual((email.status, email.attempts), ('pending', 1))
+            self.assertIn('Service not available', email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(process_batch(), (0, 0, 0))
+
+    def test_stale_claims_are_picked_up_again(self):
+        email = enqueue(make_message())
+        QueuedEmail.objects.filter(pk=email.pk).update(status='sending', next_attempt_at=timezone.now() + CLAIM_TIMEOUT)
+        self.assertEqual(process_batch(), (0, 0, 0))
+
+        QueuedEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(process_batch(), (1, 0, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'sent')
+
+    def test_conference_rate_defers_the_excess(self):
+        other = Conference.objects.create(
+            conference_name='Other Conference', conference_description='Another', start_date='2026-07-01',
+            end_date='2026-07-02', location='Elsewhere',
+        )
+        enqueue_many((make_message(f'user{i}@example.com') for i in range(5)), conference=self.conference)
+        enqueue_many((make_message(f'other{i}@example.com') for i in range(2)), conference=other)
+        enqueue(make_message('no-conference@example.com'))
+
+        self.assertEqual(process_batch(rate_per_minute=3), (6, 0, 2))
+        self.assertEqual(QueuedEmail.objects.filter(conference=self.conference, status='sent').count(), 3)
+        deferred = QueuedEmail.objects.filter(conference=self.conference, status='pending')
+        self.assertEqual(deferred.count(), 2)
+        self.assertTrue(all(e.next_attempt_at > timezone.now() for e in deferred))
+
+        # Emails sent within the last minute still count against the limit
+        QueuedEmail.objects.filter(status='pending').update(next_attempt_at=timezone.now())
+        self.assertEqual(process_batch(rate_per_minute=3), (0, 0, 2))
+        QueuedEmail.objects.filter(status='sent').update(sent_at=timezone.now() - timedelta(minutes=2))
+        QueuedEmail.objects.filter(status='pending').update(next_attempt_at=timezone.now())
+        self.assertEqual(process_batch(rate_per_minute=3), (2, 0, 0))
+
+
+class SendBatchedTest(MailQueueTestBase):
+
+    def test_sends_in_chunks(self):
+        seen = []
+        results = send_batched(
+            (make_message(f'user{i}@example.com') for i in range(5)), chunk_size=2,
+            on_chunk=lambda result, chunk: seen.append((result, len(chunk))),
+        )
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual([(r.sent, r.failed) for r in results], [(2, 0), (2, 0), (1, 0)])
+        self.assertEqual([size for _, size in seen], [2, 2, 1])
+
+    @override_settings(EMAIL_BACKEND='mailqueue.tests.RejectingBackend')
+    def test_failed_message_is_logged_and_counted_alone(self):
+        messages = [
+            make_message('a@example.com'), make_message('rejected@example.com'),
+            make_message('b@example.com'), make_message('c@example.com'),
+        ]
+        with self.assertLogs('mailqueue.queue', level='ERROR') as logs:
+            results = send_batched(messages, chunk_size=3)
+        self.assertEqual([(r.sent, r.failed) for r in results], [(2, 1), (1, 0)])
+        self.assertEqual(results[0].delivered, [True, False, True])
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['a@example.com', 'b@example.com', 'c@example.com'])
+        self.assertIn('SMTPRecipientsRefused', '\n'.join(logs.output))
+
+    @override_settings(EMAIL_BACKEND='mailqueue.tests.UnreachableBackend')
+    def test_unreachable_server_fails_every_chunk(self):
+        with self.assertLogs('mailqueue.queue', level='ERROR'):
+            results = send_batched([make_message() for _ in range(3)], chunk_size=2)
+        self.assertEqual([(r.sent, r.failed) for r in results], [(0, 2), (0, 1)])
+        self.assertEqual(results[0].delivered, [False, False])
@@ -0,0 +1,125 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+RATE_WINDOW = timedelta(minutes=1)
+# A claimed email still 'sending' after this long (its worker died) is picked up again
+CLAIM_TIMEOUT = timedelta(minutes=10)
+UPDATE_FIELDS = ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at']
+
+
+def _conference_allowance(conference_ids, rate_per_minute):
+    """Remaining sends per conference within the current rate window, counting emails other workers are sending."""
+    recent = QueuedEmail.objects.filter(
+        Q(status='sent', sent_at__gte=timezone.now() - RATE_WINDOW) | Q(status='sending'),
+        conference_id__in=conference_ids,
+    ).values('conference_id').annotate(sent=Count('id')).order_by()
+    sent_by_conference = {row['conference_id']: row['sent'] for row in recent}
+    return {cid: max(rate_per_minute - sent_by_conference.get(cid, 0), 0) for cid in conference_ids}
+
+
+def claim_batch(batch_size, rate_per_minute):
+    """
+    Claim up to ``batch_size`` due emails in one short transaction.
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    workers can drain the outbox concurrently, and marked 'sending' before the
+    transaction commits; no lock is held while talking to SMTP. Emails over
+    their conference's rate are pushed to the next window instead. Returns
+    (claimed emails, number deferred).
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        due = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not due:
+            return [], 0
+
+        allowance = None
+        if rate_per_minute:
+            allowance = _conference_allowance({e.conference_id for e in due if e.conference_id}, rate_per_minute)
+
+        claimed, deferred = [], []
+        for email in due:
+            if allowance is not None and email.conference_id:
+                if allowance[email.conference_id] <= 0:
+                    # Over the per-conference limit: try again next window
+                    email.status = 'pending'
+                    email.next_attempt_at = now + RATE_WINDOW
+                    deferred.append(email)
+                    continue
+                allowance[email.conference_id] -= 1
+            email.status = 'sending'
+            email.next_attempt_at = now + CLAIM_TIMEOUT
+            claimed.append(email)
+
+        QueuedEmail.objects.bulk_update(due, ['status', 'next_attempt_at'])
+    return claimed, len(deferred)
+
+
+def send_claimed(emails, max_attempts, backoff_seconds):
+    """
+    Send claimed emails over one backend connection and record each outcome.
+    If the connection cannot be opened, every email gets a failed attempt
+    (and its backoff). Returns (sent, failed).
+    """
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning(f"Could not open an email connection for {len(emails)} queued email(s): {e}")
+        for email in emails:
+            email.mark_failed_attempt(e, max_attempts, backoff_seconds)
+        failed = len(emails)
+    else:
+        try:
+            for email in emails:
+                try:
+                    connection.send_messages([email.to_message(connection=connection)])
+                except Exception as e:
+                    logger.warning(f"Failed to send queued email {email.pk}: {e}")
+                    email.mark_failed_attempt(e, max_attempts, backoff_seconds)
+                    failed += 1
+                else:
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    sent += 1
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                logger.warning("Error closing the email connection", exc_info=True)
+
+    QueuedEmail.objects.bulk_update(emails, UPDATE_FIELDS)
+    return sent, failed
+
+
+def process_batch(batch_size=None, max_attempts=None, backoff_seconds=None, rate_per_minute=None):
+    """
+    Claim one batch of due emails, then deliver it over a single backend
+    connection outside any transaction. Returns (sent, failed, deferred).
+    """
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_QUEUE_MAX_ATTEMPTS
+    backoff_seconds = backoff_seconds or settings.EMAIL_QUEUE_BACKOFF_SECONDS
+    if rate_per_minute is None:
+        rate_per_minute = settings.EMAIL_QUEUE_CONFERENCE_RATE
+
+    claimed, deferred = claim_batch(batch_size, rate_per_minute)
+    if not claimed:
+        return 0, 0, deferred
+    sent, failed = send_claimed(claimed, max_attempts, backoff_seconds)
+    return sent, failed, deferred
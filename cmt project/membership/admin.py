@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Membership, AttendeeMessage
+from .models import Membership, AttendeeMessage, CheckIn
 
 @admin.register(Membership)
 class MembershipAdmin(admin.ModelAdmin):
@@ -25,3 +25,12 @@ class AttendeeMessageAdmin(admin.ModelAdmin):
     list_filter = ('conference', 'is_read')
     search_fields = ('sender__email', 'recipient__email', 'subject')
     readonly_fields = ('created_at',)
+
+
+@admin.register(CheckIn)
+class CheckInAdmin(admin.ModelAdmin):
+    list_display = ('membership', 'conference', 'scanned_at', 'device', 'recorded_at')
+    list_filter = ('conference', 'device')
+    search_fields = ('membership__user__email',)
+    raw_id_fields = ('membership',)
+    readonly_fields = ('recorded_at',)
@@ -1,47 +1,154 @@
+import hashlib
 import io
+import threading
+from collections import OrderedDict
+
 import qrcode
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image as PILImage
 from reportlab.lib.pagesizes import landscape
 from reportlab.lib.units import inch, mm
-from reportlab.lib.colors import HexColor
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from cmt import metrics
+from cmt.pdf_styles import get_stylesheet
+from .tickets import make_ticket
 
 
 BADGE_SIZE = (4 * inch, 3 * inch)
+QR_BOX_SIZE = 6
+QR_BORDER = 2
 
 
-def generate_qr_code(data):
-    """Generate a QR code image and return as bytes buffer."""
-    qr = qrcode.QRCode(version=1, box_size=6, border=2)
+def qr_matrix(data):
+    """QR modules for ``data``, border included, as rows of booleans (True is dark)."""
+    qr = qrcode.QRCode(version=1, box_size=QR_BOX_SIZE, border=QR_BORDER)
     qr.add_data(data)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
+    return qr.get_matrix()
+
+
+def qr_modules(data):
+    """
+    The QR code for ``data`` at one pixel per module, as (size, greyscale
+    bytes). Badge sheets draw it scaled up, embedding a tiny image per badge.
+    """
+    matrix = qr_matrix(data)
+    return len(matrix), bytes(0 if dark else 255 for row in matrix for dark in row)
+
+
+def encode_qr_png(modules):
+    """
+    1-bit PNG of QR modules (see qr_modules) at QR_BOX_SIZE pixels per
+    module. Scaling a one-pixel-per-module image up is much cheaper than
+    qrcode's image factory, which draws every module as a rectangle; the
+    pixels are the same.
+    """
+    size, pixels = modules
+    image = PILImage.frombytes('L', (size, size), pixels)
+    image = image.resize((size * QR_BOX_SIZE, size * QR_BOX_SIZE), PILImage.NEAREST).convert('1')
     buf = io.BytesIO()
-    img.save(buf, format='PNG')
-    buf.seek(0)
-    return buf
+    image.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+class QRCodeCache:
+    """
+    Bounded LRU of QR codes keyed by kind ('png' for tickets and badges,
+    'modules' for badge sheets) and payload hash, in front of the shared
+    Django cache when QR_SHARED_CACHE_TIMEOUT is set. Payloads are stable per
+    membership, so repeat downloads and sheets skip encoding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(kind, data):
+        return f"qr:{kind}:{hashlib.sha256(data.encode('utf-8')).hexdigest()}"
+
+    def lookup(self, kind, data):
+        """The cached value, or None (counted as a miss)."""
+        key = self._key(kind, data)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is not None:
+            metrics.inc('cmt_qr_cache_total', kind=kind, result='memory')
+            return value
+
+        value = cache.get(key) if settings.QR_SHARED_CACHE_TIMEOUT else None
+        if value is None:
+            metrics.inc('cmt_qr_cache_total', kind=kind, result='miss')
+            return None
+        metrics.inc('cmt_qr_cache_total', kind=kind, result='shared')
+        self._remember(key, value)
+        return value
+
+    def store(self, kind, data, value):
+        key = self._key(kind, data)
+        if settings.QR_SHARED_CACHE_TIMEOUT:
+            cache.set(key, value, settings.QR_SHARED_CACHE_TIMEOUT)
+        self._remember(key, value)
 
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.QR_CACHE_SIZE:
+                self._entries.popitem(last=False)
 
+    def get_modules(self, data):
+        modules = self.lookup('modules', data)
+        if modules is None:
+            modules = qr_modules(data)
+            self.store('modules', data, modules)
+        return modules
+
+    def get_png(self, data):
+        png = self.lookup('png', data)
+        if png is None:
+            png = encode_qr_png(self.get_modules(data))
+            self.store('png', data, png)
+        return png
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+qr_cache = QRCodeCache()
+
+
+def generate_qr_code(data):
+    """Return the QR code PNG for ``data`` as a bytes buffer (cached)."""
+    return io.BytesIO(qr_cache.get_png(data))
+
+
+def qr_payload(membership):
+    """Signed ticket encoded in a membership's ticket and badge QR code."""
+    return make_ticket(membership.id, membership.conference_id)
+
+
+@metrics.timed('cmt_pdf_render', document='badge')
 def generate_badge_pdf(membership):
     """Generate a printable name badge with QR code."""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=landscape(BADGE_SIZE), topMargin=0.3 * inch, bottomMargin=0.2 * inch, leftMargin=0.3 * inch, rightMargin=0.3 * inch)
 
-    styles = getSampleStyleSheet()
-    brand_color = HexColor('#667eea')
-
-    title_style = ParagraphStyle('BadgeTitle', parent=styles['Title'], fontSize=10, textColor=brand_color, alignment=TA_CENTER, spaceAfter=2)
-    name_style = ParagraphStyle('BadgeName', parent=styles['Title'], fontSize=16, textColor=HexColor('#1e293b'), alignment=TA_CENTER, spaceAfter=2)
-    org_style = ParagraphStyle('BadgeOrg', parent=styles['Normal'], fontSize=10, textColor=HexColor('#64748b'), alignment=TA_CENTER, spaceAfter=2)
-    role_style = ParagraphStyle('BadgeRole', parent=styles['Normal'], fontSize=9, textColor=HexColor('#ffffff'), alignment=TA_CENTER, backColor=brand_color)
+    styles = get_stylesheet()
+    title_style = styles['BadgeTitle']
+    name_style = styles['BadgeName']
+    org_style = styles['BadgeOrg']
+    role_style = styles['BadgeRole']
 
     user = membership.user
     conference = membership.conference
 
     # QR code with membership info
-    qr_data = f"IATM|{user.email}|{conference.slug}|{membership.id}"
-    qr_buf = generate_qr_code(qr_data)
+    qr_buf = generate_qr_code(qr_payload(membership))
     qr_image = Image(qr_buf, width=0.8 * inch, height=0.8 * inch)
 
     elements = []
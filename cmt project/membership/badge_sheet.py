@@ -0,0 +1,190 @@
+"""
+N-up badge sheets: every badge for a set of paid memberships on one
+multi-page letter/A4 PDF, drawn straight on a canvas with shared cut lines
+and crop marks in the page margin.
+
+Staff downloads render in the web process from cached QR codes and are
+capped at BADGE_SHEET_MAX_BADGES; the print_badges command has no cap and
+can spread QR encoding over a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+from django.db.models.functions import Lower
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from cmt import metrics
+from cmt.pdf_styles import BRAND_COLOR, HEADING_COLOR, MUTED_COLOR, WHITE, register_fonts
+from .badge import BADGE_SIZE, qr_cache, qr_modules, qr_payload
+from .models import Membership
+
+PAPER_SIZES = {'letter': letter, 'a4': A4}
+
+CROP_MARK_COLOR = HexColor('#94a3b8')
+
+QR_SIZE = 0.8 * inch
+CROP_MARK_LENGTH = 0.18 * inch
+CROP_MARK_OFFSET = 0.04 * inch
+QR_CHUNK_SIZE = 64
+
+
+def badge_sheet_memberships(conference, role=None, last_name_from=None, last_name_to=None):
+    """Paid memberships to print, ordered by last name, optionally by role and last-name range (inclusive initials)."""
+    memberships = Membership.objects.filter(conference=conference, is_paid=True).select_related('user', 'conference')
+    if role:
+        memberships = memberships.with_role(conference, role)
+    memberships = memberships.annotate(last_name_key=Lower('user__last_name'))
+    if last_name_from:
+        memberships = memberships.filter(last_name_key__gte=last_name_from.lower())
+    if last_name_to:
+        # Up to and including names starting with last_name_to
+        memberships = memberships.filter(last_name_key__lt=last_name_to.lower() + '\uffff')
+    return memberships.order_by('last_name_key', Lower('user__first_name'), 'id')
+
+
+def build_qr_codes(payloads, workers=1):
+    """
+    QR modules per payload from qr_cache. Misses are encoded in-process, or
+    across a process pool when ``workers`` > 1 (QR encoding is pure Python
+    and CPU-bound), and cached.
+    """
+    codes = [qr_cache.lookup('modules', payload) for payload in payloads]
+    missing = [payload for payload, code in zip(payloads, codes) if code is None]
+    if workers > 1 and len(missing) >= QR_CHUNK_SIZE:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(qr_modules, missing, chunksize=QR_CHUNK_SIZE))
+    else:
+        built = [qr_modules(payload) for payload in missing]
+    built = iter(built)
+    for index, payload in enumerate(payloads):
+        if codes[index] is None:
+            codes[index] = next(built)
+            qr_cache.store('modules', payload, codes[index])
+    return codes
+
+
+def _grid(paper):
+    """
+    Columns, rows, bottom-left origin and cell size of a centred badge grid,
+    turning the badges sideways when more of them fit that way (e.g. on A4).
+    """
+    page_width, page_height = paper
+    margin = CROP_MARK_OFFSET + CROP_MARK_LENGTH
+    layouts = []
+    for rotated in (False, True):
+        cell_width, cell_height = BADGE_SIZE[::-1] if rotated else BADGE_SIZE
+        columns = int((page_width - 2 * margin) // cell_width)
+        rows = int((page_height - 2 * margin) // cell_height)
+        layouts.append((columns * rows, -rotated, columns, rows, cell_width, cell_height))
+    _, rotated, columns, rows, cell_width, cell_height = max(layouts)
+    x0 = (page_width - columns * cell_width) / 2
+    y0 = (page_height - rows * cell_height) / 2
+    return columns, rows, x0, y0, (cell_width, cell_height), bool(rotated)
+
+
+def _fit_font_size(text, font, size, width, minimum=7):
+    while size > minimum and stringWidth(text, font, size) > width:
+        size -= 0.5
+    return size
+
+
+def _draw_crop_marks(c, columns, rows, x0, y0, cell):
+    """Marks in the margin at every cut line, so the sheet can be guillotined."""
+    badge_width, badge_height = cell
+    x1, y1 = x0 + columns * badge_width, y0 + rows * badge_height
+    c.setStrokeColor(CROP_MARK_COLOR)
+    c.setLineWidth(0.5)
+    for i in range(columns + 1):
+        x = x0 + i * badge_width
+        c.line(x, y0 - CROP_MARK_OFFSET, x, y0 - CROP_MARK_OFFSET - CROP_MARK_LENGTH)
+        c.line(x, y1 + CROP_MARK_OFFSET, x, y1 + CROP_MARK_OFFSET + CROP_MARK_LENGTH)
+    for j in range(rows + 1):
+        y = y0 + j * badge_height
+        c.line(x0 - CROP_MARK_OFFSET, y, x0 - CROP_MARK_OFFSET - CROP_MARK_LENGTH, y)
+        c.line(x1 + CROP_MARK_OFFSET, y, x1 + CROP_MARK_OFFSET + CROP_MARK_LENGTH, y)
+
+
+def _draw_badge(c, membership, qr, x, y):
+    """Same content as generate_badge_pdf, drawn into the badge cell at (x, y)."""
+    badge_width, badge_height = BADGE_SIZE
+    user = membership.user
+    center = x + badge_width / 2
+    text_width = badge_width - 0.4 * inch
+    top = y + badge_height - 0.35 * inch
+
+    conference_name = membership.conference.conference_name
+    size = _fit_font_size(conference_name, 'Helvetica-Bold', 10, text_width)
+    c.setFillColor(BRAND_COLOR)
+    c.setFont('Helvetica-Bold', size)
+    c.drawCentredString(center, top, conference_name)
+
+    full_name = user.get_full_name()
+    size = _fit_font_size(full_name, 'Helvetica-Bold', 16, text_width)
+    c.setFillColor(HEADING_COLOR)
+    c.setFont('Helvetica-Bold', size)
+    c.drawCentredString(center, top - 0.35 * inch, full_name)
+
+    line = top - 0.6 * inch
+    if user.organization:
+        size = _fit_font_size(user.organization, 'Helvetica', 10, text_width)
+        c.setFillColor(MUTED_COLOR)
+        c.setFont('Helvetica', size)
+        c.drawCentredString(center, line, user.organization)
+        line -= 0.25 * inch
+
+    roles = membership.role1
+    if membership.role2 != 'N/A':
+        roles += f" | {membership.role2}"
+    c.setFillColor(BRAND_COLOR)
+    c.rect(x + 0.3 * inch, line - 0.06 * inch, badge_width - 0.6 * inch, 0.2 * inch, stroke=0, fill=1)
+    c.setFillColor(WHITE)
+    c.setFont('Helvetica', 9)
+    c.drawCentredString(center, line, roles)
+
+    size, modules = qr
+    image = ImageReader(Image.frombytes('L', (size, size), modules))
+    c.drawImage(image, center - QR_SIZE / 2, y + 0.2 * inch, QR_SIZE, QR_SIZE)
+
+
+@metrics.timed('cmt_pdf_render', document='badge_sheet')
+def write_badge_sheet(memberships, output, paper='letter', crop_marks=True, workers=1):
+    """
+    Draw every membership's badge onto ``output`` (a binary file object),
+    as many per page as fit on the paper. Returns the number of badges.
+    """
+    register_fonts()
+    memberships = list(memberships)
+    qr_codes = build_qr_codes([qr_payload(m) for m in memberships], workers)
+
+    size = PAPER_SIZES[paper]
+    columns, rows, x0, y0, cell, rotated = _grid(size)
+    per_page = columns * rows
+    cell_width, cell_height = cell
+
+    c = canvas.Canvas(output, pagesize=size, pageCompression=1)
+    c.setTitle('Badges')
+    for index, (membership, qr) in enumerate(zip(memberships, qr_codes)):
+        slot = index % per_page
+        if slot == 0:
+            if index:
+                c.showPage()
+            if crop_marks:
+                _draw_crop_marks(c, columns, rows, x0, y0, cell)
+        column, row = slot % columns, slot // columns
+        # Fill rows from the top of the page down
+        x, y = x0 + column * cell_width, y0 + (rows - 1 - row) * cell_height
+        if rotated:
+            c.saveState()
+            c.translate(x + cell_width, y)
+            c.rotate(90)
+            _draw_badge(c, membership, qr, 0, 0)
+            c.restoreState()
+        else:
+            _draw_badge(c, membership, qr, x, y)
+    c.save()
+    return len(memberships)
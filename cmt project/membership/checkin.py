@@ -0,0 +1,124 @@
+"""
+Buffered check-in recording.
+
+Verified scans are appended to an in-process buffer and written with one
+``bulk_create`` once CHECKIN_BUFFER_SIZE scans are waiting or the oldest has
+waited CHECKIN_FLUSH_SECONDS (a background thread covers quiet periods), so
+a busy door costs one INSERT per batch instead of one per scan. The buffer
+is also flushed at exit; scans still buffered when a process is killed are
+lost, and scanners re-sync them from their own log.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import CheckIn, Membership
+from .tickets import make_ticket
+
+logger = logging.getLogger(__name__)
+
+
+class CheckInBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._pending = []
+        self._oldest = None
+        self._flusher = None
+
+    def add(self, membership_id, conference_id, scanned_at, device=''):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()  # forked: the parent's scans are not ours to write
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name='checkin-flush', daemon=True)
+                self._flusher.start()
+                atexit.register(self.flush)
+            self._pending.append(CheckIn(
+                membership_id=membership_id, conference_id=conference_id,
+                scanned_at=scanned_at, device=device[:100],
+            ))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._pending) >= settings.CHECKIN_BUFFER_SIZE
+        if full:
+            self.flush()
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending, self._oldest = self._pending, [], None
+        return pending
+
+    def flush(self):
+        """Write every buffered scan. Returns the number of scans taken from the buffer."""
+        with self._flush_lock:
+            pending = self._take()
+            if pending:
+                _write(pending)
+            return len(pending)
+
+    def _flush_loop(self):
+        interval = settings.CHECKIN_FLUSH_SECONDS
+        while True:
+            time.sleep(interval)
+            oldest = self._oldest
+            if oldest is not None and time.monotonic() - oldest >= interval:
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Check-in flush failed")
+                finally:
+                    connection.close()
+
+
+def _write(check_ins):
+    # A membership already checked in keeps its first scan
+    try:
+        with transaction.atomic():
+            CheckIn.objects.bulk_create(check_ins, ignore_conflicts=True)
+    except IntegrityError:
+        # A signed ticket can outlive its membership; drop scans for deleted ones and retry
+        existing = set(
+            Membership.objects.filter(id__in={c.membership_id for c in check_ins}).values_list('id', flat=True)
+        )
+        dropped = [c.membership_id for c in check_ins if c.membership_id not in existing]
+        if dropped:
+            logger.warning(f"Dropping check-ins for deleted memberships: {dropped}")
+        CheckIn.objects.bulk_create([c for c in check_ins if c.membership_id in existing], ignore_conflicts=True)
+
+
+buffer = CheckInBuffer()
+
+
+def build_manifest(conference):
+    """Every paid ticket for a conference, for scanners to check against while offline."""
+    rows = (
+        Membership.objects.filter(conference=conference, is_paid=True)
+        .order_by('id')
+        .values_list('id', 'user__first_name', 'user__last_name', 'user__organization', 'check_in__scanned_at')
+    )
+    return {
+        'conference': conference.slug,
+        'conference_id': conference.id,
+        'generated_at': timezone.now(),
+        'tickets': [
+            {
+                'ticket': make_ticket(membership_id, conference.id),
+                'membership_id': membership_id,
+                'name': f"{first_name} {last_name}".strip(),
+                'organization': organization,
+                'checked_in_at': checked_in_at,
+            }
+            for membership_id, first_name, last_name, organization, checked_in_at in rows
+        ],
+    }
@@ -0,0 +1,111 @@
+import csv
+import zlib
+from collections import namedtuple
+
+from django.http import StreamingHttpResponse
+
+from accounts.models import Occupation
+from conference.models import Payment
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# key: query-parameter name, lookups: values_list() fields, format: turns those values into a cell
+Column = namedtuple('Column', ['key', 'header', 'lookups', 'format'])
+
+
+def _value(value):
+    return value
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}".strip()
+
+
+def _date(value):
+    return value.strftime('%Y-%m-%d')
+
+
+OCCUPATION_LABELS = dict(Occupation.choices)
+PAYMENT_STATUS_LABELS = dict(Payment.PAYMENT_STATUS_CHOICES)
+
+ATTENDEE_COLUMNS = [
+    Column('email', 'Email', ('user__email',), _value),
+    Column('first_name', 'First Name', ('user__first_name',), _value),
+    Column('last_name', 'Last Name', ('user__last_name',), _value),
+    Column('organization', 'Organization', ('user__organization',), _value),
+    Column('country', 'Country', ('user__country',), _value),
+    Column('phone', 'Phone', ('user__phone',), _value),
+    Column('occupation', 'Occupation', ('user__occupation',), lambda v: OCCUPATION_LABELS.get(v, v)),
+    Column('role1', 'Role 1', ('role1',), _value),
+    Column('role2', 'Role 2', ('role2',), _value),
+    Column('paid', 'Paid', ('is_paid',), lambda v: 'Yes' if v else 'No'),
+    Column('registered', 'Registration Date', ('created_at',), _date),
+]
+
+FINANCIAL_COLUMNS = [
+    Column('invoice', 'Invoice #', ('id',), lambda v: f'INV-{v:06d}'),
+    Column('email', 'Email', ('user__email',), _value),
+    Column('name', 'Name', ('user__first_name', 'user__last_name'), _full_name),
+    Column('tier', 'Tier', ('tier__name',), lambda v: v or 'N/A'),
+    Column('amount', 'Amount', ('amount',), _value),
+    Column('currency', 'Currency', ('currency',), _value),
+    Column('status', 'Status', ('status',), lambda v: PAYMENT_STATUS_LABELS.get(v, v)),
+    Column('paypal_order_id', 'PayPal Order ID', ('paypal_order_id',), lambda v: v or ''),
+    Column('date', 'Date', ('created_at',), _date),
+]
+
+
+def select_columns(columns, requested):
+    """Pick columns from a comma-separated ?columns= value; all columns when empty or unknown."""
+    keys = [key.strip() for key in (requested or '').split(',') if key.strip()]
+    by_key = {column.key: column for column in columns}
+    selected = [by_key[key] for key in keys if key in by_key]
+    return selected or list(columns)
+
+
+class Echo:
+    """File-like object whose write() hands the CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(queryset, columns):
+    lookups = []
+    for column in columns:
+        lookups.extend(lookup for lookup in column.lookups if lookup not in lookups)
+    positions = [[lookups.index(lookup) for lookup in column.lookups] for column in columns]
+
+    writer = csv.writer(Echo())
+    yield writer.writerow([column.header for column in columns])
+    for row in queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow([
+            column.format(*(row[i] for i in indexes)) for column, indexes in zip(columns, positions)
+        ])
+
+
+def _gzip_stream(lines):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for line in lines:
+        data = compressor.compress(line.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_csv(request, queryset, columns, filename):
+    """
+    Stream a CSV export row by row. Supports ?columns=a,b,c to choose columns
+    and ?gzip=1 for a compressed download.
+    """
+    columns = select_columns(columns, request.GET.get('columns'))
+    lines = _csv_lines(queryset, columns)
+
+    if request.GET.get('gzip') in ('1', 'true', 'yes'):
+        response = StreamingHttpResponse(_gzip_stream(lines), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(lines, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
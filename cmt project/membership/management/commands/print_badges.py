@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from conference.models import Conference
+from membership.badge_sheet import PAPER_SIZES, badge_sheet_memberships, write_badge_sheet
+from membership.models import Role
+from membership.tickets import tickets_enabled
+
+
+class Command(BaseCommand):
+    help = 'Write every paid badge for a conference to one N-up PDF for the registration desk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Conference slug')
+        parser.add_argument('--output', help='PDF path (default: badges_<slug>.pdf)')
+        parser.add_argument('--paper', choices=sorted(PAPER_SIZES), default='letter')
+        parser.add_argument('--role', choices=[role for role in Role.values if role != Role.NA], help='Only badges for this role')
+        parser.add_argument('--from', dest='last_name_from', help='First last-name initial to include, e.g. A')
+        parser.add_argument('--to', dest='last_name_to', help='Last last-name initial to include, e.g. F')
+        parser.add_argument('--no-crop-marks', action='store_true')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='QR code processes (default: CPU count)')
+
+    def handle(self, *args, **options):
+        if not tickets_enabled():
+            raise CommandError('TICKET_SIGNING_KEY must be set to print badges')
+        try:
+            conference = Conference.objects.get(slug=options['slug'])
+        except Conference.DoesNotExist:
+            raise CommandError(f"Conference '{options['slug']}' does not exist")
+
+        memberships = badge_sheet_memberships(
+            conference, role=options['role'],
+            last_name_from=options['last_name_from'], last_name_to=options['last_name_to'],
+        )
+        path = options['output'] or f"badges_{conference.slug}.pdf"
+        started = time.perf_counter()
+        with open(path, 'wb') as output:
+            count = write_badge_sheet(
+                memberships, output, paper=options['paper'],
+                crop_marks=not options['no_crop_marks'], workers=options['workers'],
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} badges to {path} in {elapsed:.1f}s"))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_membership_roles(apps, schema_editor):
+    Membership = apps.get_model('membership', 'Membership')
+    MembershipRole = apps.get_model('membership', 'MembershipRole')
+
+    batch = []
+    for membership_id, conference_id, role1, role2 in Membership.objects.values_list(
+        'id', 'conference_id', 'role1', 'role2'
+    ).iterator(chunk_size=2000):
+        for role in {role1, role2} - {'N/A'}:
+            batch.append(MembershipRole(membership_id=membership_id, conference_id=conference_id, role=role))
+        if len(batch) >= 2000:
+            MembershipRole.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        MembershipRole.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0003_conference_blind_review_and_more'),
+        ('membership', '0002_membership_messaging_opt_in_attendeemessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('Author', 'Author'), ('Reviewer', 'Reviewer'), ('Chair', 'Chair'), ('N/A', 'N/A')], max_length=50)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membership_roles', to='conference.conference')),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='roles', to='membership.membership')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['conference', 'role', 'membership'], name='membership_role_conf_idx')],
+                'unique_together': {('membership', 'role')},
+            },
+        ),
+        migrations.RunPython(populate_membership_roles, migrations.RunPython.noop),
+    ]
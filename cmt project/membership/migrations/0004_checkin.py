@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0003_conference_blind_review_and_more'),
+        ('membership', '0003_membershiprole'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scanned_at', models.DateTimeField()),
+                ('device', models.CharField(blank=True, max_length=100)),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_ins', to='conference.conference')),
+                ('membership', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='check_in', to='membership.membership')),
+            ],
+            options={
+                'ordering': ['-scanned_at'],
+            },
+        ),
+    ]
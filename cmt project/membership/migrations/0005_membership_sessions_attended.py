@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:26
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_sessions_attended(apps, schema_editor):
+    Membership = apps.get_model('membership', 'Membership')
+    Attendance = apps.get_model('schedule', 'Attendance')
+    counts = Attendance.objects.filter(
+        user=models.OuterRef('user_id'), session__conference=models.OuterRef('conference_id'),
+    ).values('user').annotate(count=models.Count('id')).values('count')
+    Membership.objects.update(sessions_attended=Coalesce(models.Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('membership', '0004_checkin'),
+        ('schedule', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membership',
+            name='sessions_attended',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_sessions_attended, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.conf import settings
 from accounts.models import CustomUser
 from conference.models import Conference
+from cmt.models_utils import ChangeTrackingMixin
 
 class Role(models.TextChoices):
     AUTHOR = 'Author', 'Author'
@@ -9,7 +12,40 @@ class Role(models.TextChoices):
     CHAIR = 'Chair', 'Chair'
     NA = 'N/A', 'N/A'
 
-class Membership(models.Model):
+def attendance_count_subquery():
+    """Count of the outer membership's user's Attendance rows at its conference, grouped in one subquery."""
+    from schedule.models import Attendance
+    counts = Attendance.objects.filter(
+        user=models.OuterRef('user_id'), session__conference=models.OuterRef('conference_id'),
+    ).values('user').annotate(count=models.Count('id')).values('count')
+    return Coalesce(models.Subquery(counts), 0)
+
+
+class MembershipQuerySet(models.QuerySet):
+    def with_role(self, conference, role):
+        """Memberships holding a role, resolved through the indexed MembershipRole table."""
+        entries = MembershipRole.objects.filter(role=role)
+        if conference is not None:
+            entries = entries.filter(conference=conference)
+        return self.filter(id__in=entries.values('membership_id'))
+
+    def certificate_eligible(self):
+        """Paid memberships of finished conferences with at least one attended session."""
+        return self.filter(is_paid=True, sessions_attended__gt=0, conference__end_date__lt=timezone.now().date())
+
+    def refresh_attendance_counts(self):
+        """Recompute the denormalized sessions_attended counters from Attendance in one UPDATE."""
+        return self.update(sessions_attended=attendance_count_subquery())
+
+    def role_counts(self, conference):
+        """Return {role: membership count} for a conference in a single grouped query."""
+        rows = MembershipRole.objects.filter(conference=conference).values('role').annotate(
+            count=models.Count('id')
+        ).order_by()
+        return {row['role']: row['count'] for row in rows}
+
+
+class Membership(ChangeTrackingMixin, models.Model):
     # Represents a user's membership in a conference (Foreign Keys)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='memberships')
     conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='memberships')
@@ -19,15 +55,62 @@ class Membership(models.Model):
 
     is_paid = models.BooleanField(default=False)
     messaging_opt_in = models.BooleanField(default=True, help_text="Allow other attendees to send you messages")
+    # Sessions joined at this conference, kept in sync with Attendance by schedule.signals
+    sessions_attended = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = MembershipQuerySet.as_manager()
+
+    tracked_fields = ('role1', 'role2', 'conference')
+
     class Meta:
         unique_together = ('user', 'conference')
 
     def __str__(self):
         return f"{self.user.email} - {self.conference.conference_name} ({self.role1}, {self.role2})"
 
+    @property
+    def is_certificate_eligible(self):
+        return self.is_paid and self.sessions_attended > 0 and self.conference.end_date < timezone.now().date()
+
+    @property
+    def role_set(self):
+        return {self.role1, self.role2} - {Role.NA}
+
+    def save(self, *args, **kwargs):
+        roles_changed = self.has_changed('role1', 'role2', 'conference')
+        super().save(*args, **kwargs)
+        if roles_changed:
+            self.sync_roles()
+
+    def sync_roles(self):
+        """Mirror role1/role2 and the conference into MembershipRole rows used for indexed role lookups."""
+        wanted = self.role_set
+        existing = MembershipRole.objects.filter(membership=self)
+        existing.exclude(role__in=wanted).delete()
+        existing.exclude(conference_id=self.conference_id).update(conference_id=self.conference_id)
+        MembershipRole.objects.bulk_create(
+            [MembershipRole(membership=self, conference_id=self.conference_id, role=role) for role in wanted],
+            ignore_conflicts=True,
+        )
+
+
+class MembershipRole(models.Model):
+    """One row per role a membership holds, indexed by (conference, role)."""
+    membership = models.ForeignKey(Membership, on_delete=models.CASCADE, related_name='roles')
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='membership_roles')
+    role = models.CharField(max_length=50, choices=Role.choices)
+
+    class Meta:
+        unique_together = ('membership', 'role')
+        indexes = [
+            models.Index(fields=['conference', 'role', 'membership'], name='membership_role_conf_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.membership_id} - {self.role}"
+
 
 class AttendeeMessage(models.Model):
     """Internal messaging between conference attendees (opt-in only)."""
@@ -44,3 +127,18 @@ class AttendeeMessage(models.Model):
 
     def __str__(self):
         return f"{self.sender.email} -> {self.recipient.email}: {self.subject}"
+
+
+class CheckIn(models.Model):
+    """On-site check-in of a ticket holder; the first scan of a membership wins."""
+    membership = models.OneToOneField(Membership, on_delete=models.CASCADE, related_name='check_in')
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='check_ins')
+    scanned_at = models.DateTimeField()
+    device = models.CharField(max_length=100, blank=True)
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-scanned_at']
+
+    def __str__(self):
+        return f"{self.membership_id} @ {self.scanned_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Membership, Role
+
+
+MembershipRoles = namedtuple('MembershipRoles', ['id', 'conference_id', 'conference_slug', 'roles', 'is_paid'])
+
+
+def _cache_key(user_id):
+    return f"membership:roles:{user_id}"
+
+
+def _cache_timeout():
+    return getattr(settings, 'MEMBERSHIP_ROLE_CACHE_TIMEOUT', 0)
+
+
+def invalidate_cached_roles(*user_ids):
+    """Drop the cached role data for the given users (no-op when caching is off)."""
+    if _cache_timeout():
+        cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+class RoleResolver:
+    """
+    Lazily resolves all of a user's conference memberships and roles with a
+    single query, memoized for the lifetime of the resolver (one request).
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._memberships = None
+
+    def _load(self):
+        if not self.user.is_authenticated:
+            return []
+
+        timeout = _cache_timeout()
+        if timeout:
+            rows = cache.get(_cache_key(self.user.pk))
+            if rows is not None:
+                return [MembershipRoles(*row) for row in rows]
+
+        rows = [
+            (membership_id, conference_id, slug, frozenset({role1, role2}) - {Role.NA}, is_paid)
+            for membership_id, conference_id, slug, role1, role2, is_paid in Membership.objects.filter(
+                user=self.user
+            ).values_list('id', 'conference_id', 'conference__slug', 'role1', 'role2', 'is_paid')
+        ]
+        if timeout:
+            cache.set(_cache_key(self.user.pk), rows, timeout)
+        return [MembershipRoles(*row) for row in rows]
+
+    @property
+    def memberships(self):
+        if self._memberships is None:
+            self._memberships = self._load()
+        return self._memberships
+
+    def membership(self, conference):
+        """Return the membership for a conference (instance, id or slug), or None."""
+        if isinstance(conference, str):
+            return next((m for m in self.memberships if m.conference_slug == conference), None)
+        conference_id = getattr(conference, 'pk', conference)
+        return next((m for m in self.memberships if m.conference_id == conference_id), None)
+
+    def has_role(self, role, conference=None):
+        """Check a role globally or for a single conference. Staff hold every role."""
+        if self.user.is_staff:
+            return True
+        if conference is not None:
+            membership = self.membership(conference)
+            return membership is not None and role in membership.roles
+        return any(role in m.roles for m in self.memberships)
+
+    def is_reviewer(self, conference=None):
+        return self.has_role(Role.REVIEWER, conference)
+
+    def is_chair(self, conference=None):
+        return self.has_role(Role.CHAIR, conference)
+
+    def conference_ids_with_role(self, role):
+        return [m.conference_id for m in self.memberships if role in m.roles]
+
+
+def roles_for_user(user):
+    """
+    Return the RoleResolver memoized on a user instance. The auth middleware
+    loads a fresh user per request, so this is shared by views, context
+    processors and template filters without outliving the request.
+    """
+    resolver = getattr(user, '_role_resolver', None)
+    if resolver is None:
+        resolver = RoleResolver(user)
+        user._role_resolver = resolver
+    return resolver
+
+
+def get_roles(request):
+    """Return the request's RoleResolver, creating it on first use."""
+    return roles_for_user(request.user)
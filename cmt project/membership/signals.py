@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Membership
+from .roles import invalidate_cached_roles
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_membership_roles(sender, instance, **kwargs):
+    invalidate_cached_roles(instance.user_id)
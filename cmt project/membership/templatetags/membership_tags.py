@@ -1,16 +1,14 @@
 from django import template
 from membership.models import Membership
+from membership.roles import roles_for_user
 
 register = template.Library()
 
 @register.filter
 def has_conference_access(user, conference):
     """Check if user has paid access to a specific conference"""
-    try:
-        membership = Membership.objects.get(user=user, conference=conference)
-        return membership.is_paid
-    except Membership.DoesNotExist:
-        return False
+    membership = roles_for_user(user).membership(conference)
+    return membership is not None and membership.is_paid
 
 @register.filter
 def get_conference_membership(user, conference):
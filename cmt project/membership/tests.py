@@ -1,3 +1,147 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timezone as dt_timezone
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+
+from accounts.models import CustomUser
+from conference.models import Conference
+from .checkin import buffer as checkin_buffer
+from .models import CheckIn, Membership, MembershipRole, Role
+from .tickets import InvalidTicket, make_ticket, sign_manifest, verify_ticket
+
+
+class MembershipRoleSyncTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first, cls.second = (
+            Conference.objects.create(
+                conference_name=name, conference_description='A test conference',
+                start_date='2026-06-01', end_date='2026-06-03', location='Test Location',
+            )
+            for name in ('First Conference', 'Second Conference')
+        )
+        cls.user = CustomUser.objects.create_user(
+            email='reviewer@example.com', password='password', first_name='Test', last_name='User',
+            country='US', organization='Org', phone='555-0100', occupation='faculty',
+        )
+
+    def test_roles_follow_role_changes(self):
+        membership = Membership.objects.create(user=self.user, conference=self.first, role1=Role.AUTHOR, role2=Role.REVIEWER)
+        self.assertEqual(Membership.objects.role_counts(self.first), {Role.AUTHOR: 1, Role.REVIEWER: 1})
+
+        membership.role2 = Role.NA
+        membership.save()
+        self.assertEqual(Membership.objects.role_counts(self.first), {Role.AUTHOR: 1})
+
+    def test_roles_follow_a_conference_change(self):
+        membership = Membership.objects.create(user=self.user, conference=self.first, role1=Role.REVIEWER)
+
+        membership = Membership.objects.get(pk=membership.pk)
+        membership.conference = self.second
+        membership.save()
+
+        self.assertEqual(list(MembershipRole.objects.values_list('conference', flat=True)), [self.second.pk])
+        self.assertEqual(Membership.objects.role_counts(self.first), {})
+        self.assertEqual(list(Membership.objects.with_role(self.second, Role.REVIEWER)), [membership])
+        self.assertFalse(Membership.objects.with_role(self.first, Role.REVIEWER).exists())
+
+
+@override_settings(TICKET_SIGNING_KEY='ticket-key', CHECKIN_API_TOKEN='scanner-token',
+                   CHECKIN_BUFFER_SIZE=1000, CHECKIN_FLUSH_SECONDS=3600, CHECKIN_MAX_TICKETS=5)
+class CheckInTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.conference = Conference.objects.create(
+            conference_name='Test Conference', conference_description='A test conference',
+            start_date='2026-06-01', end_date='2026-06-03', location='Test Location',
+        )
+        cls.user = CustomUser.objects.create_user(
+            email='attendee@example.com', password='password', first_name='Ada', last_name='Lovelace',
+            country='US', organization='Org', phone='555-0100', occupation='faculty',
+        )
+        cls.membership = Membership.objects.create(user=cls.user, conference=cls.conference, is_paid=True)
+
+    def setUp(self):
+        self.ticket = make_ticket(self.membership.pk, self.conference.pk)
+        self.addCleanup(checkin_buffer._take)
+
+    def scan(self, body, token='scanner-token'):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        return self.client.post(
+            reverse('check_in_api'), body if isinstance(body, str) else json.dumps(body),
+            content_type='application/json', **headers,
+        )
+
+    def test_verify_ticket_rejects_forged_and_tampered_tickets(self):
+        self.assertEqual(verify_ticket(self.ticket), (self.membership.pk, self.conference.pk))
+
+        prefix, membership_id, conference_id, signature = self.ticket.split(':')
+        tampered = f'{prefix}:{int(membership_id) + 1}:{conference_id}:{signature}'
+        forged = f'{prefix}:{membership_id}:{conference_id}:{"A" * len(signature)}'
+        with self.settings(TICKET_SIGNING_KEY='another-key'):
+            foreign = make_ticket(self.membership.pk, self.conference.pk)
+        for ticket in (tampered, forged, foreign, 'IATM1:1:2', 'not a ticket', None):
+            with self.subTest(ticket=ticket), self.assertRaises(InvalidTicket):
+                verify_ticket(ticket)
+
+    def test_requires_the_token(self):
+        self.assertEqual(self.scan({'ticket': self.ticket}, token=None).status_code, 401)
+        self.assertEqual(self.scan({'ticket': self.ticket}, token='wrong').status_code, 401)
+
+    def test_malformed_bodies_are_rejected(self):
+        for body in ('not json', '{"tickets": 5}', json.dumps({'tickets': [{'ticket': self.ticket}] * 6})):
+            with self.subTest(body=body[:20]):
+                self.assertEqual(self.scan(body).status_code, 400)
+
+    def test_invalid_scans_are_reported(self):
+        forged = self.ticket[:-2] + 'xx'
+        response = self.scan({'tickets': [
+            {'ticket': forged}, {'ticket': self.ticket, 'scanned_at': '2026-13-01T09:00:00Z'}, 'junk',
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['valid'] for r in response.json()['results']], [False, False, False])
+        self.assertEqual(checkin_buffer.flush(), 0)
+
+    def test_duplicate_scans_keep_the_first_check_in(self):
+        with self.assertNumQueries(0):
+            response = self.scan({'tickets': [
+                {'ticket': self.ticket, 'scanned_at': '2026-06-01T09:00:00Z', 'device': 'door-1'},
+                {'ticket': self.ticket, 'scanned_at': '2026-06-01T09:05:00Z', 'device': 'door-2'},
+            ]})
+        self.assertTrue(all(r['valid'] for r in response.json()['results']))
+        self.assertEqual(checkin_buffer.flush(), 2)
+
+        self.scan({'ticket': self.ticket, 'scanned_at': '2026-06-01T10:00:00Z', 'device': 'door-3'})
+        checkin_buffer.flush()
+
+        check_in = CheckIn.objects.get()
+        self.assertEqual(check_in.membership, self.membership)
+        self.assertEqual((check_in.scanned_at, check_in.device), (datetime(2026, 6, 1, 9, tzinfo=dt_timezone.utc), 'door-1'))
+
+    def test_manifest_signature_verifies(self):
+        response = self.client.get(
+            reverse('check_in_manifest', args=[self.conference.slug]), HTTP_AUTHORIZATION='Bearer scanner-token',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        manifest, signature = data['manifest'], data['signature']
+        self.assertEqual([t['ticket'] for t in manifest['tickets']], [self.ticket])
+
+        # What a scanner does with the raw JSON: recompute the HMAC with its token
+        canonical = json.dumps(manifest, sort_keys=True, separators=(',', ':'))
+        self.assertEqual(signature, salted_hmac(
+            'cmt.tickets.manifest', canonical, secret='scanner-token', algorithm='sha256',
+        ).hexdigest())
+        self.assertEqual(signature, sign_manifest(manifest))
+
+        manifest['tickets'][0]['name'] = 'Someone Else'
+        self.assertNotEqual(sign_manifest(manifest), signature)
+
+    def test_manifest_requires_the_token_or_staff(self):
+        url = reverse('check_in_manifest', args=[self.conference.slug])
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
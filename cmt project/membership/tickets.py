@@ -0,0 +1,70 @@
+"""
+Signed QR tickets.
+
+A ticket is ``IATM1:<membership id>:<conference id>:<signature>``, where the
+signature is a truncated HMAC-SHA256 of the ids keyed by TICKET_SIGNING_KEY.
+Verifying it needs no database, so the check-in API can accept tickets as
+fast as they are scanned. The key can mint tickets, so it stays on the
+server: tickets are neither issued nor accepted while it is unset. Door
+scanners working offline check tickets against the manifest instead, whose
+signature is keyed by the CHECKIN_API_TOKEN they already hold.
+"""
+import base64
+import hmac
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.crypto import salted_hmac
+
+TICKET_PREFIX = 'IATM1'
+SIGNATURE_BYTES = 16
+
+
+class InvalidTicket(Exception):
+    pass
+
+
+def tickets_enabled():
+    return bool(settings.TICKET_SIGNING_KEY)
+
+
+def _sign(message, salt):
+    if not tickets_enabled():
+        raise ImproperlyConfigured('TICKET_SIGNING_KEY must be set to issue or verify tickets')
+    digest = salted_hmac(salt, message, secret=settings.TICKET_SIGNING_KEY, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest[:SIGNATURE_BYTES]).rstrip(b'=').decode('ascii')
+
+
+def make_ticket(membership_id, conference_id):
+    body = f'{TICKET_PREFIX}:{membership_id}:{conference_id}'
+    return f'{body}:{_sign(body, "cmt.tickets")}'
+
+
+def verify_ticket(ticket):
+    """Return ``(membership_id, conference_id)`` for a genuine ticket, else raise InvalidTicket."""
+    try:
+        prefix, membership_id, conference_id, signature = ticket.strip().split(':')
+    except (AttributeError, ValueError):
+        raise InvalidTicket('malformed')
+    if prefix != TICKET_PREFIX or not membership_id.isdigit() or not conference_id.isdigit():
+        raise InvalidTicket('malformed')
+    expected = _sign(f'{prefix}:{membership_id}:{conference_id}', 'cmt.tickets')
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidTicket('bad signature')
+    return int(membership_id), int(conference_id)
+
+
+def sign_manifest(manifest):
+    """
+    HMAC over a manifest's canonical JSON, keyed by CHECKIN_API_TOKEN, so
+    scanners can trust a copy loaded while offline without holding the key
+    that mints tickets.
+    """
+    if not settings.CHECKIN_API_TOKEN:
+        raise ImproperlyConfigured('CHECKIN_API_TOKEN must be set to sign check-in manifests')
+    canonical = json.dumps(manifest, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+    return salted_hmac(
+        'cmt.tickets.manifest', canonical, secret=settings.CHECKIN_API_TOKEN, algorithm='sha256'
+    ).hexdigest()
@@ -8,8 +8,11 @@ urlpatterns = [
     path('<slug:slug>/analytics/', views.admin_analytics_view, name='admin_analytics'),
     path('<slug:slug>/export/attendees/', views.export_attendees_csv, name='export_attendees'),
     path('<slug:slug>/export/financials/', views.export_financials_csv, name='export_financials'),
+    path('<slug:slug>/badges/', views.badge_sheet_view, name='badge_sheet'),
     path('badge/<int:membership_id>/', views.download_badge, name='download_badge'),
     path('qr-ticket/<int:membership_id>/', views.download_qr_ticket, name='download_qr_ticket'),
+    path('check-in/', views.check_in_api, name='check_in_api'),
+    path('<slug:slug>/check-in/manifest/', views.check_in_manifest, name='check_in_manifest'),
     path('<slug:slug>/bulk-email/', views.bulk_email_view, name='bulk_email'),
     path('messages/', views.message_inbox, name='message_inbox'),
     path('messages/<int:message_id>/', views.message_detail, name='message_detail'),
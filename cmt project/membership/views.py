@@ -1,16 +1,31 @@
-import csv
+import json
+import tempfile
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.db.models import Sum, Count, Q
 from django.core.mail import send_mail
 from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from conference.models import Conference, Payment
 from .models import Membership, Role
 from .forms import MembershipForm
+from .roles import invalidate_cached_roles
+from .exports import stream_csv, ATTENDEE_COLUMNS, FINANCIAL_COLUMNS
+from .badge_sheet import PAPER_SIZES, badge_sheet_memberships, write_badge_sheet
+from .checkin import buffer as checkin_buffer, build_manifest
+from .tickets import InvalidTicket, sign_manifest, tickets_enabled, verify_ticket
+from mailqueue.queue import enqueue_many, send_batched
+from cmt import metrics
 from django.contrib.admin.views.decorators import staff_member_required
 
+BULK_EMAIL_CHUNK_SIZE = 100
+
 
 @login_required
 def networking_hub(request, slug):
@@ -152,7 +167,8 @@ def group_registration(request, slug):
                 request_paypal = CreateOrderRequest(**order_data)
                 client = get_paypal_client()
                 orders_service = OrdersService(client)
-                response = orders_service.create_order(request_paypal)
+                with metrics.timed('cmt_external_api', service='paypal', operation='create_order'):
+                    response = orders_service.create_order(request_paypal)
 
                 # Create Payment record for the paying user
                 Payment.objects.create(
@@ -225,11 +241,16 @@ def group_payment_success(request, slug):
 
         client = get_paypal_client()
         orders_service = OrdersService(client)
-        response = orders_service.capture_order(paypal_order_id)
+        with metrics.timed('cmt_external_api', service='paypal', operation='capture_order'):
+            response = orders_service.capture_order(paypal_order_id)
 
         if response.status == "COMPLETED":
             # Mark all group members as paid
-            paid_count = Membership.objects.filter(id__in=member_ids, conference=conference).update(is_paid=True)
+            group_members = Membership.objects.filter(id__in=member_ids, conference=conference)
+            paid_user_ids = list(group_members.values_list('user_id', flat=True))
+            paid_count = group_members.update(is_paid=True)
+            # Queryset updates bypass the post_save signal
+            invalidate_cached_roles(*paid_user_ids)
 
             # Update Payment record
             try:
@@ -335,9 +356,10 @@ def admin_analytics_view(request, slug):
     total_revenue = payments.aggregate(total=Sum('amount'))['total'] or 0
 
     # Role breakdown
-    authors = memberships.filter(Q(role1='Author') | Q(role2='Author')).count()
-    reviewers = memberships.filter(Q(role1='Reviewer') | Q(role2='Reviewer')).count()
-    chairs = memberships.filter(Q(role1='Chair') | Q(role2='Chair')).count()
+    role_counts = Membership.objects.role_counts(conference)
+    authors = role_counts.get(Role.AUTHOR, 0)
+    reviewers = role_counts.get(Role.REVIEWER, 0)
+    chairs = role_counts.get(Role.CHAIR, 0)
 
     # Geography (country breakdown)
     country_stats = memberships.values('user__country').annotate(
@@ -366,60 +388,18 @@ def admin_analytics_view(request, slug):
 
 @staff_member_required
 def export_attendees_csv(request, slug):
-    """Export attendee list as CSV."""
+    """Export attendee list as a streamed CSV (?columns=..., ?gzip=1)."""
     conference = get_object_or_404(Conference, slug=slug)
-    memberships = Membership.objects.filter(conference=conference).select_related('user')
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{conference.slug}_attendees.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['Email', 'First Name', 'Last Name', 'Organization', 'Country', 'Phone', 'Occupation', 'Role 1', 'Role 2', 'Paid', 'Registration Date'])
-
-    for m in memberships:
-        writer.writerow([
-            m.user.email,
-            m.user.first_name,
-            m.user.last_name,
-            m.user.organization,
-            m.user.country,
-            m.user.phone,
-            m.user.get_occupation_display(),
-            m.role1,
-            m.role2,
-            'Yes' if m.is_paid else 'No',
-            m.created_at.strftime('%Y-%m-%d'),
-        ])
-
-    return response
+    memberships = Membership.objects.filter(conference=conference)
+    return stream_csv(request, memberships, ATTENDEE_COLUMNS, f"{conference.slug}_attendees.csv")
 
 
 @staff_member_required
 def export_financials_csv(request, slug):
-    """Export financial report as CSV."""
+    """Export financial report as a streamed CSV (?columns=..., ?gzip=1)."""
     conference = get_object_or_404(Conference, slug=slug)
-    payments = Payment.objects.filter(conference=conference).select_related('user', 'tier')
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{conference.slug}_financials.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['Invoice #', 'Email', 'Name', 'Tier', 'Amount', 'Currency', 'Status', 'PayPal Order ID', 'Date'])
-
-    for p in payments:
-        writer.writerow([
-            f'INV-{p.id:06d}',
-            p.user.email,
-            p.user.get_full_name(),
-            p.tier.name if p.tier else 'N/A',
-            p.amount,
-            p.currency,
-            p.get_status_display(),
-            p.paypal_order_id or '',
-            p.created_at.strftime('%Y-%m-%d'),
-        ])
-
-    return response
+    payments = Payment.objects.filter(conference=conference)
+    return stream_csv(request, payments, FINANCIAL_COLUMNS, f"{conference.slug}_financials.csv")
 
 
 @login_required
@@ -435,6 +415,10 @@ def download_badge(request, membership_id):
         messages.error(request, "Badge is only available for paid registrations.")
         return redirect('user_dashboard')
 
+    if not tickets_enabled():
+        messages.error(request, "Badges are not available yet. Please try again later.")
+        return redirect('user_dashboard')
+
     from .badge import generate_badge_pdf
     buffer = generate_badge_pdf(membership)
 
@@ -443,6 +427,106 @@ def download_badge(request, membership_id):
     return response
 
 
+@staff_member_required
+def badge_sheet_view(request, slug):
+    """
+    Download every paid badge for a conference as one N-up PDF, ordered by last name.
+    Filters: ?role=, ?from=/?to= (last-name initials), ?paper=letter|a4, ?crop_marks=0.
+    """
+    conference = get_object_or_404(Conference, slug=slug)
+    paper = request.GET.get('paper', 'letter')
+    role = request.GET.get('role')
+    if paper not in PAPER_SIZES or (role and role not in Role.values):
+        return HttpResponseBadRequest("Unknown paper size or role.")
+    if not tickets_enabled():
+        return HttpResponse("Badges need TICKET_SIGNING_KEY to be set.", status=503, content_type='text/plain')
+
+    memberships = list(badge_sheet_memberships(
+        conference, role=role, last_name_from=request.GET.get('from'), last_name_to=request.GET.get('to'),
+    ))
+    # Rendered in this worker, so keep the sheet within what fits the request timeout
+    if len(memberships) > settings.BADGE_SHEET_MAX_BADGES:
+        return HttpResponseBadRequest(
+            f"{len(memberships)} badges is more than {settings.BADGE_SHEET_MAX_BADGES} per download. "
+            f"Split the sheet with ?from=/?to= last-name initials, or run: python manage.py print_badges {conference.slug}"
+        )
+    # Rendered to a temporary file (spilling to disk past 16 MB) and streamed from there
+    output = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    write_badge_sheet(memberships, output, paper=paper, crop_marks=request.GET.get('crop_marks') != '0')
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=f"badges_{conference.slug}.pdf", content_type='application/pdf')
+
+
+def _has_checkin_token(request):
+    token = settings.CHECKIN_API_TOKEN
+    header = request.headers.get('Authorization', '')
+    return bool(token) and header.startswith('Bearer ') and constant_time_compare(header[7:], token)
+
+
+@csrf_exempt
+@require_POST
+def check_in_api(request):
+    """
+    Verify scanned tickets by their signature alone (no database read) and
+    queue the check-ins for a buffered bulk insert. Scanners authenticate
+    with ``Authorization: Bearer <CHECKIN_API_TOKEN>``.
+
+    Body: {"tickets": [{"ticket": ..., "scanned_at": ISO 8601 (optional), "device": ...}]}
+    or a single ticket object; scanners sync scans made offline the same way,
+    at most CHECKIN_MAX_TICKETS per request.
+    """
+    if not _has_checkin_token(request):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    if not tickets_enabled():
+        return JsonResponse({'error': 'Tickets are not configured'}, status=503)
+    try:
+        data = json.loads(request.body)
+        scans = data['tickets'] if 'tickets' in data else [data]
+    except (ValueError, TypeError, KeyError):
+        scans = None
+    if not isinstance(scans, list):
+        return JsonResponse({'error': 'Expected a JSON ticket or {"tickets": [...]}'}, status=400)
+    if len(scans) > settings.CHECKIN_MAX_TICKETS:
+        return JsonResponse({'error': f'At most {settings.CHECKIN_MAX_TICKETS} tickets per request'}, status=400)
+
+    results = []
+    for scan in scans:
+        ticket = scan.get('ticket') if isinstance(scan, dict) else None
+        try:
+            membership_id, conference_id = verify_ticket(ticket)
+        except InvalidTicket as exc:
+            results.append({'ticket': ticket, 'valid': False, 'error': str(exc)})
+            continue
+        try:
+            scanned_at = parse_datetime(str(scan.get('scanned_at') or '')) or timezone.now()
+        except ValueError:
+            # Well formatted but impossible, e.g. month 13
+            results.append({'ticket': ticket, 'valid': False, 'error': 'invalid scanned_at'})
+            continue
+        if timezone.is_naive(scanned_at):
+            scanned_at = timezone.make_aware(scanned_at)
+        checkin_buffer.add(membership_id, conference_id, scanned_at, str(scan.get('device') or ''))
+        results.append({'ticket': ticket, 'valid': True, 'membership_id': membership_id, 'conference_id': conference_id})
+    return JsonResponse({'results': results})
+
+
+def check_in_manifest(request, slug):
+    """
+    Download the signed list of paid tickets for a conference, so door
+    scanners can keep checking people in while the network is down.
+    Staff or the check-in API token only.
+    """
+    if not (request.user.is_staff or _has_checkin_token(request)):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    if not (tickets_enabled() and settings.CHECKIN_API_TOKEN):
+        return JsonResponse({'error': 'Tickets are not configured'}, status=503)
+    conference = get_object_or_404(Conference, slug=slug)
+    manifest = build_manifest(conference)
+    response = JsonResponse({'manifest': manifest, 'signature': sign_manifest(manifest)})
+    response['Content-Disposition'] = f'attachment; filename="checkin_manifest_{conference.slug}.json"'
+    return response
+
+
 @login_required
 def download_qr_ticket(request, membership_id):
     """Download QR code ticket as PNG image."""
@@ -456,9 +540,12 @@ def download_qr_ticket(request, membership_id):
         messages.error(request, "QR ticket is only available for paid registrations.")
         return redirect('user_dashboard')
 
-    from .badge import generate_qr_code
-    qr_data = f"IATM|{membership.user.email}|{membership.conference.slug}|{membership.id}"
-    qr_buf = generate_qr_code(qr_data)
+    if not tickets_enabled():
+        messages.error(request, "QR tickets are not available yet. Please try again later.")
+        return redirect('user_dashboard')
+
+    from .badge import generate_qr_code, qr_payload
+    qr_buf = generate_qr_code(qr_payload(membership))
 
     response = HttpResponse(qr_buf.getvalue(), content_type='image/png')
     response['Content-Disposition'] = f'attachment; filename="ticket_{membership.conference.slug}.png"'
@@ -472,7 +559,7 @@ def bulk_email_view(request, slug):
     from django.template.loader import render_to_string
 
     conference = get_object_or_404(Conference, slug=slug)
-    memberships = Membership.objects.filter(conference=conference).select_related('user')
+    memberships = Membership.objects.filter(conference=conference)
 
     if request.method == 'POST':
         subject = request.POST.get('subject', '')
@@ -490,9 +577,9 @@ def bulk_email_view(request, slug):
         elif segment == 'unpaid':
             recipients = recipients.filter(is_paid=False)
         elif segment == 'authors':
-            recipients = recipients.filter(Q(role1='Author') | Q(role2='Author'))
+            recipients = recipients.with_role(conference, Role.AUTHOR)
         elif segment == 'reviewers':
-            recipients = recipients.filter(Q(role1='Reviewer') | Q(role2='Reviewer'))
+            recipients = recipients.with_role(conference, Role.REVIEWER)
 
         # Render HTML email using branded template
         html_message = render_to_string('submissions/emails/bulk_email.html', {
@@ -501,37 +588,50 @@ def bulk_email_view(request, slug):
             'conference': conference,
         })
 
-        sent_count = 0
-        fail_count = 0
-        for m in recipients:
-            try:
+        # Stream addresses only; one email per recipient keeps the list private
+        def build_messages():
+            for email_address in recipients.values_list('user__email', flat=True).iterator(chunk_size=BULK_EMAIL_CHUNK_SIZE):
                 email = EmailMultiAlternatives(
                     subject=subject,
                     body=body,
                     from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[m.user.email],
+                    to=[email_address],
                 )
                 email.attach_alternative(html_message, "text/html")
-                email.send()
-                sent_count += 1
-            except Exception:
-                fail_count += 1
+                yield email
+
+        if settings.EMAIL_QUEUE_ENABLED:
+            # Hand the segment to the mail worker and return immediately
+            queued_count = enqueue_many(build_messages(), conference=conference)
+            if queued_count:
+                messages.success(request, f"HTML email queued for {queued_count} recipient(s).")
+            else:
+                messages.warning(request, "No recipients matched the selected segment.")
+            return redirect('bulk_email', slug=slug)
+
+        # One connection for the whole segment; a refused address fails only its own message
+        chunks = send_batched(build_messages(), chunk_size=BULK_EMAIL_CHUNK_SIZE)
+        sent_count = sum(chunk.sent for chunk in chunks)
+        fail_count = sum(chunk.failed for chunk in chunks)
+        failed_chunks = [chunk for chunk in chunks if chunk.failed]
 
         if sent_count:
-            messages.success(request, f"HTML email sent to {sent_count} recipient(s).")
+            messages.success(request, f"HTML email sent to {sent_count} recipient(s) in {len(chunks)} batch(es).")
         if fail_count:
-            messages.warning(request, f"Failed to send to {fail_count} recipient(s).")
+            details = ", ".join(f"batch {c.index}: {c.failed} of {c.sent + c.failed}" for c in failed_chunks)
+            messages.warning(request, f"Failed to send to {fail_count} recipient(s) ({details}).")
         if not sent_count and not fail_count:
             messages.warning(request, "No recipients matched the selected segment.")
 
         return redirect('bulk_email', slug=slug)
 
+    role_counts = Membership.objects.role_counts(conference)
     segment_counts = {
         'all': memberships.count(),
         'paid': memberships.filter(is_paid=True).count(),
         'unpaid': memberships.filter(is_paid=False).count(),
-        'authors': memberships.filter(Q(role1='Author') | Q(role2='Author')).count(),
-        'reviewers': memberships.filter(Q(role1='Reviewer') | Q(role2='Reviewer')).count(),
+        'authors': role_counts.get(Role.AUTHOR, 0),
+        'reviewers': role_counts.get(Role.REVIEWER, 0),
     }
 
     context = {
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Review
+from .models import Review, ReviewReminder
 from submissions.models import Submissions
 from membership.models import Membership
 
@@ -63,4 +63,11 @@ class ReviewAdmin(admin.ModelAdmin):
     def mark_as_revision_needed(self, request, queryset):
         queryset.update(recommendation='REVISE')
     mark_as_revision_needed.short_description = "Mark selected reviews as Needs Revision"
-    
\ No newline at end of file
+    
+
+
+@admin.register(ReviewReminder)
+class ReviewReminderAdmin(admin.ModelAdmin):
+    list_display = ('review', 'kind', 'deadline', 'sent_at')
+    list_filter = ('kind', 'review__submission__membership__conference')
+    raw_id_fields = ('review',)
@@ -28,12 +28,7 @@ class AssignReviewersForm(forms.Form):
         
         if conference:
             # Get all reviewers for this conference - check both role1 and role2
-            from django.db.models import Q
-            reviewer_memberships = Membership.objects.filter(
-                conference=conference
-            ).filter(
-                Q(role1='Reviewer') | Q(role2='Reviewer')
-            ).select_related('user')
+            reviewer_memberships = Membership.objects.with_role(conference, Role.REVIEWER).select_related('user')
             
             # Exclude the submission author and current user (chair) from reviewer options
             excluded_users = set()
@@ -58,3 +53,34 @@ class AssignReviewersForm(forms.Form):
             # Set the queryset and ensure it's properly configured
             self.fields['reviewers'].queryset = reviewer_memberships
             self.fields['reviewers'].label_from_instance = lambda obj: f"{obj.user.get_full_name()} ({obj.user.email})"
+
+
+class AutoAssignReviewersForm(forms.Form):
+    track = forms.ModelChoiceField(
+        queryset=None,
+        required=False,
+        empty_label="All tracks",
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    reviewers_per_paper = forms.IntegerField(
+        min_value=1, max_value=10, initial=3,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+        help_text="Existing assignments count towards this"
+    )
+    max_load = forms.IntegerField(
+        min_value=1, required=False,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+        help_text="Most reviews any reviewer may hold in the conference (blank for no limit)"
+    )
+    notify = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        label="Email reviewers about their new assignments",
+    )
+    # Signed fingerprint of the previewed plan; applying is refused if the plan has changed since
+    plan_token = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def __init__(self, *args, **kwargs):
+        conference = kwargs.pop('conference')
+        super().__init__(*args, **kwargs)
+        self.fields['track'].queryset = conference.tracks.all()
@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from conference.models import Conference, Track
+from review.assignment import apply_plan, plan_assignments
+
+
+class Command(BaseCommand):
+    help = (
+        'Assign reviewers to every pending submission of a conference in one batch, '
+        'balancing reviewer load and skipping author and same-organization conflicts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Conference slug')
+        parser.add_argument('--track', help='Only submissions in the track with this name')
+        parser.add_argument('--per-paper', type=int, default=3, help='Reviewers each submission should end up with')
+        parser.add_argument('--max-load', type=int, help='Most reviews any reviewer may hold in the conference')
+        parser.add_argument('--dry-run', action='store_true', help='Print the proposed assignments without writing them')
+        parser.add_argument('--notify', action='store_true', help='Email each reviewer one digest of their new assignments')
+        parser.add_argument('--base-url', default=settings.SITE_URL, help='Site URL for links in the emails (default: SITE_URL)')
+
+    def handle(self, *args, **options):
+        try:
+            conference = Conference.objects.get(slug=options['slug'])
+        except Conference.DoesNotExist:
+            raise CommandError(f"Conference '{options['slug']}' does not exist")
+
+        track = None
+        if options['track']:
+            try:
+                track = conference.tracks.get(name=options['track'])
+            except Track.DoesNotExist:
+                raise CommandError(f"Track '{options['track']}' does not exist in {conference.slug}")
+
+        if options['per_paper'] < 1:
+            raise CommandError('--per-paper must be at least 1')
+        if options['max_load'] is not None and options['max_load'] < 1:
+            raise CommandError('--max-load must be at least 1')
+        if options['notify'] and not options['base_url']:
+            raise CommandError('--notify needs --base-url or the SITE_URL setting for the links in the emails')
+
+        started = time.perf_counter()
+        plan = plan_assignments(
+            conference, track=track, reviewers_per_paper=options['per_paper'], max_load=options['max_load'],
+        )
+        elapsed = time.perf_counter() - started
+
+        loads = list(plan.loads.values()) or [0]
+        self.stdout.write(
+            f"{plan.paper_count} pending submission(s), {plan.reviewer_count} reviewer(s): "
+            f"{len(plan.assignments)} new assignment(s) planned in {elapsed:.2f}s, "
+            f"reviewer load {min(loads)}-{max(loads)}."
+        )
+        if plan.unfilled:
+            self.stdout.write(self.style.WARNING(
+                f"{len(plan.unfilled)} submission(s) are short of {sum(plan.unfilled.values())} reviewer(s): "
+                f"{', '.join(str(submission_id) for submission_id in sorted(plan.unfilled))}"
+            ))
+
+        if options['dry_run']:
+            if options['verbosity'] > 1:
+                for submission_id, reviewer_id in plan.assignments:
+                    self.stdout.write(f"  submission {submission_id} -> reviewer {reviewer_id}")
+            self.stdout.write('Dry run: nothing was written.')
+            return
+
+        try:
+            created = apply_plan(plan, notify=options['notify'], base_url=options['base_url'])
+        except IntegrityError:
+            raise CommandError('Assignments changed while planning; run the command again')
+        self.stdout.write(self.style.SUCCESS(f"Created {created} review assignment(s)."))
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from conference.models import Conference
+from review.reminders import send_review_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Email each reviewer one digest of their unsubmitted reviews that are near or past the '
+        'conference review deadline. Safe to run from cron: every reminder is sent once per deadline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--conference', help='Only reviews for the conference with this slug')
+        parser.add_argument('--hours-before', type=int, default=72, help='Remind this many hours before the deadline')
+        parser.add_argument('--max-overdue-days', type=int, default=30, help='Stop reminding this many days after the deadline')
+        parser.add_argument('--base-url', default=settings.SITE_URL, help='Site URL for links in the emails (default: SITE_URL)')
+        parser.add_argument('--chunk-size', type=int, help='Emails per send_messages() call on the shared connection')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be sent without sending or recording anything')
+
+    def handle(self, *args, **options):
+        conference = None
+        if options['conference']:
+            try:
+                conference = Conference.objects.get(slug=options['conference'])
+            except Conference.DoesNotExist:
+                raise CommandError(f"Conference '{options['conference']}' does not exist")
+
+        if options['hours_before'] < 0 or options['max_overdue_days'] < 0:
+            raise CommandError('--hours-before and --max-overdue-days cannot be negative')
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if not options['base_url'] and not options['dry_run']:
+            raise CommandError('--base-url or the SITE_URL setting is needed for the links in the emails')
+
+        summary = send_review_reminders(
+            window=timedelta(hours=options['hours_before']),
+            max_overdue=timedelta(days=options['max_overdue_days']),
+            conference=conference,
+            base_url=options['base_url'],
+            dry_run=options['dry_run'],
+            chunk_size=options['chunk_size'],
+        )
+
+        found = (
+            f"{summary['reviews']} review(s) due for a reminder ({summary['overdue']} overdue) "
+            f"across {summary['reviewers']} reviewer(s)"
+        )
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {found}; nothing was sent.")
+            return
+
+        self.stdout.write(f"{found}.")
+        if summary['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"Sent {summary['sent']} digest(s); {summary['failed']} failed and will be retried on the next run."
+            ))
+        else:
+            verb = 'Queued' if summary['queued'] else 'Sent'
+            self.stdout.write(self.style.SUCCESS(f"{verb} {summary['sent']} reminder digest(s)."))
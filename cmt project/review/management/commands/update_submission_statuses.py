@@ -1,15 +1,46 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from conference.models import Conference
 from review.models import Review
 
 class Command(BaseCommand):
     help = 'Update all submission statuses based on their reviews'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--conference', help='Only recompute submissions for the conference with this slug')
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without writing them or sending emails')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk update and notification batch')
+
     def handle(self, *args, **options):
+        conference = None
+        if options['conference']:
+            try:
+                conference = Conference.objects.get(slug=options['conference'])
+            except Conference.DoesNotExist:
+                raise CommandError(f"Conference '{options['conference']}' does not exist")
+
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
         self.stdout.write('Updating submission statuses...')
-        
-        # Update all submission statuses
-        Review.update_all_submission_statuses()
-        
+
+        summary = Review.update_all_submission_statuses(
+            conference=conference,
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"Dry run: {summary['changed']} of {summary['scanned']} submission(s) would change, "
+                f"{summary['decisions']} decision email(s) would be sent."
+            )
+            return
+
         self.stdout.write(
-            self.style.SUCCESS('Successfully updated all submission statuses!')
-        ) 
\ No newline at end of file
+            self.style.SUCCESS(
+                f"Successfully updated {summary['changed']} of {summary['scanned']} submission status(es); "
+                f"{summary['notified']} decision notification(s) sent or queued."
+            )
+        )
+        if summary['failed']:
+            self.stdout.write(self.style.WARNING(f"{summary['failed']} decision notification(s) could not be sent."))
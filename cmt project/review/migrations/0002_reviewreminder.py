@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('upcoming', 'Deadline approaching'), ('overdue', 'Overdue')], max_length=10)),
+                ('deadline', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='review.review')),
+            ],
+            options={
+                'unique_together': {('review', 'kind', 'deadline')},
+            },
+        ),
+    ]
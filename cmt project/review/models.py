@@ -1,9 +1,12 @@
-from django.db import models
+from itertools import groupby
+
+from django.db import models, transaction
 from django.conf import settings
 from submissions.models import Submissions
 from django.utils import timezone
+from cmt.models_utils import ChangeTrackingMixin
 
-class Review(models.Model):
+class Review(ChangeTrackingMixin, models.Model):
     submission = models.ForeignKey(Submissions, on_delete=models.CASCADE, related_name='reviews')
     reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews_assigned')
     comment = models.TextField(blank=True, null=True)
@@ -17,6 +20,8 @@ class Review(models.Model):
     date_reviewed = models.DateTimeField(blank=True, null=True)
     is_submitted = models.BooleanField(default=False)
 
+    tracked_fields = ('recommendation', 'is_submitted')
+
     class Meta:
         unique_together = ('submission', 'reviewer')
         ordering = ['-date_reviewed', '-date_assigned']
@@ -25,17 +30,9 @@ class Review(models.Model):
         return f"Review by {self.reviewer} for {self.submission.paper_title}"
 
     def save(self, *args, **kwargs):
-        # Check if this is a new review or if the recommendation has changed
-        if self.pk:
-            # This is an existing review, check if recommendation changed
-            old_review = Review.objects.get(pk=self.pk)
-            recommendation_changed = old_review.recommendation != self.recommendation
-            is_submitted_changed = old_review.is_submitted != self.is_submitted
-        else:
-            # This is a new review
-            recommendation_changed = False
-            is_submitted_changed = False
-        
+        # Check if this is a new review or if the recommendation/submission flag changed
+        review_changed = self.has_changed('recommendation', 'is_submitted')
+
         # If this is a new review being submitted, set the date
         if self.is_submitted and not self.date_reviewed:
             self.date_reviewed = timezone.now()
@@ -43,15 +40,96 @@ class Review(models.Model):
         super().save(*args, **kwargs)
         
         # Update submission status if review was submitted or recommendation changed
-        if self.is_submitted and (recommendation_changed or is_submitted_changed or not self.pk):
+        if self.is_submitted and review_changed:
             self.submission.update_status_from_reviews()
 
 
 
     @classmethod
-    def update_all_submission_statuses(cls):
-        """Update status for all submissions based on their reviews"""
-        from submissions.models import Submissions
-        
-        for submission in Submissions.objects.all():
-            submission.update_status_from_reviews()
+    def update_all_submission_statuses(cls, conference=None, dry_run=False, batch_size=500, notify=True):
+        """
+        Recompute submission statuses from their reviews in bulk.
+
+        All statuses are derived from one aggregate query, only changed rows are
+        written (with bulk_update), and decision emails for submissions that
+        moved to a final decision are queued for the mail worker (or, without
+        EMAIL_QUEUE_ENABLED, sent in chunks over one connection). Returns a
+        summary dict.
+        """
+        from submissions.models import review_count_expressions
+
+        submissions = Submissions.objects.all()
+        if conference is not None:
+            submissions = submissions.filter(membership__conference=conference)
+
+        rows = submissions.order_by().annotate(**review_count_expressions('reviews__')).values_list(
+            'id', 'status', 'total_reviews', 'accept_count', 'reject_count', 'revise_count'
+        )
+
+        changed = []
+        scanned = 0
+        for submission_id, status, *counts in rows.iterator(chunk_size=batch_size):
+            scanned += 1
+            new_status = Submissions.status_from_review_counts(*counts)
+            if new_status != status:
+                changed.append(Submissions(id=submission_id, status=new_status))
+
+        decided_ids = [s.id for s in changed if s.status in Submissions.DECISION_STATUSES]
+        summary = {'scanned': scanned, 'changed': len(changed), 'decisions': len(decided_ids), 'notified': 0, 'failed': 0}
+        if dry_run:
+            return summary
+
+        with transaction.atomic():
+            Submissions.objects.bulk_update(changed, ['status'], batch_size=batch_size)
+
+        if notify and decided_ids:
+            from mailqueue.queue import enqueue_many, send_batched
+
+            emails = _decision_emails(decided_ids, batch_size)
+            if settings.EMAIL_QUEUE_ENABLED:
+                for conference, group in groupby(emails, key=lambda pair: pair[0]):
+                    summary['notified'] += enqueue_many(
+                        (email for _, email in group), conference=conference, batch_size=batch_size,
+                    )
+            else:
+                results = send_batched(email for _, email in emails)
+                summary['notified'] = sum(result.sent for result in results)
+                summary['failed'] = sum(result.failed for result in results)
+
+        return summary
+
+
+def _decision_emails(submission_ids, batch_size):
+    """Yield (conference, decision email) for the submissions, loading them batch_size at a time."""
+    from submissions.emails import build_submission_decision
+
+    for start in range(0, len(submission_ids), batch_size):
+        decided = (
+            Submissions.objects.filter(id__in=submission_ids[start:start + batch_size])
+            .select_related('membership__user', 'membership__conference', 'co_author1', 'co_author2', 'co_author3')
+            .order_by('membership__conference_id', 'id')
+        )
+        for submission in decided:
+            email = build_submission_decision(submission)
+            if email is not None:
+                yield submission.membership.conference, email
+
+
+class ReviewReminder(models.Model):
+    """A deadline reminder sent for a review, so send_review_reminders never repeats one."""
+    KIND_CHOICES = [
+        ('upcoming', 'Deadline approaching'),
+        ('overdue', 'Overdue'),
+    ]
+
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # The deadline the reminder was about; moving the deadline makes the review due for reminders again
+    deadline = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('review', 'kind', 'deadline')
+
+    def __str__(self):
+        return f"{self.get_kind_display()} reminder for review {self.review_id}"
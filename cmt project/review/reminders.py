@@ -0,0 +1,153 @@
+"""
+Review deadline reminders.
+
+due_reviews() finds every unsubmitted review whose conference deadline is
+near or recently passed and that has not been reminded about that deadline
+yet, in one query. send_review_reminders() claims those reviews by recording
+a ReviewReminder for each in one short transaction (rows locked with SELECT
+... FOR UPDATE SKIP LOCKED, so overlapping runs, e.g. from cron, never claim
+the same review), then sends each reviewer a single digest over one reused
+connection (or queues the digests for the mail worker). The claims of a
+digest that could not be sent are released so the next run retries it; a
+delivered digest is never sent again for the same deadline.
+"""
+import logging
+from datetime import timedelta
+from functools import reduce
+from itertools import groupby
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, Exists, F, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from mailqueue.queue import enqueue_many, send_batched
+from submissions.emails import build_review_reminder
+from submissions.models import Submissions
+from .models import Review, ReviewReminder
+
+logger = logging.getLogger(__name__)
+
+
+def _due_review_queryset(now, window, max_overdue, conference):
+    reviews = Review.objects.filter(
+        is_submitted=False,
+        submission__status=Submissions.StatusChoices.PENDING,
+        submission__membership__conference__review_deadline__gt=now - max_overdue,
+        submission__membership__conference__review_deadline__lte=now + window,
+    )
+    if conference is not None:
+        reviews = reviews.filter(submission__membership__conference=conference)
+
+    already_sent = ReviewReminder.objects.filter(review=OuterRef('pk'), kind=OuterRef('kind'), deadline=OuterRef('deadline'))
+    return (
+        reviews.annotate(
+            deadline=F('submission__membership__conference__review_deadline'),
+            kind=Case(
+                When(submission__membership__conference__review_deadline__lte=now, then=Value('overdue')),
+                default=Value('upcoming'),
+                output_field=CharField(),
+            ),
+        )
+        .filter(~Exists(already_sent))
+        .select_related('reviewer', 'submission__track', 'submission__membership__conference')
+        .order_by('reviewer_id', 'deadline', 'id')
+    )
+
+
+def due_reviews(now=None, window=timedelta(hours=72), max_overdue=timedelta(days=30), conference=None):
+    """
+    Unsubmitted reviews of undecided submissions whose conference review
+    deadline falls within ``window`` from now ('upcoming') or passed less
+    than ``max_overdue`` ago ('overdue'), without a reminder of that kind for
+    that deadline. Ordered by reviewer, each with ``deadline``, ``kind`` and
+    ``is_overdue`` set.
+    """
+    for review in _due_review_queryset(now or timezone.now(), window, max_overdue, conference):
+        review.is_overdue = review.kind == 'overdue'
+        yield review
+
+
+def claim_due_reviews(window=timedelta(hours=72), max_overdue=timedelta(days=30), conference=None):
+    """
+    Record a ReviewReminder for every due review not being claimed by a
+    concurrent run, and return those reviews (as due_reviews() yields them).
+    """
+    with transaction.atomic():
+        reviews = list(
+            _due_review_queryset(timezone.now(), window, max_overdue, conference)
+            .select_for_update(skip_locked=True, of=('self',))
+        )
+        if reviews:
+            # A run that committed its claims after this query started is only visible to a new statement
+            taken = set(
+                ReviewReminder.objects.filter(review__in=reviews).values_list('review_id', 'kind', 'deadline')
+            )
+            reviews = [review for review in reviews if (review.pk, review.kind, review.deadline) not in taken]
+            _record(reviews)
+    for review in reviews:
+        review.is_overdue = review.kind == 'overdue'
+    return reviews
+
+
+def _record(reviews):
+    ReviewReminder.objects.bulk_create(
+        [ReviewReminder(review=review, kind=review.kind, deadline=review.deadline) for review in reviews],
+        ignore_conflicts=True,
+    )
+
+
+def _release(reviews):
+    ReviewReminder.objects.filter(
+        reduce(or_, (Q(review=review, kind=review.kind, deadline=review.deadline) for review in reviews))
+    ).delete()
+
+
+def send_review_reminders(window=timedelta(hours=72), max_overdue=timedelta(days=30), conference=None,
+                          base_url='', dry_run=False, chunk_size=None):
+    """Send one digest per reviewer with due reviews. Returns a summary dict."""
+    with transaction.atomic():
+        if dry_run:
+            reviews = due_reviews(window=window, max_overdue=max_overdue, conference=conference)
+        else:
+            reviews = claim_due_reviews(window=window, max_overdue=max_overdue, conference=conference)
+        digests = [(reviewer, list(group)) for reviewer, group in groupby(reviews, key=lambda r: r.reviewer)]
+        summary = {
+            'reviewers': len(digests),
+            'reviews': sum(len(reviews) for _, reviews in digests),
+            'overdue': sum(1 for _, reviews in digests for review in reviews if review.is_overdue),
+            'sent': 0,
+            'failed': 0,
+            'queued': settings.EMAIL_QUEUE_ENABLED,
+        }
+        if dry_run or not digests:
+            return summary
+
+        messages = (build_review_reminder(reviewer, reviews, base_url=base_url) for reviewer, reviews in digests)
+
+        if settings.EMAIL_QUEUE_ENABLED:
+            # The outbox and the claims commit together; the mail worker handles retries
+            summary['sent'] = enqueue_many(messages)
+            return summary
+
+    chunk_size = chunk_size or settings.EMAIL_QUEUE_BATCH_SIZE
+
+    def release_failed(result, chunk):
+        summary['sent'] += result.sent
+        summary['failed'] += result.failed
+        if not result.failed:
+            return
+        start = (result.index - 1) * chunk_size
+        failed = [
+            review
+            for (_, reviews), delivered in zip(digests[start:start + len(chunk)], result.delivered)
+            if not delivered
+            for review in reviews
+        ]
+        logger.warning(f"Review reminder chunk {result.index}: {result.failed} digest(s) failed; released for the next run")
+        _release(failed)
+
+    # Claims are committed before sending, so no lock is held while talking to SMTP
+    send_batched(messages, chunk_size=chunk_size, on_chunk=release_failed)
+    return summary
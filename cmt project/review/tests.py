@@ -1,3 +1,275 @@
-from django.test import TestCase
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from conference.models import Conference, Track
+from membership.models import Membership, Role
+from submissions.models import Submissions
+from .assignment import Paper, solve
+from .models import Review, ReviewReminder
+from .reminders import claim_due_reviews
+
+
+class SolveTest(SimpleTestCase):
+
+    def assert_valid(self, papers, reviewer_organizations, assignments):
+        papers = {paper.id: paper for paper in papers}
+        self.assertEqual(len(assignments), len(set(assignments)))
+        for paper_id, reviewer_id in assignments:
+            paper = papers[paper_id]
+            self.assertNotIn(reviewer_id, paper.author_ids)
+            self.assertNotIn(reviewer_organizations[reviewer_id], paper.organizations)
+
+    def test_spreads_reviews_evenly(self):
+        reviewers = {reviewer_id: '' for reviewer_id in range(1, 7)}
+        papers = [Paper(paper_id, set(), set()) for paper_id in range(100, 110)]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 3)
+
+        self.assertEqual(unfilled, {})
+        self.assertEqual(Counter(paper_id for paper_id, _ in assignments), {paper.id: 3 for paper in papers})
+        self.assertEqual(sorted(loads.values()), [5, 5, 5, 5, 5, 5])
+
+    def test_respects_the_load_cap(self):
+        reviewers = {1: '', 2: '', 3: ''}
+        papers = [Paper(paper_id, set(), set()) for paper_id in range(100, 105)]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 2, max_load=3)
+
+        self.assertEqual(len(assignments), 9)
+        self.assertEqual(loads, {1: 3, 2: 3, 3: 3})
+        self.assertEqual(sum(unfilled.values()), 1)
+
+    def test_existing_reviews_count_towards_both_limits(self):
+        reviewers = {1: '', 2: '', 3: ''}
+        papers = [Paper(100, set(), set()), Paper(101, set(), set())]
+
+        assignments, loads, unfilled = solve(
+            papers, reviewers, 2, max_load=2, loads={1: 2, 2: 1}, assigned={100: {2}},
+        )
+
+        self.assertEqual(unfilled, {})
+        self.assertNotIn(1, {reviewer_id for _, reviewer_id in assignments})
+        self.assertNotIn((100, 2), assignments)
+        self.assertEqual(loads, {1: 2, 2: 2, 3: 2})
+
+    def test_never_assigns_authors_or_co_authors(self):
+        reviewers = {1: '', 2: '', 3: '', 4: ''}
+        papers = [Paper(100, {1, 2}, set()), Paper(101, {3}, set())]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 2)
+
+        self.assertEqual(unfilled, {})
+        self.assertEqual(sorted(assignments), [(100, 3), (100, 4), (101, 1), (101, 2)])
+
+    def test_never_assigns_reviewers_from_an_author_organization(self):
+        reviewers = {1: 'mit', 2: 'mit', 3: 'stanford', 4: ''}
+        papers = [Paper(100, set(), {'mit'}), Paper(101, set(), {'stanford', 'oxford'})]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 3)
+
+        self.assert_valid(papers, reviewers, assignments)
+        self.assertEqual(unfilled, {100: 1})
+        self.assertEqual({r for p, r in assignments if p == 100}, {3, 4})
+        self.assertEqual({r for p, r in assignments if p == 101}, {1, 2, 4})
+
+    def test_hands_off_earlier_picks_to_fill_short_papers(self):
+        # The greedy pass gives paper 100 to reviewer 1, leaving paper 102 (which only 1 and 2 may
+        # review) without a reviewer; 1 then passes paper 100 on to reviewer 3 and takes 102.
+        reviewers = {1: '', 2: 'z', 3: 'x'}
+        papers = [Paper(100, set(), {'z'}), Paper(101, set(), {'x'}), Paper(102, set(), {'x'})]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 1, max_load=1)
+
+        self.assertEqual(unfilled, {})
+        self.assertEqual(assignments, [(100, 3), (101, 2), (102, 1)])
+        self.assertEqual(loads, {1: 1, 2: 1, 3: 1})
+
+    def test_reports_papers_nobody_may_review(self):
+        reviewers = {1: 'mit'}
+        papers = [Paper(100, set(), {'mit'}), Paper(101, {1}, set())]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 2)
+
+        self.assertEqual(assignments, [])
+        self.assertEqual(unfilled, {100: 2, 101: 2})
+
+    def test_moves_reviews_to_even_out_loads(self):
+        # The greedy pass gives papers 101 and 102 to reviewer 1 and nothing to reviewer 3;
+        # 3 takes paper 100 from 2, who takes paper 102 from 1.
+        reviewers = {1: 'b', 2: '', 3: 'a'}
+        papers = [Paper(100, set(), {'b'}), Paper(101, set(), {'a'}), Paper(102, set(), {'a'})]
+
+        assignments, loads, unfilled = solve(papers, reviewers, 1)
+
+        self.assertEqual(unfilled, {})
+        self.assertEqual(assignments, [(100, 3), (101, 2), (102, 1)])
+        self.assertEqual(loads, {1: 1, 2: 1, 3: 1})
+
+    def test_scales_to_a_large_conference(self):
+        rng = random.Random(0)
+        reviewers = {reviewer_id: f'org{reviewer_id % 100}' for reviewer_id in range(1, 501)}
+        papers = [
+            Paper(paper_id, set(rng.sample(range(1, 501), 3)), {f'org{rng.randrange(100)}'})
+            for paper_id in range(1000, 6000)
+        ]
+        existing = {reviewer_id: rng.randrange(5) for reviewer_id in reviewers}
+
+        started = time.perf_counter()
+        assignments, loads, unfilled = solve(papers, reviewers, 3, max_load=40, loads=existing)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 5)
+        self.assertEqual(unfilled, {})
+        self.assertEqual(len(assignments), 15000)
+        self.assert_valid(papers, reviewers, assignments)
+        # 15,000 new reviews on top of ~1,000 existing ones: everyone ends within one of the mean
+        self.assertLessEqual(max(loads.values()) - min(loads.values()), 1)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_QUEUE_ENABLED=False,
+                   SITE_URL='https://cmt.example.com')
+class SendReviewRemindersTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        conference = Conference.objects.create(
+            conference_name='Test Conference', conference_description='A test conference',
+            start_date='2026-06-01', end_date='2026-06-03', location='Test Location',
+            review_deadline=timezone.now() + timedelta(hours=24),
+        )
+        track = Track.objects.create(conference=conference, name='Track')
+        author = cls.make_user('author@example.com')
+        membership = Membership.objects.create(user=author, conference=conference)
+        submission = Submissions.objects.create(
+            membership=membership, track=track, paper_title='A Paper', file='submissions/paper.pdf',
+        )
+        cls.reviews = [
+            Review.objects.create(submission=submission, reviewer=cls.make_user(email))
+            for email in ('first@example.com', 'rejected@example.com', 'last@example.com')
+        ]
+
+    @staticmethod
+    def make_user(email):
+        return CustomUser.objects.create_user(
+            email=email, password='password', first_name='Test', last_name='User', country='US',
+            organization=email, phone='555-0100', occupation='faculty',
+        )
+
+    def remind(self, **options):
+        call_command('send_review_reminders', stdout=StringIO(), **options)
+
+    def test_reminds_each_review_once(self):
+        self.remind()
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         ['first@example.com', 'last@example.com', 'rejected@example.com'])
+        self.assertIn(f"https://cmt.example.com{reverse('submit_review', args=[self.reviews[0].pk])}",
+                      mail.outbox[0].alternatives[0][0])
+        self.assertEqual(ReviewReminder.objects.count(), 3)
+
+        self.remind()
+        self.assertEqual(len(mail.outbox), 3)
+
+    @override_settings(EMAIL_BACKEND='mailqueue.tests.RejectingBackend')
+    def test_only_undelivered_digests_are_retried(self):
+        with self.assertLogs('mailqueue.queue', level='ERROR'), self.assertLogs('review.reminders', level='WARNING'):
+            self.remind(chunk_size=3)
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(set(ReviewReminder.objects.values_list('review__reviewer__email', flat=True)),
+                         {'first@example.com', 'last@example.com'})
+
+        # The next run retries just the failed digest
+        with self.settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            self.remind()
+        self.assertEqual(mail.outbox[-1].to, ['rejected@example.com'])
+        self.assertEqual((len(mail.outbox), ReviewReminder.objects.count()), (3, 3))
+
+    def test_reviews_claimed_by_another_run_are_skipped(self):
+        claimed = claim_due_reviews()
+        self.assertEqual(len(claimed), 3)
+
+        self.remind()
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(SITE_URL='')
+    def test_needs_a_base_url(self):
+        with self.assertRaises(CommandError):
+            self.remind()
+        self.remind(base_url='https://cmt.example.com')
+        self.assertEqual(len(mail.outbox), 3)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_QUEUE_ENABLED=False)
+class AssignReviewersToSubmissionTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.conference = Conference.objects.create(
+            conference_name='Test Conference', conference_description='A test conference',
+            start_date='2026-06-01', end_date='2026-06-03', location='Test Location',
+        )
+        track = Track.objects.create(conference=cls.conference, name='Track')
+        cls.chair = SendReviewRemindersTest.make_user('chair@example.com')
+        cls.chair_membership = Membership.objects.create(
+            user=cls.chair, conference=cls.conference, role1=Role.CHAIR, role2=Role.REVIEWER,
+        )
+        author = SendReviewRemindersTest.make_user('author@example.com')
+        cls.submission = Submissions.objects.create(
+            membership=Membership.objects.create(user=author, conference=cls.conference),
+            track=track, paper_title='A Paper', file='submissions/paper.pdf',
+        )
+        cls.drafting, cls.submitted, cls.new = (
+            SendReviewRemindersTest.make_user(f'{name}@example.com') for name in ('drafting', 'submitted', 'new')
+        )
+        cls.memberships = {
+            user: Membership.objects.create(user=user, conference=cls.conference, role1=Role.REVIEWER)
+            for user in (cls.drafting, cls.submitted, cls.new)
+        }
+
+    def setUp(self):
+        Review.objects.create(submission=self.submission, reviewer=self.drafting, comment='Half written')
+        Review.objects.create(submission=self.submission, reviewer=self.submitted, recommendation='REJECT', is_submitted=True)
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submissions.StatusChoices.REJECTED)
+        mail.outbox.clear()
+        self.client.force_login(self.chair)
+
+    def assign(self, *memberships):
+        return self.client.post(
+            reverse('assign_reviewers_to_submission', args=[self.submission.pk]),
+            {'reviewers': [membership.pk for membership in memberships]},
+        )
+
+    def test_applies_only_the_difference(self):
+        self.assign(self.memberships[self.drafting], self.memberships[self.new])
+
+        reviews = {review.reviewer: review for review in Review.objects.filter(submission=self.submission)}
+        self.assertEqual(set(reviews), {self.drafting, self.new})
+        self.assertEqual(reviews[self.drafting].comment, 'Half written')
+        self.assertEqual([message.to for message in mail.outbox], [['new@example.com']])
+
+    def test_removing_a_submitted_review_recomputes_the_status(self):
+        self.assign(self.memberships[self.drafting])
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submissions.StatusChoices.PENDING)
+        self.assertEqual(mail.outbox, [])
+
+    def test_the_chair_cannot_assign_themselves(self):
+        self.assign(self.memberships[self.drafting], self.memberships[self.submitted], self.chair_membership)
+
+        self.assertFalse(Review.objects.filter(submission=self.submission, reviewer=self.chair).exists())
+        self.assertEqual(Review.objects.filter(submission=self.submission).count(), 2)
+        self.assertEqual(mail.outbox, [])
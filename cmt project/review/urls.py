@@ -3,7 +3,9 @@ from . import views
 
 urlpatterns = [
     path('chair/assignments/', views.chair_review_assignments, name='chair_review_assignments'),
+    path('chair/auto-assign/<slug:slug>/', views.auto_assign_reviewers, name='auto_assign_reviewers'),
     path('chair/assign/<int:submission_id>/', views.assign_reviewers_to_submission, name='assign_reviewers_to_submission'),
+    path('chair/workload/<slug:slug>/', views.review_workload, name='review_workload'),
     path('dashboard/', views.reviewer_dashboard, name='reviewer_dashboard'),
     path('submit/<int:review_id>/', views.submit_review, name='submit_review'),
     path('author/reviews/', views.author_reviews, name='author_reviews'),
@@ -1,18 +1,34 @@
+from collections import Counter
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.urls import reverse
 from django.db.models import Q, Count
 from django.utils import timezone
 from django.http import JsonResponse
 
+from accounts.models import CustomUser
 from submissions.models import Submissions
 from membership.models import Membership, Role
+from membership.roles import get_roles
 from conference.models import Conference
 from .models import Review
-from .forms import ReviewForm, AssignReviewersForm
+from .forms import ReviewForm, AssignReviewersForm, AutoAssignReviewersForm
+from .assignment import apply_plan, plan_assignments, plan_matches, sign_plan
+from .workload import (
+    SORT_KEYS, completion_rate, conference_workload, deadline_passed, sorted_reviewers, workload_by_conference,
+)
 from submissions.emails import send_reviewer_assignment, send_review_notification
 
+# Submissions per page in each track (and the unassigned list) on the chair dashboard
+REVIEW_ASSIGNMENTS_PER_PAGE = 50
+# Proposed assignments listed in the auto-assign preview
+AUTO_ASSIGN_PREVIEW_ROWS = 100
+
 
 @login_required
 def debug_reviewers(request, conference_id):
@@ -27,18 +43,10 @@ def debug_reviewers(request, conference_id):
         all_memberships = Membership.objects.filter(conference=conference).select_related('user')
         
         # Get reviewers specifically
-        reviewers = Membership.objects.filter(
-            conference=conference
-        ).filter(
-            Q(role1='Reviewer') | Q(role2='Reviewer')
-        ).select_related('user')
+        reviewers = Membership.objects.with_role(conference, Role.REVIEWER).select_related('user')
         
         # Get chairs
-        chairs = Membership.objects.filter(
-            conference=conference
-        ).filter(
-            Q(role1='Chair') | Q(role2='Chair')
-        ).select_related('user')
+        chairs = Membership.objects.with_role(conference, Role.CHAIR).select_related('user')
         
         debug_data = {
             'conference': conference.conference_name,
@@ -74,50 +82,65 @@ def debug_reviewers(request, conference_id):
         return JsonResponse({'error': 'Conference not found'}, status=404)
 
 
+def _page_url(request, param, number):
+    """The current URL with one pagination parameter changed, keeping the others."""
+    query = request.GET.copy()
+    query[param] = number
+    return f"?{query.urlencode()}"
+
+
+def _paginate(request, items, param):
+    page = Paginator(items, REVIEW_ASSIGNMENTS_PER_PAGE).get_page(request.GET.get(param))
+    page.previous_url = _page_url(request, param, page.previous_page_number()) if page.has_previous() else None
+    page.next_url = _page_url(request, param, page.next_page_number()) if page.has_next() else None
+    return page
+
+
 @login_required
 def chair_review_assignments(request):
     """Chair dashboard for managing review assignments"""
-    # Get conferences where user is chair or staff
+    # Conferences with a chair (or where this user is chair), straight from the role table
     if request.user.is_staff:
-        chair_memberships = Membership.objects.filter(
-            Q(role1='Chair') | Q(role2='Chair')
-        )
-        chair_conferences = [m.conference for m in chair_memberships]
+        chair_conferences = Conference.objects.filter(membership_roles__role=Role.CHAIR).distinct()
         # Staff can see all conferences
         available_conferences = list(Conference.objects.all())
     else:
-        chair_memberships = Membership.objects.filter(user=request.user).filter(
-            Q(role1='Chair') | Q(role2='Chair')
-        )
-        chair_conferences = [m.conference for m in chair_memberships]
+        chair_conferences = list(Conference.objects.filter(
+            membership_roles__role=Role.CHAIR, membership_roles__membership__user=request.user
+        ).distinct())
         available_conferences = chair_conferences
 
     # Get selected conference
     selected_slug = request.GET.get('conference')
     selected_conference = None
-    submissions = Submissions.objects.none()
-    tracks = []
-
     if selected_slug:
         selected_conference = next((c for c in available_conferences if c.slug == selected_slug), None)
-        if selected_conference:
-            submissions = Submissions.objects.filter(
-                membership__conference=selected_conference
-            ).select_related('membership__user', 'track').prefetch_related('reviews').order_by('-submission_date')
-            tracks = selected_conference.tracks.all()
 
-    # Group submissions by track for better organization
     submissions_by_track = {}
+    unassigned_submissions = None
+    tracks = []
+    total_submissions = 0
     if selected_conference:
+        # One query for every submission; grouping and the unassigned list are built in memory
+        submissions = list(
+            Submissions.objects.filter(membership__conference=selected_conference)
+            .select_related('membership__user')
+            .annotate(review_count=Count('reviews'))
+            .order_by('-submission_date')
+        )
+        tracks = list(selected_conference.tracks.all())
+        tracks_by_id = {track.id: track for track in tracks}
+        grouped = {track.id: [] for track in tracks}
+        for submission in submissions:
+            if submission.track_id in tracks_by_id:
+                submission.track = tracks_by_id[submission.track_id]
+                grouped[submission.track_id].append(submission)
         for track in tracks:
-            track_submissions = submissions.filter(track=track)
-            submissions_by_track[track] = track_submissions
-
-    # Get unassigned submissions
-    unassigned_submissions = submissions.filter(reviews__isnull=True) if selected_conference else Submissions.objects.none()
-    
-    # Calculate total submissions count
-    total_submissions = submissions.count() if selected_conference else 0
+            submissions_by_track[track] = _paginate(request, grouped[track.id], f'page_{track.id}')
+        unassigned = [s for s in submissions if s.review_count == 0]
+        if unassigned:
+            unassigned_submissions = _paginate(request, unassigned, 'unassigned_page')
+        total_submissions = len(submissions)
 
     context = {
         'chair_conferences': chair_conferences,
@@ -133,46 +156,57 @@ def chair_review_assignments(request):
 @login_required
 def assign_reviewers_to_submission(request, submission_id):
     """Assign reviewers to a specific submission"""
-    submission = get_object_or_404(Submissions, id=submission_id)
+    submission = get_object_or_404(Submissions.objects.select_related('membership__conference'), id=submission_id)
     conference = submission.membership.conference
 
     # Check if user is chair for this conference or staff
-    if not request.user.is_staff:
-        is_chair = Membership.objects.filter(
-            user=request.user,
-            conference=conference
-        ).filter(
-            Q(role1='Chair') | Q(role2='Chair')
-        ).exists()
-        if not is_chair:
-            messages.error(request, "You don't have permission to assign reviewers for this conference.")
-            return redirect('chair_review_assignments')
+    if not get_roles(request).is_chair(conference):
+        messages.error(request, "You don't have permission to assign reviewers for this conference.")
+        return redirect('chair_review_assignments')
 
     if request.method == 'POST':
         # Get selected reviewer IDs from the form
         selected_reviewer_ids = request.POST.getlist('reviewers')
         
         if selected_reviewer_ids:
-            # Get the membership objects for the selected reviewers
-            selected_reviewers = Membership.objects.filter(
-                id__in=selected_reviewer_ids,
-                conference=conference
-            ).filter(
-                Q(role1='Reviewer') | Q(role2='Reviewer')
+            # Users behind the selected reviewer memberships, never the paper's own authors or the chair
+            # themselves (the form doesn't offer them, and a crafted POST mustn't either)
+            excluded = {submission.membership.user_id, submission.co_author1_id, submission.co_author2_id,
+                        submission.co_author3_id, request.user.id}
+            requested = set(
+                Membership.objects.with_role(conference, Role.REVIEWER)
+                .filter(id__in=selected_reviewer_ids)
+                .exclude(user_id__in=excluded - {None})
+                .values_list('user_id', flat=True)
             )
-            
-            # Remove existing assignments for this submission
-            Review.objects.filter(submission=submission).delete()
-            
-            # Create new review assignments and notify reviewers
-            for reviewer_membership in selected_reviewers:
-                review = Review.objects.create(
-                    submission=submission,
-                    reviewer=reviewer_membership.user
-                )
+
+            # Only touch what changed, so in-progress reviews survive and unchanged reviewers aren't re-emailed
+            current = dict(Review.objects.filter(submission=submission).values_list('reviewer_id', 'is_submitted'))
+            added = requested - current.keys()
+            removed = current.keys() - requested
+            reviewers = CustomUser.objects.in_bulk(added)
+            try:
+                with transaction.atomic():
+                    if removed:
+                        Review.objects.filter(submission=submission, reviewer_id__in=removed).delete()
+                    new_reviews = Review.objects.bulk_create(
+                        [Review(submission=submission, reviewer=reviewers[user_id]) for user_id in sorted(reviewers)]
+                    )
+            except IntegrityError:
+                messages.error(request, "The reviewers for this submission changed while you were editing. Please try again.")
+                return redirect('assign_reviewers_to_submission', submission_id=submission.id)
+
+            # Dropping a submitted review can change the decision
+            if any(current[user_id] for user_id in removed):
+                submission.update_status_from_reviews()
+
+            for review in new_reviews:
                 send_reviewer_assignment(review, request)
 
-            messages.success(request, f"Successfully assigned {len(selected_reviewers)} reviewer(s) to '{submission.paper_title}'")
+            messages.success(
+                request,
+                f"Updated reviewers for '{submission.paper_title}': {len(new_reviews)} added, {len(removed)} removed"
+            )
         else:
             messages.warning(request, "No reviewers were selected.")
         
@@ -183,11 +217,7 @@ def assign_reviewers_to_submission(request, submission_id):
         current_reviewer_ids = set(current_reviewers)
         
         # Get available reviewers directly (same logic as in form)
-        available_reviewers = Membership.objects.filter(
-            conference=conference
-        ).filter(
-            Q(role1='Reviewer') | Q(role2='Reviewer')
-        ).select_related('user')
+        available_reviewers = Membership.objects.with_role(conference, Role.REVIEWER).select_related('user')
         
         # Exclude the submission author and current user (chair) from reviewer options
         excluded_users = set()
@@ -219,43 +249,140 @@ def assign_reviewers_to_submission(request, submission_id):
     }
     return render(request, 'review/assign_reviewers.html', context)
 
+def _plan_preview(plan):
+    """Reviewer loads, a sample of the proposed assignments and the papers left short, for the preview page."""
+    new_counts = Counter(reviewer_id for _, reviewer_id in plan.assignments)
+    users = CustomUser.objects.filter(id__in=plan.loads).only('id', 'first_name', 'last_name', 'email', 'organization')
+    users = {user.id: user for user in users}
+    reviewer_loads = sorted(
+        ({'user': users[user_id], 'new': new_counts[user_id], 'total': load} for user_id, load in plan.loads.items()),
+        key=lambda row: (-row['total'], row['user'].last_name, row['user'].id),
+    )
+
+    sample = plan.assignments[:AUTO_ASSIGN_PREVIEW_ROWS]
+    short = sorted(plan.unfilled)[:AUTO_ASSIGN_PREVIEW_ROWS]
+    titles = dict(Submissions.objects.filter(id__in={s for s, _ in sample} | set(short)).values_list('id', 'paper_title'))
+    return {
+        'reviewer_loads': reviewer_loads,
+        'sample_assignments': [
+            {'submission_id': s, 'paper_title': titles.get(s), 'reviewer': users[r]} for s, r in sample
+        ],
+        'unfilled': [
+            {'submission_id': s, 'paper_title': titles.get(s), 'missing': plan.unfilled[s]} for s in short
+        ],
+    }
+
+
+@login_required
+def auto_assign_reviewers(request, slug):
+    """Plan reviewer assignments for a whole conference or track, preview them, then create them in one batch"""
+    conference = get_object_or_404(Conference, slug=slug)
+    if not get_roles(request).is_chair(conference):
+        messages.error(request, "You don't have permission to assign reviewers for this conference.")
+        return redirect('chair_review_assignments')
+
+    data = request.POST if request.method == 'POST' else (request.GET or None)
+    form = AutoAssignReviewersForm(data, conference=conference)
+    plan = None
+    plan_token = ''
+    preview = {}
+    if form.is_bound and form.is_valid():
+        plan = plan_assignments(
+            conference,
+            track=form.cleaned_data['track'],
+            reviewers_per_paper=form.cleaned_data['reviewers_per_paper'],
+            max_load=form.cleaned_data['max_load'],
+        )
+        if request.method == 'POST':
+            # Apply only the plan the chair previewed; anything else gets a fresh preview
+            if not plan_matches(plan, form.cleaned_data['plan_token']):
+                messages.error(request, "Assignments changed since the preview (or it expired). Please check the new preview.")
+            else:
+                try:
+                    created = apply_plan(
+                        plan, notify=form.cleaned_data['notify'], base_url=request.build_absolute_uri('/'),
+                    )
+                except IntegrityError:
+                    messages.error(request, "Assignments changed since the preview. Please review the new preview.")
+                else:
+                    messages.success(request, f"Created {created} review assignment(s) for {conference.conference_name}.")
+                    return redirect(f"{reverse('chair_review_assignments')}?conference={conference.slug}")
+        preview = _plan_preview(plan)
+        plan_token = sign_plan(plan)
+
+    context = {
+        'conference': conference,
+        'form': form,
+        'plan': plan,
+        'plan_token': plan_token,
+        **preview,
+    }
+    return render(request, 'review/auto_assign_reviewers.html', context)
+
+
 @login_required
 def reviewer_dashboard(request):
     """Dashboard for reviewers to see their assigned reviews"""
-    # Reviews assigned to this reviewer and not submitted yet
-    pending_reviews = Review.objects.filter(
-        reviewer=request.user, 
-        is_submitted=False
-    ).select_related('submission__membership__conference', 'submission__track').order_by('date_assigned')
-
-    # Submitted reviews
-    submitted_reviews = Review.objects.filter(
-        reviewer=request.user, 
-        is_submitted=True
-    ).select_related('submission__membership__conference', 'submission__track').order_by('-date_reviewed')
+    reviews = Review.objects.filter(reviewer=request.user).select_related(
+        'submission__membership__conference', 'submission__membership__user', 'submission__track'
+    )
+    # Reviews assigned to this reviewer and not submitted yet, then submitted ones; each list is loaded once
+    pending_reviews = list(reviews.filter(is_submitted=False).order_by('date_assigned'))
+    submitted_reviews = list(reviews.filter(is_submitted=True).order_by('-date_reviewed'))
 
-    # Annotate blind review flag on each review
-    for review in pending_reviews:
-        review.is_blind = review.submission.membership.conference.blind_review
-    for review in submitted_reviews:
-        review.is_blind = review.submission.membership.conference.blind_review
+    # Annotate blind review and overdue flags on each review
+    now = timezone.now()
+    for review in pending_reviews + submitted_reviews:
+        conference = review.submission.membership.conference
+        review.is_blind = conference.blind_review
+        review.is_overdue = not review.is_submitted and deadline_passed(conference.review_deadline, now)
 
     # Calculate stats
-    total_reviews = pending_reviews.count() + submitted_reviews.count()
-    completion_rate = round((submitted_reviews.count() / total_reviews * 100) if total_reviews > 0 else 0)
+    total_reviews = len(pending_reviews) + len(submitted_reviews)
 
     context = {
         'pending_reviews': pending_reviews,
         'submitted_reviews': submitted_reviews,
         'total_reviews': total_reviews,
-        'completion_rate': completion_rate,
+        'completion_rate': completion_rate(len(submitted_reviews), total_reviews),
+        'overdue_count': sum(1 for review in pending_reviews if review.is_overdue),
+        'conference_workload': workload_by_conference(pending_reviews, submitted_reviews),
     }
     return render(request, 'review/reviewer_dashboard.html', context)
 
+
+@login_required
+def review_workload(request, slug):
+    """Per-reviewer workload for a conference: pending, submitted and overdue reviews and completion rates"""
+    conference = get_object_or_404(Conference, slug=slug)
+    if not get_roles(request).is_chair(conference):
+        messages.error(request, "You don't have permission to view reviewer workload for this conference.")
+        return redirect('chair_review_assignments')
+
+    workload = conference_workload(conference)
+    sort = request.GET.get('sort') if request.GET.get('sort') in SORT_KEYS else 'pending'
+    reviewers = _paginate(request, sorted_reviewers(workload['reviewers'], sort), 'page')
+
+    context = {
+        'conference': conference,
+        'workload': workload,
+        'summary': workload['summary'],
+        'reviewers': reviewers,
+        'sort': sort,
+        'sort_options': list(SORT_KEYS),
+    }
+    return render(request, 'review/review_workload.html', context)
+
 @login_required
 def submit_review(request, review_id):
     """Submit a review for a submission"""
-    review = get_object_or_404(Review, id=review_id, reviewer=request.user)
+    review = get_object_or_404(
+        Review.objects.select_related(
+            'submission__membership__conference', 'submission__membership__user', 'submission__track',
+            'submission__co_author1', 'submission__co_author2', 'submission__co_author3',
+        ),
+        id=review_id, reviewer=request.user,
+    )
     submission = review.submission
 
     if review.is_submitted:
@@ -302,12 +429,17 @@ def author_reviews(request):
     reviews = Review.objects.filter(
         submission__in=submissions,
         is_submitted=True
-    ).select_related('submission__membership__conference', 'reviewer').order_by('-date_reviewed')
+    ).select_related('submission__membership__conference', 'submission__track', 'reviewer').order_by('-date_reviewed')
 
     # Calculate review counts
-    accepted_count = reviews.filter(recommendation='ACCEPT').count()
-    rejected_count = reviews.filter(recommendation='REJECT').count()
-    revision_count = reviews.filter(recommendation='REVISE').count()
+    counts = reviews.aggregate(
+        accepted=Count('id', filter=Q(recommendation='ACCEPT')),
+        rejected=Count('id', filter=Q(recommendation='REJECT')),
+        revised=Count('id', filter=Q(recommendation='REVISE')),
+    )
+    accepted_count = counts['accepted']
+    rejected_count = counts['rejected']
+    revision_count = counts['revised']
 
     context = {
         'reviews': reviews,
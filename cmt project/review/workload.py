@@ -0,0 +1,128 @@
+"""
+Reviewer workload: pending, submitted and overdue review counts per reviewer
+of a conference (for chairs, from one grouped aggregate) or per conference
+for one reviewer. A review is overdue when it is still pending after its
+conference's review_deadline.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from membership.models import Membership, Role
+
+SORT_KEYS = {
+    'pending': lambda row: (-row['pending'], row['name'].lower()),
+    'overdue': lambda row: (-row['overdue'], -row['pending'], row['name'].lower()),
+    'completion': lambda row: (row['completion_rate'], -row['pending'], row['name'].lower()),
+    'name': lambda row: row['name'].lower(),
+}
+
+
+def _cache_key(conference_id):
+    return f"review:workload:{conference_id}"
+
+
+def deadline_passed(deadline, now):
+    return deadline is not None and deadline < now
+
+
+def completion_rate(submitted, total):
+    return round(submitted / total * 100) if total else 0
+
+
+def _row(pending, submitted, overdue):
+    total = pending + submitted
+    return {
+        'pending': pending,
+        'submitted': submitted,
+        'overdue': overdue,
+        'total': total,
+        'completion_rate': completion_rate(submitted, total),
+    }
+
+
+def conference_workload(conference):
+    """
+    Every reviewer of ``conference`` with their review counts, plus totals.
+    Reviewers without assignments are included. Cached for
+    REVIEW_WORKLOAD_CACHE_TIMEOUT seconds.
+    """
+    timeout = settings.REVIEW_WORKLOAD_CACHE_TIMEOUT
+    if timeout:
+        workload = cache.get(_cache_key(conference.id))
+        if workload is not None:
+            return workload
+
+    now = timezone.now()
+    overdue = deadline_passed(conference.review_deadline, now)
+    in_conference = Q(user__reviews_assigned__submission__membership__conference=conference)
+    rows = (
+        Membership.objects.with_role(conference, Role.REVIEWER)
+        .values('user_id', 'user__first_name', 'user__last_name', 'user__email', 'user__organization')
+        .annotate(
+            pending=Count('user__reviews_assigned', filter=in_conference & Q(user__reviews_assigned__is_submitted=False)),
+            submitted=Count('user__reviews_assigned', filter=in_conference & Q(user__reviews_assigned__is_submitted=True)),
+        )
+        .order_by()
+    )
+    reviewers = []
+    for row in rows:
+        name = f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__email']
+        reviewers.append({
+            'user_id': row['user_id'],
+            'name': name,
+            'email': row['user__email'],
+            'organization': row['user__organization'],
+            **_row(row['pending'], row['submitted'], row['pending'] if overdue else 0),
+        })
+
+    summary = _row(
+        sum(r['pending'] for r in reviewers),
+        sum(r['submitted'] for r in reviewers),
+        sum(r['overdue'] for r in reviewers),
+    )
+    summary['reviewers'] = len(reviewers)
+    summary['idle'] = sum(1 for r in reviewers if not r['total'])
+    workload = {
+        'reviewers': reviewers,
+        'summary': summary,
+        'review_deadline': conference.review_deadline,
+        'deadline_passed': overdue,
+        'computed_at': now,
+    }
+    if timeout:
+        cache.set(_cache_key(conference.id), workload, timeout)
+    return workload
+
+
+def sorted_reviewers(reviewers, sort):
+    return sorted(reviewers, key=SORT_KEYS.get(sort, SORT_KEYS['pending']))
+
+
+def workload_by_conference(pending_reviews, submitted_reviews):
+    """
+    One reviewer's counts per conference, from their already loaded reviews
+    (with ``submission__membership__conference`` selected), so the reviewer
+    dashboard needs no further queries.
+    """
+    now = timezone.now()
+    conferences = {}
+    counts = {}
+    for review in [*pending_reviews, *submitted_reviews]:
+        conference = review.submission.membership.conference
+        conferences[conference.id] = conference
+        pending, submitted = counts.get(conference.id, (0, 0))
+        counts[conference.id] = (pending, submitted + 1) if review.is_submitted else (pending + 1, submitted)
+
+    workload = []
+    for conference_id, (pending, submitted) in counts.items():
+        conference = conferences[conference_id]
+        passed = deadline_passed(conference.review_deadline, now)
+        workload.append({
+            'conference': conference,
+            'deadline_passed': passed,
+            **_row(pending, submitted, pending if passed else 0),
+        })
+    workload.sort(key=lambda row: row['conference'].start_date, reverse=True)
+    return workload
@@ -69,8 +69,8 @@ class SessionAdmin(admin.ModelAdmin):
                 messages.success(request, f"Zoom meeting created: {result['meeting_id']}")
             except Exception as e:
                 messages.error(request, f"Failed to create Zoom meeting: {e}")
-        elif auto_create and obj.zoom_meeting_id and change:
-            # Update existing Zoom meeting
+        elif auto_create and obj.zoom_meeting_id and change and obj.has_changed():
+            # Update existing Zoom meeting only when the synced fields changed
             try:
                 from .zoom_service import update_zoom_meeting
                 update_zoom_meeting(obj.zoom_meeting_id, obj)
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from conference.models import Conference, Track
+from cmt.models_utils import ChangeTrackingMixin
 
 
 class Speaker(models.Model):
@@ -25,7 +26,7 @@ class Speaker(models.Model):
         ordering = ['last_name', 'first_name']
 
 
-class Session(models.Model):
+class Session(ChangeTrackingMixin, models.Model):
     """A scheduled session within a conference (talk, workshop, panel, etc.)."""
     SESSION_TYPES = [
         ('keynote', 'Keynote'),
@@ -57,6 +58,9 @@ class Session(models.Model):
     is_published = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Fields mirrored to the Zoom meeting
+    tracked_fields = ('title', 'description', 'start_time', 'end_time')
+
     class Meta:
         ordering = ['start_time']
 
@@ -69,12 +73,15 @@ class Session(models.Model):
         return int(delta.total_seconds() / 60)
 
 
-class Attendance(models.Model):
+class Attendance(ChangeTrackingMixin, models.Model):
     """Track user attendance at sessions (for certificate eligibility)."""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='attendances')
     session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='attendances')
     joined_at = models.DateTimeField(auto_now_add=True)
 
+    # Membership.sessions_attended is recounted for both the old and new user/session (see signals)
+    tracked_fields = ('user', 'session')
+
     class Meta:
         unique_together = ('user', 'session')
 
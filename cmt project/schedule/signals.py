@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from membership.models import Membership
+
+from .models import Attendance
+
+
+def _recount(user_id, session_id):
+    Membership.objects.filter(user_id=user_id, conference__sessions=session_id).refresh_attendance_counts()
+
+
+@receiver(post_save, sender=Attendance)
+def count_saved_attendance(sender, instance, created, **kwargs):
+    if created:
+        _recount(instance.user_id, instance.session_id)
+    elif instance.has_changed():
+        # Moved to another user or session (e.g. in the admin): both memberships change
+        _recount(instance.get_loaded_value('user'), instance.get_loaded_value('session'))
+        _recount(instance.user_id, instance.session_id)
+
+
+@receiver(post_delete, sender=Attendance)
+def count_deleted_attendance(sender, instance, **kwargs):
+    # Also fires per row when a session or user is deleted and takes its attendances with it
+    _recount(instance.user_id, instance.session_id)
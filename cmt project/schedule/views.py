@@ -73,7 +73,7 @@ def speaker_directory(request, slug):
 @login_required
 def join_session(request, session_id):
     """Gate-kept session join - only for paid registrants. Logs attendance."""
-    session = get_object_or_404(Session, id=session_id)
+    session = get_object_or_404(Session.objects.select_related('conference'), id=session_id)
     conference = session.conference
 
     # Check paid registration
@@ -86,7 +86,7 @@ def join_session(request, session_id):
         messages.info(request, "No virtual link is available for this session.")
         return redirect('conference_schedule', slug=conference.slug)
 
-    # Log attendance
+    # Log attendance; a new row bumps the membership's counter (see schedule.signals)
     Attendance.objects.get_or_create(user=request.user, session=session)
 
     return redirect(session.zoom_meeting_url)
@@ -8,6 +8,7 @@ import requests
 import logging
 from datetime import datetime
 from django.conf import settings
+from cmt import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +25,14 @@ def _get_access_token():
     if not all([account_id, client_id, client_secret]):
         raise ValueError("Zoom API credentials not configured. Set ZOOM_ACCOUNT_ID, ZOOM_CLIENT_ID, ZOOM_CLIENT_SECRET.")
 
-    response = requests.post(
-        ZOOM_TOKEN_URL,
-        params={'grant_type': 'account_credentials', 'account_id': account_id},
-        auth=(client_id, client_secret),
-        timeout=10,
-    )
-    response.raise_for_status()
+    with metrics.timed('cmt_external_api', service='zoom', operation='token'):
+        response = requests.post(
+            ZOOM_TOKEN_URL,
+            params={'grant_type': 'account_credentials', 'account_id': account_id},
+            auth=(client_id, client_secret),
+            timeout=10,
+        )
+        response.raise_for_status()
     return response.json()['access_token']
 
 
@@ -62,13 +64,14 @@ def create_zoom_meeting(session):
         },
     }
 
-    response = requests.post(
-        f'{ZOOM_API_BASE}/users/{user_id}/meetings',
-        json=payload,
-        headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
-        timeout=15,
-    )
-    response.raise_for_status()
+    with metrics.timed('cmt_external_api', service='zoom', operation='create_meeting'):
+        response = requests.post(
+            f'{ZOOM_API_BASE}/users/{user_id}/meetings',
+            json=payload,
+            headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+            timeout=15,
+        )
+        response.raise_for_status()
     data = response.json()
 
     return {
@@ -85,12 +88,13 @@ def delete_zoom_meeting(meeting_id):
 
     try:
         token = _get_access_token()
-        response = requests.delete(
-            f'{ZOOM_API_BASE}/meetings/{meeting_id}',
-            headers={'Authorization': f'Bearer {token}'},
-            timeout=10,
-        )
-        response.raise_for_status()
+        with metrics.timed('cmt_external_api', service='zoom', operation='delete_meeting'):
+            response = requests.delete(
+                f'{ZOOM_API_BASE}/meetings/{meeting_id}',
+                headers={'Authorization': f'Bearer {token}'},
+                timeout=10,
+            )
+            response.raise_for_status()
     except Exception as e:
         logger.warning(f"Failed to delete Zoom meeting {meeting_id}: {e}")
 
@@ -111,12 +115,13 @@ def update_zoom_meeting(meeting_id, session):
             'agenda': session.description[:2000] if session.description else '',
         }
 
-        response = requests.patch(
-            f'{ZOOM_API_BASE}/meetings/{meeting_id}',
-            json=payload,
-            headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
-            timeout=15,
-        )
-        response.raise_for_status()
+        with metrics.timed('cmt_external_api', service='zoom', operation='update_meeting'):
+            response = requests.patch(
+                f'{ZOOM_API_BASE}/meetings/{meeting_id}',
+                json=payload,
+                headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+                timeout=15,
+            )
+            response.raise_for_status()
     except Exception as e:
         logger.warning(f"Failed to update Zoom meeting {meeting_id}: {e}")
@@ -1,7 +1,7 @@
 from django.shortcuts import redirect
 from django.contrib import messages
 from functools import wraps
-from membership.models import Membership
+from membership.roles import get_roles
 
 def require_paid_membership(view_func):
     """
@@ -21,14 +21,13 @@ def require_paid_membership(view_func):
             return redirect('conference_list')
         
         # Check if user has paid membership
-        try:
-            membership = Membership.objects.get(user=request.user, conference__slug=slug)
-            if not membership.is_paid:
-                messages.warning(request, "You must complete payment to access this feature")
-                return redirect('conference_detail', slug=slug)
-        except Membership.DoesNotExist:
+        membership = get_roles(request).membership(slug)
+        if membership is None:
             messages.error(request, "You must register for this conference first")
             return redirect('conference_detail', slug=slug)
+        if not membership.is_paid:
+            messages.warning(request, "You must complete payment to access this feature")
+            return redirect('conference_detail', slug=slug)
         
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -1,12 +1,33 @@
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.urls import reverse
 from django.utils import timezone
+from mailqueue.queue import deliver
+from cmt import metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def absolute_url(base_url, path):
+    """Join a site root such as ``https://cmt.iatm.us`` with a reverse()d path."""
+    return f"{base_url.rstrip('/')}{path}"
+
+
+def _send_html_email(subject, message, recipient_list, html_message, conference=None, kind='other'):
+    """Send (or queue, when EMAIL_QUEUE_ENABLED) a plain-text email with an HTML alternative."""
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=recipient_list,
+    )
+    email.attach_alternative(html_message, "text/html")
+    with metrics.timed('cmt_email_send', kind=kind):
+        deliver(email, conference=conference)
+
+
 def send_submission_confirmation(submission, request=None):
     """Send confirmation email to author and co-authors after paper submission."""
     conference = submission.membership.conference
@@ -37,12 +58,13 @@ def send_submission_confirmation(submission, request=None):
     # Send to all authors
     recipients = [a.email for a in authors]
     try:
-        send_mail(
+        _send_html_email(
             subject=f"Submission Confirmation: {submission.paper_title}",
             message=f"Your paper '{submission.paper_title}' has been submitted to {conference.conference_name}.",
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=recipients,
             html_message=html_message,
+            conference=conference,
+            kind='submission_confirmation',
         )
     except Exception as e:
         logger.error(f"Failed to send submission confirmation email: {e}")
@@ -72,12 +94,13 @@ def send_reviewer_assignment(review, request=None):
     html_message = render_to_string('submissions/emails/reviewer_assignment.html', context)
 
     try:
-        send_mail(
+        _send_html_email(
             subject=f"Review Assignment: {submission.paper_title}",
             message=f"You have been assigned to review '{submission.paper_title}' for {conference.conference_name}.",
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[reviewer.email],
             html_message=html_message,
+            conference=conference,
+            kind='reviewer_assignment',
         )
     except Exception as e:
         logger.error(f"Failed to send reviewer assignment email: {e}")
@@ -113,25 +136,30 @@ def send_review_notification(review, request=None):
             recipients.append(co_author.email)
 
     try:
-        send_mail(
+        _send_html_email(
             subject=f"Review Received: {submission.paper_title}",
             message=f"A review has been submitted for your paper '{submission.paper_title}'.",
-            from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=recipients,
             html_message=html_message,
+            conference=conference,
+            kind='review_notification',
         )
     except Exception as e:
         logger.error(f"Failed to send review notification email: {e}")
 
 
-def send_submission_decision(submission):
-    """Send accept/reject/revision notification to authors when status changes."""
+def build_submission_decision(submission):
+    """
+    The accept/reject/revision email to a submission's authors, or None if
+    its status is not a decision. The submission needs its membership user
+    and conference and its co-authors selected.
+    """
     conference = submission.membership.conference
     author = submission.membership.user
 
     decision = submission.status
     if decision not in ('ACCEPTED', 'REJECTED', 'REVISION'):
-        return
+        return None
 
     decision_display = submission.get_status_display()
     header_colors = {
@@ -159,27 +187,36 @@ def send_submission_decision(submission):
         if co_author:
             recipients.append(co_author.email)
 
+    email = EmailMultiAlternatives(
+        subject=f"Paper {decision_display}: {submission.paper_title}",
+        body=f"Your paper '{submission.paper_title}' has been {decision_display.lower()} for {conference.conference_name}.",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=recipients,
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def send_submission_decision(submission):
+    """Send accept/reject/revision notification to authors when status changes."""
+    email = build_submission_decision(submission)
+    if email is None:
+        return
     try:
-        send_mail(
-            subject=f"Paper {decision_display}: {submission.paper_title}",
-            message=f"Your paper '{submission.paper_title}' has been {decision_display.lower()} for {conference.conference_name}.",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            html_message=html_message,
-        )
+        with metrics.timed('cmt_email_send', kind='submission_decision'):
+            deliver(email, conference=submission.membership.conference)
     except Exception as e:
         logger.error(f"Failed to send submission decision email: {e}")
 
 
 def send_registration_confirmation(user, conference, membership, request=None):
     """Send HTML confirmation email with attached invoice PDF after payment."""
-    from django.core.mail import EmailMultiAlternatives
     from conference.models import Payment
 
     # Get the most recent completed payment for this user+conference
     payment = Payment.objects.filter(
         user=user, conference=conference, status='completed'
-    ).order_by('-created_at').first()
+    ).select_related('user', 'conference', 'tier').order_by('-created_at').first()
 
     # Build URLs
     base_url = request.build_absolute_uri('/') if request else ''
@@ -221,16 +258,99 @@ def send_registration_confirmation(user, conference, membership, request=None):
         # Attach invoice PDF if payment exists
         if payment:
             try:
-                from conference.invoice import generate_invoice_pdf
-                invoice_buffer = generate_invoice_pdf(payment)
+                from conference.invoice import get_invoice_pdf
                 email.attach(
                     f"IATM_Invoice_{payment.id:06d}.pdf",
-                    invoice_buffer.getvalue(),
+                    get_invoice_pdf(payment),
                     'application/pdf',
                 )
             except Exception as e:
                 logger.error(f"Failed to generate/attach invoice PDF: {e}")
 
-        email.send()
+        with metrics.timed('cmt_email_send', kind='registration_confirmation'):
+            deliver(email, conference=conference)
     except Exception as e:
         logger.error(f"Failed to send registration confirmation email: {e}")
+
+
+def build_review_reminder(reviewer, reviews, base_url=''):
+    """
+    One digest email reminding a reviewer of their unsubmitted reviews.
+    Each review carries ``deadline`` and ``is_overdue`` attributes and its
+    submission, track and conference selected.
+    """
+    items = [
+        {
+            'review': review,
+            'submission': review.submission,
+            'conference': review.submission.membership.conference,
+            'review_url': absolute_url(base_url, reverse('submit_review', args=[review.pk])),
+        }
+        for review in reviews
+    ]
+    overdue = sum(1 for review in reviews if review.is_overdue)
+    context = {
+        'reviewer': reviewer,
+        'items': items,
+        'overdue_count': overdue,
+        'dashboard_url': absolute_url(base_url, reverse('reviewer_dashboard')),
+    }
+    html_message = render_to_string('submissions/emails/review_reminder.html', context)
+
+    reviews_label = f"{len(items)} review{'s' if len(items) != 1 else ''}"
+    if overdue:
+        subject = f"Review reminder: {reviews_label} awaiting your submission ({overdue} overdue)"
+    else:
+        subject = f"Review reminder: {reviews_label} due soon"
+    lines = [
+        f"- {item['submission'].paper_title} ({item['conference'].conference_name}), "
+        f"{'overdue since' if item['review'].is_overdue else 'due'} {timezone.localtime(item['review'].deadline):%B %d, %Y %H:%M %Z}"
+        for item in items
+    ]
+    message = "The following reviews are waiting for you:\n\n" + "\n".join(lines)
+
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[reviewer.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def build_reviewer_assignment_digest(reviewer, reviews, base_url=''):
+    """
+    One email telling a reviewer about all of their new assignments in a
+    conference. Each review has its submission, track and conference selected.
+    """
+    conference = reviews[0].submission.membership.conference
+    items = [
+        {
+            'submission': review.submission,
+            'review_url': absolute_url(base_url, reverse('submit_review', args=[review.pk])),
+        }
+        for review in reviews
+    ]
+    context = {
+        'reviewer': reviewer,
+        'conference': conference,
+        'items': items,
+        'dashboard_url': absolute_url(base_url, reverse('reviewer_dashboard')),
+    }
+    html_message = render_to_string('submissions/emails/reviewer_assignment_digest.html', context)
+
+    papers_label = f"{len(items)} paper{'s' if len(items) != 1 else ''}"
+    lines = [f"- {item['submission'].paper_title}: {item['review_url']}" for item in items]
+    message = (
+        f"You have been assigned to review {papers_label} for {conference.conference_name}:\n\n" + "\n".join(lines)
+    )
+
+    email = EmailMultiAlternatives(
+        subject=f"Review Assignments: {papers_label} for {conference.conference_name}",
+        body=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[reviewer.email],
+    )
+    email.attach_alternative(html_message, "text/html")
+    return email
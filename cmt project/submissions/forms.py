@@ -37,7 +37,7 @@ class SubmissionForm(forms.ModelForm):
     def __init__(self, *args, conference=None, **kwargs):
         super().__init__(*args, **kwargs)
         if conference:
-            self.fields['track'].queryset = Track.objects.filter(conference=conference)
+            self.fields['track'].queryset = Track.objects.filter(conference=conference).select_related('conference')
 
         # Initialize co-author users to None
         self._co_author_users = [None, None, None]
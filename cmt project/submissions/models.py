@@ -1,7 +1,30 @@
 from django.db import models
+from django.db.models import Count, Q
 from membership.models import Membership
 from accounts.models import CustomUser
 from conference.models import Track
+from cmt import metrics
+
+def review_count_expressions(prefix=''):
+    """
+    Conditional counts of submitted recommendations, usable with aggregate() on
+    Review (prefix='') or annotate() on Submissions (prefix='reviews__').
+    """
+    submitted = Q(**{f'{prefix}is_submitted': True, f'{prefix}recommendation__isnull': False})
+
+    def count_of(recommendation=None):
+        condition = submitted
+        if recommendation:
+            condition &= Q(**{f'{prefix}recommendation': recommendation})
+        return Count(f'{prefix}id', filter=condition)
+
+    return {
+        'total_reviews': count_of(),
+        'accept_count': count_of('ACCEPT'),
+        'reject_count': count_of('REJECT'),
+        'revise_count': count_of('REVISE'),
+    }
+
 
 class Submissions(models.Model):
     class StatusChoices(models.TextChoices):
@@ -10,6 +33,8 @@ class Submissions(models.Model):
         REJECTED = 'REJECTED', 'Rejected'
         REVISION = 'REVISION', 'Needs Revision'
 
+    DECISION_STATUSES = (StatusChoices.ACCEPTED, StatusChoices.REJECTED, StatusChoices.REVISION)
+
     membership = models.ForeignKey(Membership, on_delete=models.CASCADE, related_name='submissions')
     track = models.ForeignKey(Track, on_delete=models.CASCADE, related_name='submissions')
     paper_title = models.CharField(max_length=255)
@@ -34,46 +59,40 @@ class Submissions(models.Model):
     def __str__(self):
         return f"{self.paper_title} - {self.membership.user.email} ({self.submission_date.date()})"
 
+    @classmethod
+    def status_from_review_counts(cls, total_reviews, accept_count, reject_count, revise_count):
+        """Derive a submission status from its submitted recommendation counts."""
+        if not total_reviews:
+            return cls.StatusChoices.PENDING
+        # Rejection overrides everything, revision overrides acceptance
+        if reject_count:
+            return cls.StatusChoices.REJECTED
+        if revise_count:
+            return cls.StatusChoices.REVISION
+        # All reviews must recommend acceptance
+        if accept_count == total_reviews:
+            return cls.StatusChoices.ACCEPTED
+        # Mixed recommendations stay pending
+        return cls.StatusChoices.PENDING
+
+    @metrics.timed('cmt_submission_status_update')
     def update_status_from_reviews(self):
         """Update submission status based on all submitted reviews"""
         from review.models import Review
 
         old_status = self.status
 
-        # Get all submitted reviews for this submission
-        submitted_reviews = Review.objects.filter(
-            submission=self,
-            is_submitted=True
-        ).exclude(recommendation__isnull=True)
+        # One conditional aggregate over this submission's reviews
+        counts = Review.objects.filter(submission=self).aggregate(**review_count_expressions())
+        self.status = self.status_from_review_counts(**counts)
 
-        if not submitted_reviews.exists():
-            self.status = self.StatusChoices.PENDING
-            self.save()
+        if self.status == old_status:
             return
 
-        total_reviews = submitted_reviews.count()
-
-        # Check if any review recommends rejection (rejection overrides everything)
-        if submitted_reviews.filter(recommendation='REJECT').exists():
-            self.status = self.StatusChoices.REJECTED
-        # Check if any review recommends revision (revision overrides acceptance)
-        elif submitted_reviews.filter(recommendation='REVISE').exists():
-            self.status = self.StatusChoices.REVISION
-        # Check if all reviews recommend acceptance (need at least 1 review)
-        elif total_reviews >= 1 and submitted_reviews.filter(recommendation='ACCEPT').count() == total_reviews:
-            self.status = self.StatusChoices.ACCEPTED
-        # If there are mixed recommendations or only one review, keep as pending
-        else:
-            self.status = self.StatusChoices.PENDING
-
-        self.save()
+        self.save(update_fields=['status'])
 
         # Send decision notification if status changed to a final decision
-        if self.status != old_status and self.status in (
-            self.StatusChoices.ACCEPTED,
-            self.StatusChoices.REJECTED,
-            self.StatusChoices.REVISION,
-        ):
+        if self.status in self.DECISION_STATUSES:
             try:
                 from submissions.emails import send_submission_decision
                 send_submission_decision(self)
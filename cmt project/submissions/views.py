@@ -5,32 +5,34 @@ from django.contrib import messages
 from .forms import SubmissionForm
 from .models import Submissions
 from conference.models import Conference
-from membership.models import Membership, Role
+from membership.models import Role
 from review.models import Review
+from membership.roles import get_roles
 from .decorators import require_paid_membership
 from .emails import send_submission_confirmation
 from django.shortcuts import get_object_or_404
 import os
 
 
+# Relations read by the submission templates and authorization checks
+SUBMISSION_RELATED = (
+    'membership__user', 'membership__conference', 'track',
+    'co_author1', 'co_author2', 'co_author3',
+)
+
+
 @login_required
 @require_paid_membership
 def create_submission(request, slug):
     conference = get_object_or_404(Conference, slug=slug)
 
     # Roles for sidebar - match context processors
-    is_chair = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Chair') | Q(role2='Chair')
-    ).exists()
-    is_reviewer = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Reviewer') | Q(role2='Reviewer')
-    ).exists()
-
-    if not Membership.objects.filter(user=request.user, conference=conference).exists():
+    roles = get_roles(request)
+    is_chair = roles.is_chair()
+    is_reviewer = roles.is_reviewer()
+
+    membership = roles.membership(conference)
+    if membership is None:
         messages.error(request, "You are not a member of this conference to submit a paper")
         return redirect('conference_detail', slug=slug)
 
@@ -42,8 +44,7 @@ def create_submission(request, slug):
         form = SubmissionForm(request.POST, request.FILES, conference=conference)
         if form.is_valid():
             submission = form.save(commit=False)
-            membership = Membership.objects.get(user=request.user, conference=conference)
-            submission.membership = membership
+            submission.membership_id = membership.id
             submission.save()
             send_submission_confirmation(submission, request)
             messages.success(request, "Submission Successfully Submitted")
@@ -63,21 +64,12 @@ def create_submission(request, slug):
 
 @login_required
 def submission_detail(request, pk):
-    submission = get_object_or_404(Submissions, pk=pk)
+    submission = get_object_or_404(Submissions.objects.select_related(*SUBMISSION_RELATED), pk=pk)
 
-    # Roles for sidebar - match context processors
-    is_chair = request.user.is_staff or Membership.objects.filter(
-        user=request.user,
-        conference=submission.membership.conference
-    ).filter(
-        Q(role1='Chair') | Q(role2='Chair')
-    ).exists()
-    is_reviewer = request.user.is_staff or Membership.objects.filter(
-        user=request.user,
-        conference=submission.membership.conference
-    ).filter(
-        Q(role1='Reviewer') | Q(role2='Reviewer')
-    ).exists()
+    # Roles for sidebar - scoped to the submission's conference
+    roles = get_roles(request)
+    is_chair = roles.is_chair(submission.membership.conference_id)
+    is_reviewer = roles.is_reviewer(submission.membership.conference_id)
 
     is_authorized = (
         is_chair or
@@ -103,26 +95,16 @@ def submission_detail(request, pk):
 @login_required
 def submission_list(request):
     # Roles for sidebar - match context processors
-    is_chair = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Chair') | Q(role2='Chair')
-    ).exists()
-    is_reviewer = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Reviewer') | Q(role2='Reviewer')
-    ).exists()
-
-    chair_conferences = Membership.objects.filter(
-        user=request.user,
-        role1='Chair'
-    ).values_list('conference', flat=True)
+    roles = get_roles(request)
+    is_chair = roles.is_chair()
+    is_reviewer = roles.is_reviewer()
+
+    chair_conferences = roles.conference_ids_with_role(Role.CHAIR)
 
     if chair_conferences:
         all_submissions = Submissions.objects.filter(
             membership__conference__in=chair_conferences
-        ).order_by('-submission_date')
+        ).select_related(*SUBMISSION_RELATED).order_by('-submission_date')
     else:
         all_submissions = Submissions.objects.filter(
             membership__user=request.user
@@ -134,7 +116,7 @@ def submission_list(request):
             Q(co_author3=request.user)
         ).order_by('-submission_date')
 
-        all_submissions = (all_submissions | co_authored_submissions).distinct()
+        all_submissions = (all_submissions | co_authored_submissions).distinct().select_related(*SUBMISSION_RELATED)
 
     for submission in all_submissions:
         is_co_author = request.user in [submission.co_author1, submission.co_author2, submission.co_author3]
@@ -166,18 +148,11 @@ def submission_list(request):
 @login_required
 def edit_submission(request, pk):
     # Roles for sidebar - match context processors
-    is_chair = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Chair') | Q(role2='Chair')
-    ).exists()
-    is_reviewer = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Reviewer') | Q(role2='Reviewer')
-    ).exists()
+    roles = get_roles(request)
+    is_chair = roles.is_chair()
+    is_reviewer = roles.is_reviewer()
 
-    submission = get_object_or_404(Submissions, pk=pk)
+    submission = get_object_or_404(Submissions.objects.select_related(*SUBMISSION_RELATED), pk=pk)
 
     # Authorization check
     if submission.membership.user != request.user and request.user not in [
@@ -220,16 +195,9 @@ def edit_submission(request, pk):
 @login_required
 def delete_submission(request, pk):
     # Roles for sidebar - match context processors
-    is_chair = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Chair') | Q(role2='Chair')
-    ).exists()
-    is_reviewer = request.user.is_staff or Membership.objects.filter(
-        user=request.user
-    ).filter(
-        Q(role1='Reviewer') | Q(role2='Reviewer')
-    ).exists()
+    roles = get_roles(request)
+    is_chair = roles.is_chair()
+    is_reviewer = roles.is_reviewer()
 
     submission = get_object_or_404(Submissions, pk=pk)
 